@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+资源包加载测试
+
+先用 build_assets.py 生成一个临时资源包，再在独立的子进程中分别用两种方式准备界面
+需要的资源，比较耗时和进程常驻内存（/proc/self/statm）的增量：
+- 单独的文件：完整字体 WenQuanYiMicroHei.ttf，音效现场合成
+- 资源包：mmap 打开，读取子集字体和预先合成的 PCM
+每种方式都加载两种字号的字体、渲染界面上的所有文字，并准备全部音效。
+用法：
+    SDL_AUDIODRIVER=dummy python benchmarks/bench_assets.py [--rounds 5]
+没有安装 fontTools 时资源包里没有字体，字体部分不会有差别。
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.asset_bundle import FONT_ASSET
+from src.build_assets import FONT_PATH, build
+
+# 在子进程中运行：argv[1] 为资源包路径，空字符串表示读取单独的文件
+CHILD = r'''
+import os, sys, time, json
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+import pygame
+pygame.display.init(); pygame.font.init(); pygame.mixer.init(44100, -16, 2, 256)
+from src.asset_bundle import open_bundle, FONT_ASSET
+from src.build_assets import collect_ui_text, UI_SOURCES, SRC_DIR
+from src.sound_manager import SoundManager
+from ui_manager import LazyFont, bundle_font_loader
+text = ''.join(sorted(collect_ui_text(os.path.join(SRC_DIR, n) for n in UI_SOURCES)))
+before = rss()
+start = time.perf_counter()
+bundle = open_bundle(sys.argv[1]) if sys.argv[1] else None
+if bundle is not None and FONT_ASSET in bundle:
+    loader, charset = bundle_font_loader(bundle)
+    fonts = [LazyFont(size, loader, charset) for size in (48, 24)]
+else:
+    fonts = [LazyFont(size) for size in (48, 24)]
+for font in fonts:
+    font.render(text, True, (255, 255, 255))
+fonts_done = time.perf_counter()
+SoundManager(bundle=bundle)
+done = time.perf_counter()
+after = rss()
+print(json.dumps({'font': fonts_done - start, 'sound': done - fonts_done, 'rss': after - before}))
+'''.replace('ROOT', repr(ROOT))
+
+
+def run_child(bundle_path, rounds):
+    """返回多次运行中最快的字体、音效耗时（毫秒）和最小的内存增量（字节）"""
+    results = []
+    for _ in range(rounds):
+        output = subprocess.run([sys.executable, '-c', CHILD, bundle_path], check=True,
+                                capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return (min(r['font'] for r in results) * 1000, min(r['sound'] for r in results) * 1000,
+            min(r['rss'] for r in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='资源包加载测试')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'bundle.snkb')
+        fonts = [(data, meta) for name, data, meta in build(path) if name == FONT_ASSET]
+        if fonts:
+            data, meta = fonts[0]
+            print(f'字体: 原字体 {os.path.getsize(FONT_PATH) / 1024:.1f} KB, '
+                  f'子集 {len(data) / 1024:.1f} KB（{len(meta["chars"])} 个字符）')
+        else:
+            print('没有安装 fontTools，资源包中没有字体')
+        print(f'资源包: {os.path.getsize(path) / 1024:.1f} KB')
+        print(f'{"":<12}{"字体":>10}{"音效":>12}{"内存增量":>14}')
+        for label, bundle_path in (('单独的文件', ''), ('资源包', path)):
+            font, sound, rss = run_child(bundle_path, args.rounds)
+            print(f'{label:<12}{font:>9.2f} ms{sound:>9.2f} ms{rss / 1024 / 1024:>12.1f} MB')
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
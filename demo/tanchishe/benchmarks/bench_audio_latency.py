@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+音效延迟测试
+
+1. 从 play() 到混音器输出的延迟：对每种缓冲区大小重新初始化混音器，播放一段已知时长的
+   静音，轮询声道直到混音器混完最后一块。声道空闲时最后一块还在缓冲区里没有输出，
+   所以 延迟 ≈ 总耗时 - 音效时长 + 缓冲时长（buffer / 采样率）。
+   dummy 音频驱动按实时速度消费数据，但计时比真实设备粗，结果只适合相对比较。
+2. 快速输入：模拟交替连按方向键时每帧触发两次移动音效、期间吃到食物，对比直接 Sound.play()
+   （改动前：8 个共用声道）和 VoicePool（按类别预留、限速、抢占）下吃食物音效是否被挤掉。
+用法：
+    SDL_AUDIODRIVER=dummy python benchmarks/bench_audio_latency.py [--buffers 256 512 1024] [--trials 20]
+默认缓冲区（256）下的延迟中位数超过一帧（16.7 ms）或吃食物音效被丢弃时返回 1。
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+from pygame.sndarray import make_sound
+from src.settings import Settings
+from src.voice_pool import VoicePool, channel_count
+
+FRAME_MS = 1000 / 60
+PROBE_SECONDS = 0.05
+
+
+def measure_latency(frequency, buffer, trials):
+    """返回每次 play() 到开始输出的估计延迟（毫秒）"""
+    pygame.mixer.init(frequency=frequency, size=-16, channels=2, buffer=buffer)
+    try:
+        rate, _, channels = pygame.mixer.get_init()
+        buffer_ms = buffer / rate * 1000
+        probe = make_sound(np.zeros((int(rate * PROBE_SECONDS), channels), dtype=np.int16))
+        results = []
+        for _ in range(trials):
+            start = time.perf_counter()
+            channel = probe.play()
+            while channel.get_busy():
+                time.sleep(0.0002)
+            results.append((time.perf_counter() - start - PROBE_SECONDS) * 1000 + buffer_ms)
+        return results
+    finally:
+        pygame.mixer.quit()
+
+
+def rapid_fire(use_pool, frames=120):
+    """模拟快速输入，返回 (吃食物音效播放成功的次数, 尝试次数)"""
+    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=256)
+    try:
+        rate, _, channels = pygame.mixer.get_init()
+        # 移动音效 100 ms、吃食物音效 150 ms，与 synth.EFFECTS 一致
+        move = make_sound(np.zeros((int(rate * 0.1), channels), dtype=np.int16))
+        eat = make_sound(np.zeros((int(rate * 0.15), channels), dtype=np.int16))
+        if use_pool:
+            pygame.mixer.set_num_channels(channel_count())
+            pygame.mixer.set_reserved(channel_count())
+            pool = VoicePool(pygame.mixer.Channel)
+            play = pool.play
+        else:
+            pygame.mixer.set_num_channels(8)
+
+            def play(name, sound):
+                sound.play()
+        eaten = attempts = 0
+        for frame in range(frames):
+            # 两个方向键交替连按，每帧收到两次按键
+            play('move', move)
+            play('move', move)
+            if frame % 20 == 10:
+                attempts += 1
+                if play('eat', eat) is not None:
+                    eaten += 1
+            time.sleep(FRAME_MS / 1000)
+        return eaten, attempts
+    finally:
+        pygame.mixer.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='音效延迟测试')
+    parser.add_argument('--buffers', type=int, nargs='+', default=[256, 512, 1024, 2048])
+    parser.add_argument('--trials', type=int, default=20)
+    args = parser.parse_args()
+
+    settings = Settings()
+    frequency = settings.audio_frequency
+    print(f'play() 到混音器输出的延迟（{frequency} Hz，{args.trials} 次）：')
+    print(f'{"缓冲区":>8}{"缓冲时长":>12}{"中位数":>12}{"p95":>10}')
+    medians = {}
+    for buffer in args.buffers:
+        results = sorted(measure_latency(frequency, buffer, args.trials))
+        medians[buffer] = statistics.median(results)
+        p95 = results[min(len(results) - 1, int(len(results) * 0.95))]
+        print(f'{buffer:>10}{buffer / frequency * 1000:>12.1f} ms'
+              f'{medians[buffer]:>9.1f} ms{p95:>8.1f} ms')
+
+    print('快速输入（每帧两次移动音效，期间吃到食物）：')
+    failed = False
+    for use_pool, label in ((False, '直接 Sound.play()'), (True, 'VoicePool')):
+        eaten, attempts = rapid_fire(use_pool)
+        print(f'  {label:<20}吃食物音效 {eaten}/{attempts}')
+        if use_pool and eaten < attempts:
+            failed = True
+
+    default = settings.audio_buffer
+    if default not in medians:
+        medians[default] = statistics.median(measure_latency(frequency, default, args.trials))
+    if medians[default] > FRAME_MS:
+        print(f'默认缓冲区 {default} 的延迟 {medians[default]:.1f} ms 超过一帧')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
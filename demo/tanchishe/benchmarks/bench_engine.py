@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+模拟引擎吞吐量基准测试
+
+在 40x30 的棋盘上用随机策略连续运行 SnakeEngine，统计每秒步数。
+用法：
+    python benchmarks/bench_engine.py [--steps 3000000] [--target 1000000]
+低于目标值时返回非零退出码。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine import SnakeEngine
+
+
+def run(steps, width=40, height=30, seed=0):
+    """运行指定步数，返回 (每秒步数, 完成的局数)"""
+    rng = random.Random(seed)
+    # 预先生成动作序列，避免把随机数生成的开销算进引擎
+    actions = [rng.choice((None, None, None, 0, 1, 2, 3)) for _ in range(4096)]
+    engine = SnakeEngine(width=width, height=height, seed=seed)
+    step = engine.step
+    reset = engine.reset
+    episodes = 0
+
+    start = time.perf_counter()
+    for i in range(steps):
+        if step(actions[i & 4095])[1]:
+            episodes += 1
+            reset(i)
+    elapsed = time.perf_counter() - start
+    return steps / elapsed, episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SnakeEngine 吞吐量基准测试')
+    parser.add_argument('--steps', type=int, default=3_000_000, help='运行的总步数')
+    parser.add_argument('--target', type=float, default=1_000_000, help='目标每秒步数')
+    args = parser.parse_args()
+
+    rate, episodes = run(args.steps)
+    print(f'40x30 棋盘: {rate:,.0f} 步/秒 ({args.steps:,} 步, {episodes:,} 局)')
+    if rate < args.target:
+        print(f'未达到目标 {args.target:,.0f} 步/秒')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+多人对战服务基准测试
+
+1. 不经过网络，直接推进 --rooms 个房间（每个房间 --players 条随机转向的蛇）
+   并编码增量，统计每步耗时，换算成单核在 --tick-rate 下能承载的房间数，
+   同时对比增量和完整快照的字节数
+2. 在本进程中启动对战服务，用机器人集群（--swarm-rooms 个房间）通过本机连接游戏，
+   统计服务端每步耗时的 p50/p99
+用法：
+    python benchmarks/bench_game_server.py [--rooms 500] [--players 4] [--tick-rate 10]
+单核可承载的房间数低于 --target 时返回非零退出码。
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.game_client import run_swarm
+from src.game_server import GameServerThread, encode
+from src.multiplayer import Arena
+
+
+def bench_rooms(rooms, players, ticks, seed=0):
+    """返回 (每步平均耗时秒, 平均每个房间每步的增量字节数, 平均快照字节数)"""
+    rng = random.Random(seed)
+    arenas = []
+    for r in range(rooms):
+        arena = Arena(40, 30, food_count=2, seed=seed + r)
+        for p in range(players):
+            arena.add_player(f'bot{p}')
+        arenas.append(arena)
+    # 预先生成转向序列，不把随机数的开销算进去
+    turns = [rng.choice((None,) * 6 + (0, 1, 2, 3)) for _ in range(4096)]
+
+    elapsed = 0.0
+    delta_bytes = 0
+    k = 0
+    for _ in range(ticks):
+        # 转向和重生相当于服务端在两步之间处理客户端的操作，单独计时之外
+        for arena in arenas:
+            for snake in arena.snakes.values():
+                k += 1
+                if not snake.alive:
+                    arena.respawn(snake.id)
+                elif turns[k & 4095] is not None:
+                    arena.turn(snake.id, turns[k & 4095])
+        start = time.perf_counter()
+        for arena in arenas:
+            delta_bytes += len(encode(arena.step()))
+        elapsed += time.perf_counter() - start
+    snapshot_bytes = sum(len(encode(arena.snapshot())) for arena in arenas)
+    return elapsed / ticks, delta_bytes / ticks / rooms, snapshot_bytes / rooms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='多人对战服务基准测试')
+    parser.add_argument('--rooms', type=int, default=500)
+    parser.add_argument('--players', type=int, default=4, help='每个房间的玩家数')
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--tick-rate', type=float, default=10, help='每秒步数')
+    parser.add_argument('--swarm-rooms', type=int, default=25, help='机器人集群的房间数')
+    parser.add_argument('--swarm-ticks', type=int, default=50, help='机器人集群运行的步数')
+    parser.add_argument('--target', type=int, default=200, help='单核可承载房间数的目标')
+    args = parser.parse_args()
+
+    tick_time, delta_bytes, snapshot_bytes = bench_rooms(args.rooms, args.players, args.ticks)
+    interval = 1.0 / args.tick_rate
+    capacity = int(interval / (tick_time / args.rooms))
+    print(f'{args.rooms} 个房间 x {args.players} 人: 每步 {tick_time * 1000:.2f} 毫秒 '
+          f'（每个房间 {tick_time / args.rooms * 1e6:.1f} 微秒）')
+    print(f'单核每秒 {args.tick_rate:g} 步可承载约 {capacity:,} 个房间')
+    print(f'每个房间每步广播 {delta_bytes:.0f} 字节（完整快照 {snapshot_bytes:.0f} 字节）')
+
+    server = GameServerThread(tick_rate=args.tick_rate)
+    try:
+        start = time.perf_counter()
+        results = asyncio.run(run_swarm('127.0.0.1', server.port, args.swarm_rooms,
+                                        args.players, args.swarm_ticks))
+        elapsed = time.perf_counter() - start
+        stats = server.stats()
+    finally:
+        server.stop()
+    print(f'机器人集群 {len(results)} 个（{args.swarm_rooms} 个房间）运行 {elapsed:.1f} 秒: '
+          f'服务端每步 p50 {stats["tick_ms_p50"]:.2f} 毫秒, p99 {stats["tick_ms_p99"]:.2f} 毫秒, '
+          f'最长 {stats["tick_ms_max"]:.2f} 毫秒, 断开慢客户端 {stats["dropped_clients"]} 个')
+
+    if capacity < args.target:
+        print(f'未达到目标 {args.target} 个房间')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
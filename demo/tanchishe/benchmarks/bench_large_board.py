@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+大棋盘基准测试
+
+在 2000x2000 的棋盘上让蛇沿蛇形路线一路吃食物长到 --length 节，
+然后统计：建立引擎的耗时和内存、每步模拟耗时、镜头模式下每帧绘制耗时，
+并检查 模拟一步 + 绘制一帧 能否在 60 FPS 的帧预算（16.7 毫秒）内完成。
+用法：
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_large_board.py [--size 2000] [--length 50000]
+超出帧预算时返回非零退出码。
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from src.engine import SnakeEngine, RIGHT, DOWN, LEFT
+from src.game_state import GameState
+from src.renderer import BoardRenderer
+from src.settings import Settings
+
+
+class HudStub:
+    """不加载字体的界面替身，分数区域画一个色块"""
+    def __init__(self, settings):
+        self.settings = settings
+
+    def draw_score(self, screen, score):
+        return screen.fill(self.settings.grid_color, (10, 10, 60, 20))
+
+    def draw(self, screen, game_state):
+        pass
+
+
+def serpentine(engine, margin=10):
+    """蛇形路线：横向走到接近边缘后向下一格再掉头"""
+    x, y = engine.cell_to_xy(engine.head)
+    if engine.direction == DOWN:
+        return LEFT if x > engine.width // 2 else RIGHT
+    if engine.direction == RIGHT and x >= engine.width - margin:
+        return DOWN
+    if engine.direction == LEFT and x <= margin:
+        return DOWN
+    return engine.direction
+
+
+def main():
+    parser = argparse.ArgumentParser(description='大棋盘基准测试')
+    parser.add_argument('--size', type=int, default=2000, help='棋盘边长（格子数）')
+    parser.add_argument('--length', type=int, default=50_000, help='蛇的长度')
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = SnakeEngine(width=args.size, height=args.size, seed=0)
+    elapsed = time.perf_counter() - start
+    # tracemalloc 会拖慢分配，单独再建一次来统计内存
+    del engine
+    tracemalloc.start()
+    engine = SnakeEngine(width=args.size, height=args.size, seed=0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{args.size}x{args.size} 棋盘: 建立引擎 {elapsed:.2f} 秒, 占用内存 {memory / 2**20:.1f} MB')
+
+    # 每一步都把食物放在蛇头前方，蛇一直生长
+    start = time.perf_counter()
+    while engine.length < args.length:
+        action = serpentine(engine)
+        engine.food = engine._neighbours[action][engine.head]
+        events, done = engine.step(action)
+        if done:
+            print('蛇撞到了边缘，请减小 --length')
+            return 1
+    print(f'生长到 {engine.length:,} 节: {time.perf_counter() - start:.2f} 秒')
+    engine.food = 0
+
+    pygame.init()
+    settings = Settings()
+    settings.show_grid = True
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+    game_state = GameState.__new__(GameState)
+    game_state.state = GameState.PLAYING
+    game_state.score = engine.score
+    renderer = BoardRenderer(settings, engine, HudStub(settings))
+    renderer.render(screen, game_state)
+
+    step_time = render_time = worst = 0.0
+    for _ in range(args.frames):
+        t0 = time.perf_counter()
+        engine.step(serpentine(engine))
+        t1 = time.perf_counter()
+        renderer.render(screen, game_state)
+        t2 = time.perf_counter()
+        step_time += t1 - t0
+        render_time += t2 - t1
+        worst = max(worst, t2 - t0)
+    pygame.quit()
+    frame_ms = (step_time + render_time) / args.frames * 1000
+    print(f'每步模拟 {step_time / args.frames * 1e6:.1f} 微秒, '
+          f'每帧绘制 {render_time / args.frames * 1000:.2f} 毫秒（视野 {renderer.camera.view_width}x'
+          f'{renderer.camera.view_height} 格）, 合计 {frame_ms:.2f} 毫秒, 最慢 {worst * 1000:.2f} 毫秒')
+
+    if frame_ms > 1000 / 60:
+        print('超出 60 FPS 的帧预算')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
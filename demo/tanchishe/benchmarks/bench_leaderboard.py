@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜数据库基准测试
+
+向临时的 SQLite 排行榜写入大量对局结果，再测量前 k 名、深度翻页、
+名次查询和单条写入的耗时。
+用法：
+    python benchmarks/bench_leaderboard.py [--rows 1000000] [--batch 10000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.leaderboard import Leaderboard
+
+
+def timed(func, repeat):
+    """返回每次调用的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='排行榜数据库基准测试')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='写入的对局数')
+    parser.add_argument('--batch', type=int, default=10_000, help='每个事务写入的对局数')
+    parser.add_argument('--players', type=int, default=10_000, help='不同玩家的数量')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        leaderboard = Leaderboard(os.path.join(directory, 'leaderboard.db'))
+        rng = random.Random(0)
+        now = time.time()
+
+        start = time.perf_counter()
+        for first in range(0, args.rows, args.batch):
+            count = min(args.batch, args.rows - first)
+            rows = []
+            for i in range(count):
+                score = min(int(rng.expovariate(1 / 15)), 1197)
+                rows.append((f'bot{rng.randrange(args.players)}', score, score + 3,
+                             score * 40 + rng.randrange(200), score * 10.0, now + first + i))
+            leaderboard.add_many(rows)
+        elapsed = time.perf_counter() - start
+        print(f'批量写入 {args.rows:,} 局: {elapsed:.1f} 秒 ({args.rows / elapsed:,.0f} 局/秒)')
+
+        print(f'总数: {timed(leaderboard.count, 100):,.1f} 微秒')
+        print(f'前 10 名: {timed(lambda: leaderboard.top(10), 1000):,.1f} 微秒')
+        print(f'名次查询: {timed(lambda: leaderboard.rank_of_score(rng.randrange(100)), 1000):,.1f} 微秒')
+        print(f'玩家最高分: {timed(lambda: leaderboard.best_of(f"bot{rng.randrange(args.players)}"), 1000):,.1f} 微秒')
+
+        # 从第一页连续翻页，最后一页和第一页一样快
+        cursor = None
+        pages = 0
+        start = time.perf_counter()
+        while pages < 2000:
+            page = leaderboard.page_after(cursor, 8)
+            if not page:
+                break
+            cursor = page[-1]
+            pages += 1
+        print(f'连续翻页: {(time.perf_counter() - start) / pages * 1e6:,.1f} 微秒/页 ({pages} 页)')
+
+        start = time.perf_counter()
+        for i in range(200):
+            leaderboard.add('bench', rng.randrange(100), 10, 400, 100.0)
+        print(f'单局写入（独立事务）: {(time.perf_counter() - start) / 200 * 1e6:,.1f} 微秒')
+        leaderboard.close()
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
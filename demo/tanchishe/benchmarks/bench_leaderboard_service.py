@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜服务压力测试
+
+在本进程中启动排行榜服务（临时数据库），若干线程各自用 LeaderboardClient
+模拟一个游戏实例持续上报结果，统计服务端确认的吞吐量和 submit() 的最长耗时，
+最后核对数据库中的总局数。
+用法：
+    python benchmarks/bench_leaderboard_service.py [--clients 8] [--results 5000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.leaderboard import Leaderboard
+from src.leaderboard_client import LeaderboardClient
+from src.leaderboard_server import ServerThread
+
+
+def run_client(port, index, count, pool_size, stats):
+    """一个模拟的游戏实例：上报 count 局结果并等待全部确认"""
+    rng = random.Random(index)
+    client = LeaderboardClient('127.0.0.1', port, pool_size=pool_size)
+    slowest = 0.0
+    for _ in range(count):
+        score = min(int(rng.expovariate(1 / 15)), 1197)
+        start = time.perf_counter()
+        client.submit(f'bot{index}', score, score + 3, score * 40, score * 10.0)
+        slowest = max(slowest, time.perf_counter() - start)
+    client.flush(timeout=60)
+    stats.append((client.sent, client.dropped, client.retries, slowest))
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='排行榜服务压力测试')
+    parser.add_argument('--clients', type=int, default=8, help='模拟的游戏实例数')
+    parser.add_argument('--results', type=int, default=5000, help='每个实例上报的局数')
+    parser.add_argument('--pool', type=int, default=2, help='每个客户端的连接数')
+    parser.add_argument('--target', type=float, default=2000, help='目标吞吐量（局/秒）')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    server = ServerThread(os.path.join(directory, 'server.db'))
+    try:
+        stats = []
+        threads = [threading.Thread(target=run_client,
+                                    args=(server.port, i, args.results, args.pool, stats))
+                   for i in range(args.clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        total = args.clients * args.results
+        sent = sum(s[0] for s in stats)
+        rate = sent / elapsed
+        print(f'{args.clients} 个客户端共上报 {total:,} 局: {elapsed:.2f} 秒 ({rate:,.0f} 局/秒)')
+        print(f'已确认 {sent:,} 局, 丢弃 {sum(s[1] for s in stats)}, 重试 {sum(s[2] for s in stats)}')
+        print(f'submit() 最长耗时: {max(s[3] for s in stats) * 1e3:.2f} 毫秒')
+
+    finally:
+        server.stop()
+    try:
+        # 服务停止时已等待写线程写完
+        leaderboard = Leaderboard(os.path.join(directory, 'server.db'))
+        stored = leaderboard.count()
+        leaderboard.close()
+        print(f'数据库中的局数: {stored:,}')
+    finally:
+        shutil.rmtree(directory)
+
+    if stored != total:
+        print('数据库中的局数与上报数不一致')
+        return 1
+    if rate < args.target:
+        print(f'未达到目标吞吐量 {args.target:,.0f} 局/秒')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
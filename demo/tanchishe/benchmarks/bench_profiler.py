@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+逐帧计时开销测试
+
+用真实的 Game（无显示器）在游戏进行中连续运行帧（不做帧率等待，每帧推进一步），
+交替测量 不计时 和 打开计时并写 CSV 两种情况下每帧的耗时，各取最快的一轮比较；
+同时单独测量计时本身（begin_frame + 5 次 mark + end_frame）的耗时。
+用法：
+    SDL_VIDEODRIVER=dummy SDL_AUDIODRIVER=dummy python benchmarks/bench_profiler.py [--frames 2000]
+无显示器时一帧只有几十微秒的工作量，远小于真实窗口下的一帧，
+所以以 60 FPS 的帧预算（16.7 毫秒）为准：计时本身超过帧预算的 1% 时返回非零退出码。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from main import Game
+from engine import UP, RIGHT, DOWN, LEFT
+from frame_profiler import FrameProfiler
+
+
+class NoWaitClock:
+    """不等待的帧时钟"""
+    def tick(self, framerate=0):
+        return 0
+
+
+class StepTimer:
+    """每帧前进一个移动间隔的模拟时钟，保证每帧正好推进一步"""
+    def __init__(self, step):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run(game, timer, frames):
+    """运行 frames 帧（蛇绕 5x5 的方框转圈，不会死亡），返回每帧平均耗时（微秒）"""
+    clock = NoWaitClock()
+    turns = (RIGHT, DOWN, LEFT, UP)
+    start = time.perf_counter()
+    for i in range(frames):
+        if i % 5 == 0:
+            game._queue_turn(turns[i // 5 % 4])
+        timer.now += timer.step
+        game._run_frame(clock)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='逐帧计时开销测试')
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    game = Game()
+    timer = StepTimer(game.move_delay)
+    game.sim_clock = timer
+    game._start_new_game()
+    game.engine.food = -1
+    game._update_screen()
+
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, 'frames.csv')
+    profiler = FrameProfiler(csv_path=csv_path)
+    base = []
+    profiled = []
+    for _ in range(args.rounds):
+        game.profiler = None
+        base.append(run(game, timer, args.frames))
+        game.profiler = profiler
+        profiled.append(run(game, timer, args.frames))
+    game.profiler = None
+    assert game.game_state.is_playing()
+
+    # 单独测量计时本身
+    bare = FrameProfiler(csv_path=os.path.join(directory, 'bare.csv'))
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        bare.begin_frame()
+        for phase in range(5):
+            bare.mark(phase)
+        bare.end_frame(1)
+    bookkeeping = (time.perf_counter() - start) / args.frames * 1e6
+    bare.close()
+    profiler.close()
+    pygame.quit()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+    work = min(base)
+    print(f'每帧工作量（不计时）: {work:.1f} 微秒, 打开计时: {min(profiled):.1f} 微秒 '
+          f'（差 {(min(profiled) - work) / work * 100:+.2f}%，含测量噪声）')
+    share = bookkeeping / (1e6 / 60) * 100
+    print(f'计时本身: {bookkeeping:.2f} 微秒/帧, 占无显示器一帧工作量的 '
+          f'{bookkeeping / work * 100:.1f}%, 占 60 FPS 帧预算的 {share:.3f}%')
+    if share > 1:
+        print('计时开销超过 1%')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
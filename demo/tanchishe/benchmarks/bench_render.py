@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+棋盘整屏重绘基准测试
+
+对比两种画法在打开网格线时整屏重绘一帧的耗时：
+- 逐个调用 pygame.draw：填充背景、画每一条网格线、每一节蛇身一个 draw.rect
+- 预渲染图层（board_layers.py）：一次背景 blit 加一批 Surface.blits
+默认棋盘 40x30（20 像素格子），大棋盘 160x120（5 像素格子），蛇身占满一半格子。
+用法：
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_render.py [--frames 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from src.board_layers import BoardLayers
+from src.settings import Settings
+
+
+def draw_direct(screen, settings, width, height, body, food):
+    """改动前的画法：每条网格线、每节蛇身各一次绘制调用"""
+    grid_size = settings.grid_size
+    screen.fill(settings.bg_color)
+    for x in range(grid_size, width * grid_size, grid_size):
+        pygame.draw.line(screen, settings.grid_line_color, (x, 0), (x, height * grid_size - 1))
+    for y in range(grid_size, height * grid_size, grid_size):
+        pygame.draw.line(screen, settings.grid_line_color, (0, y), (width * grid_size - 1, y))
+    for cell in body:
+        pygame.draw.rect(screen, settings.snake_color,
+                         ((cell % width) * grid_size, (cell // width) * grid_size,
+                          grid_size - 2, grid_size - 2))
+    pygame.draw.rect(screen, settings.food_color,
+                     ((food % width) * grid_size, (food // width) * grid_size,
+                      grid_size, grid_size))
+
+
+def draw_layers(screen, layers, body, food):
+    """预渲染图层的画法"""
+    screen.blit(layers.background, (0, 0))
+    layers.draw_snake(screen, body)
+    layers.draw_food(screen, food)
+
+
+def timed(func, frames):
+    """返回每帧平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='棋盘整屏重绘基准测试')
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    settings = Settings()
+    settings.show_grid = True
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+    for grid_size in (20, 5):
+        settings.grid_size = grid_size
+        width = settings.screen_width // grid_size
+        height = settings.screen_height // grid_size
+        # 蛇身按行来回铺满上半个棋盘
+        body = list(range(width * height // 2))
+        food = width * height - 1
+        layers = BoardLayers(settings, width, height, screen)
+
+        direct = timed(lambda: draw_direct(screen, settings, width, height, body, food),
+                       args.frames)
+        layered = timed(lambda: draw_layers(screen, layers, body, food), args.frames)
+        calls = width + height + len(body)
+        print(f'{width}x{height} 棋盘, 蛇长 {len(body)}: '
+              f'逐个绘制 {direct:.2f} 毫秒/帧（约 {calls} 次调用）, '
+              f'预渲染图层 {layered:.2f} 毫秒/帧, 快 {direct / layered:.1f} 倍')
+    pygame.quit()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
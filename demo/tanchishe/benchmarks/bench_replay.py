@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+录像回放速度基准测试
+
+用贪心策略录制若干局，再无界面地重放，统计每秒重放的步数，
+并检查每局重放结果与录像一致。
+用法：
+    python benchmarks/bench_replay.py [--games 50] [--target 100000]
+低于目标值或重放结果不一致时返回非零退出码。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.replay import record, simulate
+
+
+def greedy_policy(engine):
+    """朝食物走，避开墙和蛇身；走投无路时保持方向"""
+    head = engine.head
+    width = engine.width
+    food_x, food_y = engine.food % width, engine.food // width
+    head_x, head_y = head % width, head // width
+    occupied = engine.occupied
+    neighbours = engine._neighbours
+    safe = [d for d in range(4)
+            if d != (engine.direction + 2) & 3
+            and neighbours[d][head] >= 0 and not occupied[neighbours[d][head]]]
+    if not safe:
+        return None
+    preferred = []
+    if food_y < head_y:
+        preferred.append(0)
+    if food_x > head_x:
+        preferred.append(1)
+    if food_y > head_y:
+        preferred.append(2)
+    if food_x < head_x:
+        preferred.append(3)
+    for direction in preferred:
+        if direction in safe:
+            return direction if direction != engine.direction else None
+    return safe[0] if safe[0] != engine.direction else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='录像回放速度基准测试')
+    parser.add_argument('--games', type=int, default=50, help='录制的局数')
+    parser.add_argument('--target', type=float, default=100_000, help='目标每秒步数')
+    args = parser.parse_args()
+
+    replays = [record(greedy_policy, seed=seed) for seed in range(args.games)]
+    ticks = sum(replay.ticks for replay in replays)
+    size = sum(len(replay.to_bytes()) for replay in replays)
+
+    start = time.perf_counter()
+    engines = [simulate(replay) for replay in replays]
+    elapsed = time.perf_counter() - start
+    rate = ticks / elapsed
+
+    mismatched = sum(engine.score != replay.score or engine.steps != replay.ticks
+                     for engine, replay in zip(engines, replays))
+    print(f'{args.games} 局, 共 {ticks:,} 步, 录像共 {size:,} 字节 '
+          f'(平均每步 {size / ticks:.3f} 字节)')
+    print(f'重放速度: {rate:,.0f} 步/秒')
+    if mismatched:
+        print(f'{mismatched} 局重放结果与录像不一致')
+        return 1
+    if rate < args.target:
+        print(f'未达到目标 {args.target:,.0f} 步/秒')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+SnakeEnv 吞吐量基准测试
+
+在 20x20 的棋盘上用随机动作推进 SnakeEnv，分别统计每种观测类型的每秒步数，
+并与两种参照比较：
+- 只推进 SnakeEngine、不生成观测（观测开销的下限）
+- 每步分配一个新数组、按蛇身从头画出网格观测（不做增量更新、不复用缓冲区的写法）
+用法：
+    python benchmarks/bench_snake_env.py [--steps 200000] [--size 20] [--target 100000]
+grid 观测低于目标值（步/秒）时返回非零退出码。
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine import SnakeEngine
+from src.snake_env import SnakeEnv, OBSERVATIONS
+
+
+def make_actions(count, seed=0):
+    """预先生成动作，避免把随机数生成的开销算进环境"""
+    return np.random.default_rng(seed).integers(0, 4, size=count).tolist()
+
+
+def run_env(observation, steps, size):
+    """返回 (每秒步数, 完成的局数)"""
+    env = SnakeEnv(size, size, observation=observation)
+    env.reset(seed=0)
+    actions = make_actions(4096)
+    episodes = 0
+    start = time.perf_counter()
+    for i in range(steps):
+        _, _, terminated, truncated, _ = env.step(actions[i & 4095])
+        if terminated or truncated:
+            episodes += 1
+            env.reset(seed=i)
+    return steps / (time.perf_counter() - start), episodes
+
+
+def run_engine(steps, size, observe=False):
+    """只用 SnakeEngine；observe 为 True 时每步分配新数组并从头画出网格观测"""
+    engine = SnakeEngine(size, size, seed=0)
+    actions = make_actions(4096)
+    start = time.perf_counter()
+    for i in range(steps):
+        _, done = engine.step(actions[i & 4095])
+        if observe:
+            grid = np.zeros((3, size * size), dtype=np.uint8)
+            grid[0, list(engine.body)] = 1
+            grid[1, engine.head] = 1
+            if engine.food >= 0:
+                grid[2, engine.food] = 1
+            grid.reshape(3, size, size)
+        if done:
+            engine.reset(seed=i)
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SnakeEnv 吞吐量基准测试')
+    parser.add_argument('--steps', type=int, default=200000)
+    parser.add_argument('--size', type=int, default=20)
+    parser.add_argument('--target', type=float, default=100000,
+                        help='grid 观测的目标步数/秒')
+    args = parser.parse_args()
+
+    print(f'{args.size}x{args.size} 棋盘，{args.steps} 步：')
+    print(f'{run_engine(args.steps, args.size):>12,.0f} 步/秒  只推进引擎')
+    print(f'{run_engine(args.steps, args.size, observe=True):>12,.0f} 步/秒  每步新建网格观测（参照）')
+    results = {}
+    for observation in OBSERVATIONS:
+        results[observation], episodes = run_env(observation, args.steps, args.size)
+        print(f'{results[observation]:>12,.0f} 步/秒  SnakeEnv {observation}（{episodes} 局）')
+
+    if results['grid'] < args.target:
+        print(f'grid 观测低于目标 {args.target:,.0f} 步/秒')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
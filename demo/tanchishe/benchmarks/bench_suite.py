@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+性能回归基准套件
+
+tests/ 只检查正确性，这个套件测量关键路径的耗时，结果保存为 JSON，
+可以和之前某次提交的结果比较，超过阈值就返回非零退出码：
+- snake.move / snake.check_collision：蛇长 10、1000、10000
+- food.respawn：棋盘（40x30）被占满 10%、90%、99%
+- ui.draw：每个 GameState 界面绘制一帧
+- frame：Game._update_screen 整屏重绘一帧、游戏中增量绘制一帧
+- startup：新进程中导入 main、创建 Game 并画出第一帧（含解释器启动）
+每项重复测量多轮，记录每次操作耗时（纳秒）的最小值和中位数，比较时用最小值（受干扰最小）。
+用法（无需显示器）：
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_suite.py --output before.json
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_suite.py --baseline before.json --threshold 0.2
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_suite.py --filter snake --quick
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import types
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from src.settings import Settings
+from src.snake import Snake
+from src.food import Food
+
+SNAKE_LENGTHS = (10, 1000, 10000)
+FILL_RATIOS = (0.10, 0.90, 0.99)
+# 长蛇测试用的棋盘：400x30 格，能放下 1 万节蛇身，最后一行留给蛇头前进
+LONG_BOARD = (400, 30)
+
+
+def board_settings(cols, rows):
+    """Snake / Food 内部会创建 Settings，这里返回一个按格子数改了窗口大小的 Settings 工厂"""
+    def factory():
+        settings = Settings()
+        settings.screen_width = cols * settings.grid_size
+        settings.screen_height = rows * settings.grid_size
+        return settings
+    return factory
+
+
+def build_snake(length, cols, rows):
+    """在 cols x rows 的棋盘上摆一条长 length 的蛇：蛇头在最后一行最左边朝右，
+    其余蛇身从左上角开始逐行排满，蛇头前方一整行都是空的"""
+    with mock.patch('src.snake.Settings', board_settings(cols, rows)):
+        snake = Snake()
+    for segment in list(snake._segments):
+        snake._vacate(segment)
+    snake._segments.clear()
+    grid_size = snake.settings.grid_size
+    head = (0, (rows - 1) * grid_size)
+    snake._segments.append(head)
+    snake._occupy(head)
+    for cell in range(length - 1):
+        segment = ((cell % cols) * grid_size, (cell // cols) * grid_size)
+        snake._segments.append(segment)
+        snake._occupy(segment)
+    snake.direction = snake.next_direction = 'RIGHT'
+    return snake
+
+
+# ---- 各项测试：每个函数返回一个"跑一批"的函数，后者返回 (计时的秒数, 操作次数) ----
+
+def case_snake_move(length):
+    cols, rows = LONG_BOARD
+
+    def batch():
+        # 蛇头沿最后一行前进，走到头之前重新摆放（摆放不计时）
+        snake = build_snake(length, cols, rows)
+        moves = cols - 2
+        move = snake.move
+        start = time.perf_counter()
+        for _ in range(moves):
+            move()
+        elapsed = time.perf_counter() - start
+        assert not snake.check_collision()
+        return elapsed, moves
+    return batch
+
+
+def case_snake_collision(length):
+    snake = build_snake(length, *LONG_BOARD)
+    check = snake.check_collision
+
+    def batch():
+        calls = 20000
+        start = time.perf_counter()
+        for _ in range(calls):
+            check()
+        return time.perf_counter() - start, calls
+    return batch
+
+
+def case_food_respawn(ratio):
+    cols, rows = 40, 30
+    snake = build_snake(int(cols * rows * ratio), cols, rows)
+    with mock.patch('src.food.Settings', board_settings(cols, rows)):
+        food = Food()
+    body = snake.body
+
+    def batch():
+        calls = 20000
+        respawn = food.respawn
+        start = time.perf_counter()
+        for _ in range(calls):
+            respawn(body)
+        elapsed = time.perf_counter() - start
+        assert not snake.is_occupied(food.position)
+        return elapsed, calls
+    return batch
+
+
+def make_ui():
+    """不依赖 Game 的 UIManager 和带排行榜数据的 GameState（与 bench_ui.py 相同）"""
+    from ui_manager import UIManager
+    from game_state import GameState
+    from leaderboard import Leaderboard
+    pygame.init()
+    settings = Settings()
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+    ui_manager = UIManager(types.SimpleNamespace(settings=settings))
+    game_state = GameState.__new__(GameState)
+    game_state.score = 12
+    game_state.high_scores = [38, 18, 12, 10, 5, 0, 0, 0, 0, 0]
+    game_state._leaderboard = Leaderboard()
+    game_state._leaderboard.add_many(
+        [('玩家', score, score + 3, score * 40, score * 10.0, 0.0) for score in range(30)])
+    return screen, ui_manager, game_state
+
+
+def case_ui_draw(state, ui):
+    screen, ui_manager, game_state = ui
+
+    def batch():
+        game_state.state = state
+        frames = 50
+        start = time.perf_counter()
+        for _ in range(frames):
+            screen.fill((0, 0, 0))
+            ui_manager.draw(screen, game_state)
+        return time.perf_counter() - start, frames
+    return batch
+
+
+class StepTimer:
+    """手动推进的模拟时钟，每帧正好推进一步"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_game():
+    """开好一局的 Game，蛇绕 5x5 的方框转圈、食物放在棋盘外，永远不会结束"""
+    from main import Game
+    game = Game()
+    game.sim_clock = StepTimer()
+    game._start_new_game()
+    game.engine.food = -1
+    game._update_screen()
+    return game
+
+
+def case_frame(game, full):
+    from engine import UP, RIGHT, DOWN, LEFT
+    turns = (RIGHT, DOWN, LEFT, UP)
+    state = {'frame': 0}
+
+    def batch():
+        frames = 100
+        timer = game.sim_clock
+        start = time.perf_counter()
+        for _ in range(frames):
+            i = state['frame']
+            state['frame'] = i + 1
+            if full:
+                game.renderer.invalidate()
+            else:
+                if i % 5 == 0:
+                    game._queue_turn(turns[i // 5 % 4])
+                timer.now += game.move_delay
+                game._update_game()
+            game._update_screen()
+        elapsed = time.perf_counter() - start
+        assert game.game_state.is_playing()
+        return elapsed, frames
+    return batch
+
+
+STARTUP_SCRIPT = '''
+import sys
+sys.path.insert(0, {src!r})
+import main
+game = main.Game()
+game._update_screen()
+'''
+
+
+def case_startup():
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    script = STARTUP_SCRIPT.format(src=os.path.join(ROOT, 'src'))
+
+    def batch():
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', script], env=env, cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+        return time.perf_counter() - start, 1
+    return batch
+
+
+def build_cases():
+    """(名称, 生成批处理函数的工厂)，工厂推迟到确实要运行时才调用"""
+    cases = []
+    for length in SNAKE_LENGTHS:
+        cases.append((f'snake.move/len={length}', lambda n=length: case_snake_move(n)))
+    for length in SNAKE_LENGTHS:
+        cases.append((f'snake.check_collision/len={length}',
+                      lambda n=length: case_snake_collision(n)))
+    for ratio in FILL_RATIOS:
+        cases.append((f'food.respawn/fill={ratio:.0%}', lambda r=ratio: case_food_respawn(r)))
+    ui = []
+
+    def shared_ui():
+        if not ui:
+            ui.append(make_ui())
+        return ui[0]
+    from game_state import GameState
+    for state in (GameState.MENU, GameState.PLAYING, GameState.PAUSED,
+                  GameState.GAME_OVER, GameState.HIGH_SCORES):
+        cases.append((f'ui.draw/{state}', lambda s=state: case_ui_draw(s, shared_ui())))
+    game = []
+
+    def shared_game():
+        if not game:
+            game.append(make_game())
+        return game[0]
+    cases.append(('frame/full', lambda: case_frame(shared_game(), True)))
+    cases.append(('frame/incremental', lambda: case_frame(shared_game(), False)))
+    cases.append(('startup', case_startup))
+    return cases
+
+
+def measure(batch, rounds):
+    """运行 rounds 批，返回每次操作耗时（纳秒）的最小值和中位数"""
+    batch()  # 预热
+    samples = []
+    for _ in range(rounds):
+        elapsed, ops = batch()
+        samples.append(elapsed / ops * 1e9)
+    return {'min_ns': min(samples), 'median_ns': statistics.median(samples), 'rounds': rounds}
+
+
+def format_ns(value):
+    """按大小选择单位"""
+    if value >= 1e6:
+        return f'{value / 1e6:.2f} ms'
+    if value >= 1e3:
+        return f'{value / 1e3:.2f} us'
+    return f'{value:.0f} ns'
+
+
+def git_commit():
+    """当前提交的哈希，不在 git 仓库中时返回 None"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results, baseline, threshold):
+    """与基准结果比较最小耗时，返回变慢超过 threshold（比例）的 [(名称, 基准, 当前, 比值)]"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        ratio = result['min_ns'] / old['min_ns']
+        if ratio > 1 + threshold:
+            regressions.append((name, old['min_ns'], result['min_ns'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='性能回归基准套件')
+    parser.add_argument('--output', default=None, metavar='PATH', help='把结果写入 JSON 文件')
+    parser.add_argument('--baseline', default=None, metavar='PATH',
+                        help='与之前保存的 JSON 结果比较')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='最小耗时比基准慢超过这个比例算作退化（默认 0.25，即 25%%）')
+    parser.add_argument('--rounds', type=int, default=7, help='每项测量的轮数')
+    parser.add_argument('--filter', default=None, help='只运行名称中包含该字符串的测试')
+    parser.add_argument('--quick', action='store_true', help='每项只测 3 轮，用于快速检查')
+    args = parser.parse_args()
+    rounds = 3 if args.quick else args.rounds
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    print(f'{"测试":<36}{"最小":>12}{"中位数":>12}{"基准":>12}{"变化":>9}')
+    for name, factory in build_cases():
+        if args.filter and args.filter not in name:
+            continue
+        result = measure(factory(), rounds)
+        results[name] = result
+        line = f'{name:<36}{format_ns(result["min_ns"]):>12}{format_ns(result["median_ns"]):>12}'
+        if baseline is not None and name in baseline:
+            old = baseline[name]['min_ns']
+            line += f'{format_ns(old):>12}{(result["min_ns"] / old - 1) * 100:>+8.1f}%'
+        print(line)
+    pygame.quit()
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'commit': git_commit(),
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python': platform.python_version(),
+                    'pygame': pygame.version.ver,
+                    'platform': platform.platform(),
+                    'rounds': rounds,
+                },
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f'结果已写入 {args.output}')
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f'退化: {name} {format_ns(old)} -> {format_ns(new)} ({ratio:.2f}x)')
+        if regressions:
+            return 1
+        print(f'没有超过 {args.threshold:.0%} 的退化')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
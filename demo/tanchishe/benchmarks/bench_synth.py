@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+音效加载耗时测试
+
+比较 SoundManager 准备全部音效（4 个音效、8 个吃食物变体、背景音乐）的三种方式：
+- 读取 assets/sounds 下的 WAV 文件（改动前的做法，不含变体）
+- 在内存中合成（默认）
+- 从磁盘缓存读取之前合成的结果（cache_dir）
+用法：
+    SDL_AUDIODRIVER=dummy python benchmarks/bench_synth.py [--rounds 10]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from src.sound_manager import SoundManager
+from src.synth import EFFECTS, render, semitones
+
+
+def best_of(func, rounds):
+    """返回最快一轮的耗时（毫秒）"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='音效加载耗时测试')
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    manager = SoundManager(background=True)
+    directory = tempfile.mkdtemp()
+    try:
+        wav = best_of(manager.load_sounds, args.rounds)
+        synth = best_of(manager.synthesize_sounds, args.rounds)
+        manager.cache_dir = directory
+        manager.synthesize_sounds()  # 第一次写入磁盘缓存
+        cached = best_of(manager.synthesize_sounds, args.rounds)
+    finally:
+        shutil.rmtree(directory)
+
+    # 8 个变体一批合成与逐个合成的对比
+    pitches = semitones(8)
+    batch = best_of(lambda: render(EFFECTS['eat'], 44100, pitches), args.rounds * 10)
+    single = best_of(lambda: [render(EFFECTS['eat'], 44100, (p,)) for p in pitches],
+                     args.rounds * 10)
+    pygame.quit()
+
+    print(f'读取 WAV 文件:        {wav:8.2f} ms')
+    print(f'内存合成（含变体）:   {synth:8.2f} ms')
+    print(f'读取磁盘缓存:         {cached:8.2f} ms')
+    print(f'8 个吃食物变体: 一批合成 {batch:.2f} ms, 逐个合成 {single:.2f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+UI 绘制基准测试
+
+分别在开启和关闭文字缓存的情况下绘制各个界面，比较每帧耗时。
+用法（无需显示器）：
+    SDL_VIDEODRIVER=dummy python benchmarks/bench_ui.py [--frames 300]
+"""
+import argparse
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from settings import Settings
+from game_state import GameState
+from text_cache import TextCache
+from ui_manager import UIManager
+from leaderboard import Leaderboard
+
+STATES = (GameState.MENU, GameState.PLAYING, GameState.PAUSED,
+          GameState.GAME_OVER, GameState.HIGH_SCORES)
+
+
+def set_text_cache(ui_manager, cache):
+    """替换 UIManager 和所有按钮使用的文字缓存"""
+    ui_manager.text_cache = cache
+    for buttons in ui_manager.buttons.values():
+        for button in buttons.values():
+            button.text_cache = cache
+
+
+def time_frames(ui_manager, screen, game_state, frames):
+    """返回每帧平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        ui_manager.draw(screen, game_state)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UI 绘制基准测试')
+    parser.add_argument('--frames', type=int, default=300, help='每个界面绘制的帧数')
+    args = parser.parse_args()
+
+    pygame.init()
+    settings = Settings()
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+    ui_manager = UIManager(types.SimpleNamespace(settings=settings))
+    game_state = GameState.__new__(GameState)
+    game_state.score = 12
+    game_state.high_scores = [38, 18, 12, 10, 5, 0, 0, 0, 0, 0]
+    game_state._leaderboard = Leaderboard()
+    game_state._leaderboard.add_many(
+        [('玩家', score, score + 3, score * 40, score * 10.0, 0.0) for score in range(30)])
+
+    print(f'{"界面":<12}{"无缓存(ms)":>12}{"有缓存(ms)":>12}{"加速":>8}')
+    for state in STATES:
+        game_state.state = state
+        set_text_cache(ui_manager, TextCache(max_entries=0))
+        uncached = time_frames(ui_manager, screen, game_state, args.frames)
+        cache = TextCache()
+        set_text_cache(ui_manager, cache)
+        cached = time_frames(ui_manager, screen, game_state, args.frames)
+        print(f'{state:<12}{uncached:>12.3f}{cached:>12.3f}{uncached / cached:>7.1f}x'
+              f'  (命中 {cache.hits}, 未命中 {cache.misses})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
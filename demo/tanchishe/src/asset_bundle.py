@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+资源包
+
+把字体和预先合成的 PCM 音效打包成一个带索引的文件（由 build_assets.py 生成），
+运行时用 mmap 只读打开，取出的资源是指向映射内存的 memoryview，不复制：
+- PCM 音效由 synth.SoundCache 用 np.frombuffer 直接包装成数组
+- 子集字体只有几十 KB，open() 把它复制成内存文件交给 pygame.font.Font：
+  FreeType 加载字体要读几千次小块数据，pygame 对每次读取都要回调 Python 文件对象，
+  直接包装映射内存的文件对象反而比复制一份慢一倍多
+
+文件格式（小端）：
+    8 字节魔数 | 4 字节索引长度 | 索引（UTF-8 JSON） | 数据（每项按 ALIGNMENT 对齐）
+索引为 {"version": 1, "entries": {名称: {"offset": 文件内偏移, "size": 字节数, "meta": {...}}}}。
+"""
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+
+logger = logging.getLogger('AssetBundle')
+
+MAGIC = b'SNKBNDL\0'
+BUNDLE_VERSION = 1
+ALIGNMENT = 16
+_HEADER = struct.Struct('<8sI')
+
+DEFAULT_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'assets', 'bundle.snkb')
+
+# 资源名称
+FONT_ASSET = 'font/main'
+PCM_PREFIX = 'pcm/'
+
+
+class BundleError(Exception):
+    """资源包格式错误"""
+
+
+class AssetBundle:
+    """用 mmap 只读打开的资源包"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            # 映射建立后文件可以关闭
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._view = memoryview(self._mmap)
+            self.entries = self._read_index()
+        except BundleError:
+            self.close()
+            raise
+
+    def _read_index(self):
+        if len(self._view) < _HEADER.size:
+            raise BundleError(f'文件太短: {self.path}')
+        magic, length = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise BundleError(f'不是资源包: {self.path}')
+        try:
+            index = json.loads(bytes(self._view[_HEADER.size:_HEADER.size + length]).decode('utf-8'))
+        except ValueError as e:
+            raise BundleError(f'索引损坏: {e}')
+        if index.get('version') != BUNDLE_VERSION:
+            raise BundleError(f'不支持的资源包版本: {index.get("version")}')
+        for name, entry in index['entries'].items():
+            if entry['offset'] + entry['size'] > len(self._view):
+                raise BundleError(f'资源超出文件范围: {name}')
+        return index['entries']
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        return list(self.entries)
+
+    def meta(self, name):
+        """资源的附加信息（字体的字符集、PCM 的形状等）"""
+        return self.entries[name]['meta']
+
+    def get(self, name):
+        """返回资源内容的 memoryview（指向映射内存，不复制）"""
+        entry = self.entries[name]
+        return self._view[entry['offset']:entry['offset'] + entry['size']]
+
+    def open(self, name):
+        """返回资源内容的内存文件对象（复制一份，适合字体这类小资源）"""
+        return io.BytesIO(self.get(name))
+
+    def close(self):
+        """解除映射；还有资源的 memoryview 在使用时留给垃圾回收"""
+        try:
+            self._view.release()
+            self._mmap.close()
+        except (AttributeError, BufferError):
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_bundle(path=DEFAULT_BUNDLE_PATH):
+    """打开资源包；文件不存在或格式不对时返回 None（调用方退回读取单独的资源文件）"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return AssetBundle(path)
+    except (OSError, ValueError, BundleError) as e:
+        logger.warning('打开资源包失败，改为读取单独的资源文件: %s', e)
+        return None
+
+
+def write_bundle(path, entries):
+    """写资源包，entries 为 (名称, 数据, meta) 列表，数据是任意 bytes-like 对象"""
+    index = {}
+    blobs = []
+    offset = 0
+    for name, data, meta in entries:
+        data = memoryview(data).cast('B')
+        index[name] = {'offset': offset, 'size': len(data), 'meta': meta}
+        blobs.append(data)
+        offset += -(-len(data) // ALIGNMENT) * ALIGNMENT
+
+    # 偏移量写进索引之后索引长度可能变化，先按相对偏移算出长度再补齐
+    def encode(base):
+        entries_at = {name: dict(entry, offset=entry['offset'] + base) for name, entry in index.items()}
+        return json.dumps({'version': BUNDLE_VERSION, 'entries': entries_at},
+                          ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+    base = 0
+    while True:
+        header = encode(base)
+        data_start = -(-(_HEADER.size + len(header)) // ALIGNMENT) * ALIGNMENT
+        if data_start == base:
+            break
+        base = data_start
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            for data in blobs:
+                f.write(b'\0' * (-f.tell() % ALIGNMENT))
+                f.write(data)
+        # mkstemp 创建的文件只有所有者可读，改成普通文件的权限
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o644 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy 向量化的批量贪吃蛇环境
+
+把成千上万局游戏的状态（蛇身环形缓冲区、占用网格、空闲格子索引、
+方向、食物、随机数计数器）放在 NumPy 数组里，一次 step(actions)
+同时推进所有对局，结束的对局自动重置。
+
+规则与 SnakeEngine 逐步一致：同一个种子下，第 i 局的每一步
+（蛇头、食物、得分、事件）都与 SnakeEngine(seed=env.seeds[i]) 相同。
+"""
+import numpy as np
+
+from src.engine import (SnakeEngine, UP, RIGHT, DOWN, LEFT, EVENT_EAT, EVENT_CRASH,
+                        EVENT_BOARD_FULL, SPLITMIX_GAMMA)
+
+# 动作编码：0-3 为方向（与 engine 相同），-1 表示保持当前方向
+ACTION_NONE = -1
+
+_GAMMA = np.uint64(SPLITMIX_GAMMA)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def mix64(x):
+    """向量化的 splitmix64 输出混合函数，与 engine.mix64 逐位一致"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+
+def neighbour_table(width, height):
+    """[方向 * 格子数 + 格子] -> 相邻格子（出界为 -1）的扁平查找表，与 SnakeEngine 的查找表相同
+
+    直接按宽高向量化生成，大棋盘上引擎按需计算相邻格子时也适用。
+    """
+    cells = np.arange(width * height, dtype=np.int64)
+    x = cells % width
+    y = cells // width
+    table = np.empty((4, len(cells)), dtype=np.int64)
+    table[UP] = np.where(y > 0, cells - width, -1)
+    table[RIGHT] = np.where(x < width - 1, cells + 1, -1)
+    table[DOWN] = np.where(y < height - 1, cells + width, -1)
+    table[LEFT] = np.where(x > 0, cells - 1, -1)
+    return table.reshape(-1)
+
+
+class BatchSnakeEnv:
+    """同时运行 n_envs 局游戏的批量环境
+
+    第 i 局的第一个种子是 seed + i，之后每自动重置一次种子加 n_envs，
+    当前种子可以从 self.seeds 读出，用 SnakeEngine 单独复现。
+    """
+
+    def __init__(self, n_envs, width=40, height=30, init_length=3, seed=None):
+        """初始化批量环境"""
+        # 借用 SnakeEngine 做参数检查
+        SnakeEngine(width, height, init_length, seed=0)
+        self.n_envs = n_envs
+        self.width = width
+        self.height = height
+        self.cell_count = width * height
+        self.init_length = init_length
+
+        # 格子编号较少时用 int16 存储，节省一半内存和带宽
+        cell_dtype = np.int16 if self.cell_count < 2 ** 15 else np.int32
+        n, cells = n_envs, self.cell_count
+        self._neighbours = neighbour_table(width, height)
+        self._offsets = np.arange(n, dtype=np.int64) * cells
+        self._identity = np.arange(cells, dtype=cell_dtype)
+
+        # 每局的状态，二维数组每行对应一局
+        # 扁平存储多留一个暂存格（下标 n * cells），step() 中不需要写入的对局写到这里
+        self._scratch = n * cells
+        self._ring_flat = np.zeros(n * cells + 1, dtype=cell_dtype)
+        self._occupied_flat = np.zeros(n * cells + 1, dtype=np.uint8)
+        self._free_list_flat = np.zeros(n * cells + 1, dtype=cell_dtype)
+        self._free_slots_flat = np.zeros(n * cells + 1, dtype=cell_dtype)
+        self.ring = self._ring_flat[:-1].reshape(n, cells)                # 蛇身环形缓冲区
+        self.occupied = self._occupied_flat[:-1].reshape(n, cells)        # 占用网格
+        self.free_list = self._free_list_flat[:-1].reshape(n, cells)      # 空闲格子排列
+        self.free_slots = self._free_slots_flat[:-1].reshape(n, cells)    # 格子 -> 排列下标
+        self.free_count = np.zeros(n, dtype=np.int64)
+        self.head_ptr = np.zeros(n, dtype=np.int64)   # 蛇头在环形缓冲区的下标
+        self.tail_ptr = np.zeros(n, dtype=np.int64)   # 蛇尾在环形缓冲区的下标
+        self.head_cell = np.zeros(n, dtype=np.int64)  # 蛇头所在格子
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.next_direction = np.zeros(n, dtype=np.int64)
+        self.growing = np.zeros(n, dtype=bool)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.final_scores = np.zeros(n, dtype=np.int64)           # 最近一次结束时的得分
+        self.seeds = np.zeros(n, dtype=np.uint64)
+        self._draws = np.zeros(n, dtype=np.uint64)
+
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """重置所有对局，seed 为 None 时随机选择"""
+        if seed is None:
+            seed = int(np.random.default_rng().integers(0, 2 ** 63))
+        first = np.uint64(seed & ((1 << 64) - 1))
+        self.seeds[:] = first + np.arange(self.n_envs, dtype=np.uint64)
+        self._reset_envs(np.arange(self.n_envs))
+
+    @property
+    def heads(self):
+        """每局蛇头所在格子"""
+        return self.head_cell
+
+    @property
+    def length(self):
+        """每局的蛇身长度"""
+        return (self.head_ptr - self.tail_ptr) % self.cell_count + 1
+
+    @property
+    def grid(self):
+        """占用网格的 (n_envs, height, width) 视图"""
+        return self.occupied.reshape(self.n_envs, self.height, self.width)
+
+    def body(self, env):
+        """返回第 env 局的蛇身格子列表（蛇头在前），用于调试和测试"""
+        index = (self.head_ptr[env] - np.arange(self.length[env])) % self.cell_count
+        return self.ring[env, index].tolist()
+
+    def _reset_envs(self, envs):
+        """把指定的对局重置为初始状态（与 SnakeEngine.reset 相同）"""
+        self.occupied[envs] = 0
+        self.free_list[envs] = self._identity
+        self.free_slots[envs] = self._identity
+        self.free_count[envs] = self.cell_count
+
+        # 蛇头位于棋盘中心，蛇身向左排列；环形缓冲区里尾部在前
+        head = (self.height // 2) * self.width + self.width // 2
+        last = self.init_length - 1
+        for i in range(self.init_length):
+            cell = np.full(len(envs), head - i, dtype=np.int64)
+            self.ring[envs, last - i] = cell
+            self.occupied[envs, head - i] = 1
+            self._take(envs, cell)
+        self.head_ptr[envs] = last
+        self.tail_ptr[envs] = 0
+        self.head_cell[envs] = head
+
+        self.direction[envs] = RIGHT
+        self.next_direction[envs] = RIGHT
+        self.growing[envs] = False
+        self.score[envs] = 0
+        self.steps[envs] = 0
+        self._draws[envs] = 0
+        self._spawn_food(envs)
+
+    def _take(self, envs, cells):
+        """把空闲格子标记为占用（向量化的 FreeCellIndex.take）"""
+        offsets = self._offsets[envs]
+        free_list = self._free_list_flat
+        free_slots = self._free_slots_flat
+        slot = free_slots[offsets + cells].astype(np.int64)
+        count = self.free_count[envs] - 1
+        last = free_list[offsets + count].astype(np.int64)
+        free_list[offsets + slot] = last
+        free_slots[offsets + last] = slot
+        free_list[offsets + count] = cells
+        free_slots[offsets + cells] = count
+        self.free_count[envs] = count
+
+    def _spawn_food(self, envs):
+        """在空闲格子中随机放置食物，返回棋盘已满的布尔掩码"""
+        count = self.free_count[envs]
+        full = count == 0
+        self.food[envs[full]] = -1
+        envs = envs[~full]
+        if len(envs):
+            self._draws[envs] += np.uint64(1)
+            draws = mix64(self.seeds[envs] + self._draws[envs] * _GAMMA)
+            pick = (draws % count[~full].astype(np.uint64)).astype(np.int64)
+            self.food[envs] = self._free_list_flat[self._offsets[envs] + pick]
+        return full
+
+    def step(self, actions=None):
+        """所有对局同时推进一步
+
+        actions 为长度 n_envs 的整数数组（0-3 为方向，-1 保持方向），
+        为 None 时全部保持方向。返回 (events, dones) 两个数组，
+        结束的对局已经自动重置，结束时的得分保存在 self.final_scores。
+        """
+        offsets = self._offsets
+        cell_count = self.cell_count
+        scratch = self._scratch
+        occupied = self._occupied_flat
+        free_list = self._free_list_flat
+        free_slots = self._free_slots_flat
+        ring = self._ring_flat
+
+        # 与 change_direction 相同：不允许 180 度掉头
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions >= 0) & (actions != ((self.direction + 2) & 3))
+            np.copyto(self.next_direction, actions, where=turn, casting='unsafe')
+        direction = self.direction
+        direction[:] = self.next_direction
+        self.steps += 1
+
+        new_head = self._neighbours[direction * cell_count + self.head_cell]
+        wall = new_head < 0
+        growing = self.growing
+
+        # 先移除尾部（除非正在生长）。
+        # 常见路径对所有对局整体运算，不需要写入的对局把下标指向末尾的暂存格，
+        # 省去 flatnonzero 和按子集取值的开销
+        tail_ptr = self.tail_ptr
+        tail = ring[offsets + tail_ptr].astype(np.int64)
+        pop = ~(wall | growing)
+        occupied[np.where(pop, offsets + tail, scratch)] = 0
+        tail_ptr += pop
+        tail_ptr[tail_ptr == cell_count] = 0
+
+        # 撞墙或撞到自己
+        head_index = offsets + np.where(wall, 0, new_head)
+        crash = wall | (occupied[head_index] != 0)
+        alive = ~crash
+
+        # 普通移动：空闲格子索引中交换蛇头和尾部
+        swap = alive & pop & (new_head != tail)
+        tail_index = offsets + tail
+        head_slot = free_slots[head_index].astype(np.int64)
+        tail_slot = free_slots[tail_index].astype(np.int64)
+        free_list[np.where(swap, offsets + head_slot, scratch)] = tail
+        free_slots[np.where(swap, tail_index, scratch)] = head_slot
+        free_list[np.where(swap, offsets + tail_slot, scratch)] = new_head
+        free_slots[np.where(swap, head_index, scratch)] = tail_slot
+
+        # 生长：只占用蛇头
+        envs = np.flatnonzero(alive & growing)
+        if len(envs):
+            self._take(envs, new_head[envs])
+        growing[:] = False
+
+        # 蛇头写入占用网格和环形缓冲区
+        occupied[np.where(alive, head_index, scratch)] = 1
+        head_ptr = self.head_ptr
+        head_ptr += alive
+        head_ptr[head_ptr == cell_count] = 0
+        ring[np.where(alive, offsets + head_ptr, scratch)] = new_head
+        np.copyto(self.head_cell, new_head, where=alive)
+
+        events = np.where(crash, EVENT_CRASH, 0).astype(np.int8)
+
+        # 吃到食物：下一步生长，并重新生成食物
+        envs = np.flatnonzero(alive & (new_head == self.food))
+        if len(envs):
+            growing[envs] = True
+            self.score[envs] += 1
+            events[envs] |= EVENT_EAT
+            full = self._spawn_food(envs)
+            events[envs[full]] |= EVENT_BOARD_FULL
+
+        dones = (events & (EVENT_CRASH | EVENT_BOARD_FULL)) != 0
+        envs = np.flatnonzero(dones)
+        if len(envs):
+            self.final_scores[envs] = self.score[envs]
+            self.seeds[envs] += np.uint64(self.n_envs)
+            self._reset_envs(envs)
+        return events, dones
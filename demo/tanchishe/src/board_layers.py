@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+预先渲染的棋盘图层
+
+- background：背景色、网格线（settings.show_grid）和边框（settings.border_width）
+  只画一次，之后整屏重绘是一次 blit，擦除一个格子是从背景上拷回这个格子的矩形
+- 蛇身和食物的格子图块也只画一次，绘制时用 Surface.blits 一次提交一批
+
+所有图层都转换成目标画面的像素格式，blit 时不需要逐像素转换。
+"""
+import pygame
+
+
+def make_tile(size, color, target=None):
+    """生成一个纯色图块，target 不为 None 时转换为 target 的像素格式"""
+    tile = pygame.Surface(size)
+    tile.fill(color)
+    return tile.convert(target) if target is not None else tile
+
+
+class BoardLayers:
+    """棋盘背景和格子图块"""
+
+    def __init__(self, settings, width, height, target, viewport=False):
+        """width/height 为以格子为单位的棋盘（或镜头视野）大小，target 为要绘制到的画面
+
+        viewport 为 True 表示画的是大棋盘上的镜头视野：视野边缘不是棋盘边缘，
+        不画边框，左边和上边也画网格线。
+        """
+        self.settings = settings
+        self.width = width
+        self.height = height
+        grid_size = settings.grid_size
+        self.background = self._render_background(target, viewport)
+        # 每个格子左上角的像素坐标，绘制时直接查表
+        self.positions = [(x * grid_size, y * grid_size)
+                          for y in range(height) for x in range(width)]
+        # 与 Snake.draw / Food.draw 的外观一致：蛇身四周留 2 像素缝隙，食物占满一格
+        self.snake_tile = make_tile((grid_size - 2, grid_size - 2), settings.snake_color, target)
+        self.food_tile = make_tile((grid_size, grid_size), settings.food_color, target)
+
+    def _render_background(self, target, viewport):
+        settings = self.settings
+        background = pygame.Surface(target.get_size()).convert(target)
+        background.fill(settings.bg_color)
+        grid_size = settings.grid_size
+        board_width = self.width * grid_size
+        board_height = self.height * grid_size
+        if settings.show_grid:
+            first = 0 if viewport else grid_size
+            for x in range(first, board_width, grid_size):
+                pygame.draw.line(background, settings.grid_line_color,
+                                 (x, 0), (x, board_height - 1))
+            for y in range(first, board_height, grid_size):
+                pygame.draw.line(background, settings.grid_line_color,
+                                 (0, y), (board_width - 1, y))
+        if not viewport and settings.border_width > 0:
+            pygame.draw.rect(background, settings.border_color,
+                             (0, 0, board_width, board_height), settings.border_width)
+        return background
+
+    def restore(self, screen, rect):
+        """把矩形区域恢复成背景"""
+        screen.blit(self.background, rect, rect)
+
+    def draw_snake(self, screen, cells):
+        """批量绘制蛇身格子"""
+        tile = self.snake_tile
+        positions = self.positions
+        screen.blits([(tile, positions[cell]) for cell in cells], False)
+
+    def draw_food(self, screen, cell):
+        screen.blit(self.food_tile, self.positions[cell])
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+生成资源包（assets/bundle.snkb）
+
+1. 扫描界面代码里的字符串常量（不含文档字符串和日志、print 的参数），
+   加上可打印 ASCII 字符，得到界面用到的全部字符
+2. 用 fontTools 把中文字体裁剪成只含这些字符的子集；没有安装 fontTools 时不打包字体，
+   界面继续读取完整的字体文件
+3. 按 SoundManager 的音效表和默认混音器格式预先合成全部音效，以 PCM 形式打包
+   （名称是 synth.cache_key，混音器格式或合成参数不一致时运行时自动改为现场合成）
+
+用法：
+    python src/build_assets.py [--output assets/bundle.snkb]
+界面文字、字体或音效参数改动后需要重新生成；资源包不存在时游戏读取单独的资源文件。
+"""
+import argparse
+import ast
+import io
+import logging
+import os
+import sys
+# 让 "src." 开头的导入在直接运行这个脚本时也能找到
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.asset_bundle import DEFAULT_BUNDLE_PATH, FONT_ASSET, PCM_PREFIX, write_bundle
+from src.settings import Settings
+from src.sound_manager import SOUND_VARIANTS
+from src.synth import EFFECTS, cache_key, render, semitones, to_samples
+
+logger = logging.getLogger('BuildAssets')
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_PATH = os.path.join(os.path.dirname(SRC_DIR), 'assets', 'fonts', 'WenQuanYiMicroHei.ttf')
+# 用界面字体渲染文字的模块
+UI_SOURCES = ('ui_manager.py', 'frame_profiler.py')
+# 玩家名、分数等运行时才知道的文字里最常见的字符
+BASE_CHARS = ''.join(chr(c) for c in range(0x20, 0x7f))
+# 这些调用的参数不会显示在界面上
+_SKIPPED_CALLS = {'print', 'debug', 'info', 'warning', 'error', 'exception', 'critical'}
+
+
+def collect_ui_text(paths):
+    """返回源文件中所有可能显示在界面上的字符串常量的字符集合"""
+    chars = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        _collect(tree, chars)
+    # 换行等控制字符不需要字形
+    return {c for c in chars if c.isprintable()}
+
+
+def _collect(node, chars):
+    if isinstance(node, ast.Call):
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', None)
+        if name in _SKIPPED_CALLS:
+            return
+    body = getattr(node, 'body', None)
+    for child in ast.iter_child_nodes(node):
+        # 跳过文档字符串
+        if (isinstance(body, list) and body and child is body[0] and isinstance(child, ast.Expr)
+                and isinstance(child.value, ast.Constant)):
+            continue
+        if isinstance(child, ast.Constant) and isinstance(child.value, str):
+            chars.update(child.value)
+        else:
+            _collect(child, chars)
+
+
+def subset_font(path, chars):
+    """返回 (字体数据, 包含的字符)；没有 fontTools 时返回 None"""
+    try:
+        from fontTools import subset
+    except ImportError:
+        logger.warning('没有安装 fontTools，不打包字体（pip install fonttools 后重新生成）')
+        return None
+    options = subset.Options()
+    options.layout_features = []
+    options.hinting = False
+    options.notdef_outline = True
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=''.join(sorted(chars)))
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    return buffer.getvalue(), ''.join(sorted(chars))
+
+
+def sound_entries(sample_rate, channels):
+    """按 SoundManager 的音效表预先合成，返回资源包条目"""
+    entries = []
+    for name, count in SOUND_VARIANTS.items():
+        pitches = semitones(count)
+        samples = to_samples(render(EFFECTS[name], sample_rate, pitches), channels)
+        key = cache_key(EFFECTS[name], sample_rate, channels, pitches)
+        entries.append((PCM_PREFIX + key, samples.astype('<i2', copy=False),
+                        {'sound': name, 'shape': list(samples.shape)}))
+    return entries
+
+
+def build(output=DEFAULT_BUNDLE_PATH, font_path=FONT_PATH):
+    """生成资源包，返回条目列表"""
+    chars = collect_ui_text(os.path.join(SRC_DIR, name) for name in UI_SOURCES)
+    chars.update(BASE_CHARS)
+    entries = []
+    font = subset_font(font_path, chars)
+    if font is not None:
+        font_data, font_chars = font
+        entries.append((FONT_ASSET, font_data,
+                        {'chars': font_chars, 'source': os.path.basename(font_path)}))
+    settings = Settings()
+    entries += sound_entries(settings.audio_frequency, settings.audio_channels)
+    write_bundle(output, entries)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成资源包')
+    parser.add_argument('--output', default=DEFAULT_BUNDLE_PATH)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logging.getLogger('fontTools').setLevel(logging.WARNING)
+
+    entries = build(args.output)
+    for name, data, meta in entries:
+        if name == FONT_ASSET:
+            print(f'字体: {len(data) / 1024:.1f} KB，{len(meta["chars"])} 个字符'
+                  f'（原字体 {os.path.getsize(FONT_PATH) / 1024:.1f} KB）')
+        else:
+            print(f'音效 {meta["sound"]}: {data.nbytes / 1024:.1f} KB')
+    print(f'已生成资源包: {args.output}（{os.path.getsize(args.output) / 1024:.1f} KB）')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+大棋盘的镜头
+
+棋盘比窗口大时，窗口只显示以蛇头为中心的一块区域（以格子为单位，按整格移动），
+靠近棋盘边缘时镜头停在边缘，不显示棋盘外面。
+visible_cells() 只扫描视野内的格子，绘制开销与棋盘大小、蛇的长度无关。
+"""
+
+
+class Camera:
+    """以格子为单位的镜头"""
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        """view_width/view_height 是窗口能容纳的格子数，world_* 是棋盘大小"""
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = min(view_width, world_width)
+        self.view_height = min(view_height, world_height)
+        self.x = 0   # 视野左上角的格子坐标
+        self.y = 0
+
+    def follow(self, cell):
+        """把视野移到以 cell 为中心（不超出棋盘），返回视野是否移动了"""
+        x = cell % self.world_width - self.view_width // 2
+        y = cell // self.world_width - self.view_height // 2
+        x = max(0, min(x, self.world_width - self.view_width))
+        y = max(0, min(y, self.world_height - self.view_height))
+        moved = (x, y) != (self.x, self.y)
+        self.x, self.y = x, y
+        return moved
+
+    def to_view(self, cell):
+        """棋盘格子 -> 视野内的格子编号（row * view_width + col），不在视野内时返回 -1"""
+        col = cell % self.world_width - self.x
+        row = cell // self.world_width - self.y
+        if 0 <= col < self.view_width and 0 <= row < self.view_height:
+            return row * self.view_width + col
+        return -1
+
+    def visible_cells(self, occupied):
+        """视野内被占用的格子（视野内编号），occupied 为按棋盘格子编号的 bytearray"""
+        cells = []
+        view_width = self.view_width
+        for row in range(self.view_height):
+            start = (self.y + row) * self.world_width + self.x
+            line = occupied[start:start + view_width]
+            base = row * view_width
+            col = line.find(1)
+            while col >= 0:
+                cells.append(base + col)
+                col = line.find(1, col + 1)
+        return cells
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+无界面的贪吃蛇模拟核心
+
+只依赖标准库，不导入 pygame，可以在机器人训练、回归测试里高速运行。
+规则与 Snake / Food / Game._update_game 保持一致：
+- 每一步先按 change_direction 的规则更新方向，再向前移动一格
+- 不在生长时先移除尾部，再检查自身碰撞（蛇头可以进入刚空出来的尾部格子）
+- 吃到食物后，下一次移动时蛇身才真正变长
+"""
+import os
+from collections import deque
+from src.free_cells import FreeCellIndex
+
+# 方向编码（顺时针排列，相反方向的编码相差 2）
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+DIRECTION_NAMES = ('UP', 'RIGHT', 'DOWN', 'LEFT')
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTION_NAMES)}
+
+# step() 返回的事件位标志，可以用 & 组合判断
+EVENT_NONE = 0
+EVENT_EAT = 1         # 吃到食物
+EVENT_CRASH = 2       # 撞墙或撞到自己
+EVENT_BOARD_FULL = 4  # 棋盘已被蛇占满，无法再生成食物
+
+# 食物位置使用基于计数器的 splitmix64 随机数：
+# 第 k 次抽取只取决于 (种子, k)，NumPy 批量环境可以逐位复现同样的结果
+MASK64 = (1 << 64) - 1
+SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+
+
+def mix64(x):
+    """splitmix64 的输出混合函数（64 位无符号整数）"""
+    x ^= x >> 30
+    x = (x * 0xBF58476D1CE4E5B9) & MASK64
+    x ^= x >> 27
+    x = (x * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+# 格子数超过这个值时不再预先生成相邻格子表（512x512）
+NEIGHBOUR_TABLE_LIMIT = 1 << 18
+
+
+class NeighbourRow:
+    """按需计算某个方向上的相邻格子，出界时为 -1，用法与查找表的一行相同"""
+    __slots__ = ('direction', 'width', 'height')
+
+    def __init__(self, direction, width, height):
+        self.direction = direction
+        self.width = width
+        self.height = height
+
+    def __getitem__(self, cell):
+        width = self.width
+        direction = self.direction
+        if direction == UP:
+            return cell - width if cell >= width else -1
+        if direction == DOWN:
+            return cell + width if cell < (self.height - 1) * width else -1
+        x = cell % width
+        if direction == RIGHT:
+            return cell + 1 if x < width - 1 else -1
+        return cell - 1 if x > 0 else -1
+
+
+class SnakeEngine:
+    """纯 Python 的贪吃蛇模拟引擎
+
+    棋盘格子用整数编号：cell = y * width + x。
+    蛇身（蛇头在前）保存在 deque 中，占用情况保存在 bytearray 中，
+    空闲格子保存在 FreeCellIndex 中，所以每一步（包括生成食物）
+    都是常数时间，和蛇的长度、棋盘的填充率无关。
+    """
+
+    def __init__(self, width=40, height=30, init_length=3, seed=None):
+        """初始化引擎
+
+        width/height 是以格子为单位的棋盘大小，默认 40x30
+        对应 800x600 窗口、20 像素的网格。
+        """
+        if width < 1 or height < 1:
+            raise ValueError(f'棋盘大小无效: {width}x{height}')
+        if not 1 <= init_length <= width // 2 + 1:
+            raise ValueError(f'初始长度 {init_length} 放不进宽度为 {width} 的棋盘')
+
+        self.width = width
+        self.height = height
+        self.cell_count = width * height
+        self.init_length = init_length
+
+        # 预先计算每个格子在四个方向上的相邻格子，出界记为 -1
+        self._neighbours = self._build_neighbours(width, height)
+        self.free_cells = FreeCellIndex(self.cell_count)
+        # step() 中直接操作空闲格子索引的两个列表，省去属性查找
+        self._free_list = self.free_cells.cells
+        self._free_slots = self.free_cells.slots
+        self.reset(seed)
+
+    @staticmethod
+    def _build_neighbours(width, height):
+        """生成 [方向][格子] -> 相邻格子 的查找表
+
+        大棋盘（格子数超过 NEIGHBOUR_TABLE_LIMIT）上完整的表要占用数百 MB，
+        改为每次查询时计算（每步只查一次，开销可以忽略）。
+        """
+        cell_count = width * height
+        if cell_count > NEIGHBOUR_TABLE_LIMIT:
+            return [NeighbourRow(direction, width, height) for direction in range(4)]
+        neighbours = [[-1] * cell_count for _ in DIRECTION_NAMES]
+        for cell in range(cell_count):
+            x, y = cell % width, cell // width
+            if y > 0:
+                neighbours[UP][cell] = cell - width
+            if x < width - 1:
+                neighbours[RIGHT][cell] = cell + 1
+            if y < height - 1:
+                neighbours[DOWN][cell] = cell + width
+            if x > 0:
+                neighbours[LEFT][cell] = cell - 1
+        return neighbours
+
+    def reset(self, seed=None):
+        """重置到新一局的初始状态
+
+        seed 为整数，相同的种子得到相同的食物位置序列；
+        为 None 时从系统随机源取一个种子，可以从 self.seed 读出用于复现。
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.seed = seed
+        self._seed_key = seed & MASK64
+        self._draws = 0
+
+        # 与 Snake 一致：蛇头位于棋盘中心，蛇身向左排列，初始方向向右
+        head = (self.height // 2) * self.width + self.width // 2
+        self.body = deque(head - i for i in range(self.init_length))
+        self.occupied = bytearray(self.cell_count)
+        for cell in self.body:
+            self.occupied[cell] = 1
+        self.free_cells.reset(self.body)
+
+        self.direction = RIGHT
+        self.next_direction = RIGHT
+        self.is_growing = False
+        self.score = 0
+        self.steps = 0
+        self.done = False
+        self.food = -1
+        self._spawn_food()
+
+    def _spawn_food(self):
+        """在空闲格子中均匀随机放置食物，返回棋盘是否还有空位"""
+        self.food = self.free_cells.sample(self._randrange)
+        return self.food >= 0
+
+    def _randrange(self, n):
+        """返回 [0, n) 中的随机整数（第 k 次抽取只取决于种子和 k）"""
+        self._draws += 1
+        return mix64((self._seed_key + self._draws * SPLITMIX_GAMMA) & MASK64) % n
+
+    def turn(self, direction):
+        """改变方向（等同于 Snake.change_direction，不允许 180 度掉头）"""
+        if direction != (self.direction + 2) & 3:
+            self.next_direction = direction
+
+    def step(self, action=None):
+        """推进一步
+
+        action 为方向编码或 None（保持当前方向）。
+        返回 (events, done)，events 是 EVENT_* 位标志的组合。
+        """
+        if self.done:
+            return EVENT_NONE, True
+
+        direction = self.direction
+        if action is not None and action != (direction + 2) & 3:
+            self.next_direction = action
+        direction = self.direction = self.next_direction
+        self.steps += 1
+
+        body = self.body
+        occupied = self.occupied
+        head = self._neighbours[direction][body[0]]
+
+        # 撞墙
+        if head < 0:
+            self.done = True
+            return EVENT_CRASH, True
+
+        # 先移除尾部（除非正在生长），这样蛇头可以进入刚空出来的格子
+        if self.is_growing:
+            self.is_growing = False
+            # 撞到自己
+            if occupied[head]:
+                self.done = True
+                return EVENT_CRASH, True
+            self.free_cells.take(head)
+        else:
+            tail = body[-1]
+            # 撞到自己（蛇尾这一步会移走，走进去是安全的）；先检查再改动状态，
+            # 撞上时蛇身保持完整，长度仍为 init_length + score
+            if occupied[head] and head != tail:
+                self.done = True
+                return EVENT_CRASH, True
+            body.pop()
+            occupied[tail] = 0
+            if head != tail:
+                # 内联 FreeCellIndex.swap(head, tail)：空闲格子数量不变
+                cells = self._free_list
+                slots = self._free_slots
+                head_slot = slots[head]
+                tail_slot = slots[tail]
+                cells[head_slot] = tail
+                slots[tail] = head_slot
+                cells[tail_slot] = head
+                slots[head] = tail_slot
+
+        occupied[head] = 1
+        body.appendleft(head)
+
+        if head != self.food:
+            return EVENT_NONE, False
+
+        # 吃到食物：下一步生长，并重新生成食物
+        self.is_growing = True
+        self.score += 1
+        if self._spawn_food():
+            return EVENT_EAT, False
+        self.done = True
+        return EVENT_EAT | EVENT_BOARD_FULL, True
+
+    @property
+    def head(self):
+        """蛇头所在格子"""
+        return self.body[0]
+
+    @property
+    def length(self):
+        """蛇身长度"""
+        return len(self.body)
+
+    def cell_to_xy(self, cell):
+        """把格子编号转换为 (x, y) 格子坐标"""
+        return cell % self.width, cell // self.width
+
+    def xy_to_cell(self, x, y):
+        """把 (x, y) 格子坐标转换为格子编号"""
+        return y * self.width + x
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import random
-import pygame
 from src.settings import Settings
+from src.free_cells import FreeCellIndex
 
 
 class Food:
@@ -10,25 +10,55 @@ class Food:
         self.settings = Settings()
         self.position = self.get_random_position([])
         self.color = (255, 0, 0)  # 红色
+        self._tile = None  # 绘制用的食物图块，第一次 draw() 时生成
+        self._tile_color = None
 
     def get_random_position(self, snake_body):
-        """生成一个新的食物位置，确保不与蛇身重叠"""
-        while True:
-            x = random.randrange(0, self.settings.screen_width, self.settings.grid_size)
-            y = random.randrange(0, self.settings.screen_height, self.settings.grid_size)
-            position = (x, y)
-            if position not in snake_body:
-                return position
+        """生成一个新的食物位置，确保不与蛇身重叠
+
+        在空闲格子中均匀抽取，与蛇的长度无关；棋盘已被占满时返回 None。
+        """
+        grid_size = self.settings.grid_size
+        cols = self.settings.screen_width // grid_size
+
+        # Snake.body 自带与蛇同步更新的空闲格子索引，普通列表则临时建立一个
+        free_cells = getattr(snake_body, 'free_cells', None)
+        if free_cells is None:
+            free_cells = self._build_free_cells(snake_body)
+
+        cell = free_cells.sample(random.randrange)
+        if cell < 0:
+            return None
+        return ((cell % cols) * grid_size, (cell // cols) * grid_size)
+
+    def _build_free_cells(self, snake_body):
+        """根据蛇身坐标列表建立空闲格子索引"""
+        grid_size = self.settings.grid_size
+        cols = self.settings.screen_width // grid_size
+        rows = self.settings.screen_height // grid_size
+        free_cells = FreeCellIndex(cols * rows)
+        for x, y in snake_body:
+            if 0 <= x < cols * grid_size and 0 <= y < rows * grid_size:
+                free_cells.take((y // grid_size) * cols + x // grid_size)
+        return free_cells
 
     def draw(self, screen):
         """绘制食物"""
-        pygame.draw.rect(screen, self.color, 
-                        (self.position[0], self.position[1], 
-                         self.settings.grid_size, self.settings.grid_size))
+        if self.position is None:
+            return
+        # 只在绘制时才导入 pygame，保证无界面的模拟不依赖图形库
+        from src.board_layers import make_tile
+        tile = self._tile
+        if tile is None or self._tile_color != self.color:
+            size = self.settings.grid_size
+            tile = self._tile = make_tile((size, size), self.color, screen)
+            self._tile_color = self.color
+        screen.blit(tile, self.position)
 
     def respawn(self, snake_body):
-        """重新生成食物位置"""
+        """重新生成食物位置，棋盘已满时返回 False"""
         self.position = self.get_random_position(snake_body)
+        return self.position is not None
 
     def check_collision(self, snake_head):
         """检查是否与蛇头碰撞"""
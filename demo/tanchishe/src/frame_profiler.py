@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+逐帧分阶段计时
+
+游戏进行中每一帧分为五个阶段，用 time.perf_counter_ns 记录各自的耗时：
+    events   处理输入事件（Game._check_events）
+    update   推进模拟（Game._update_game）
+    render   绘制到画面（BoardRenderer.render 和性能浮层）
+    present  提交到屏幕（pygame.display.flip / update）
+    wait     帧率限制的等待（Clock.tick）
+最近 window 帧保存在环形缓冲区中，随时可以算出 p50/p95/p99/最大值；
+指定 csv_path 时每帧写一行 CSV（单位微秒），便于离线分析。
+没有创建 FrameProfiler 时游戏循环不做任何计时，开销为零。
+"""
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger('FrameProfiler')
+
+PHASES = ('events', 'update', 'render', 'present', 'wait')
+PHASE_NAMES = {'events': '事件', 'update': '模拟', 'render': '绘制', 'present': '提交',
+               'wait': '等待', 'frame': '整帧'}
+EVENTS, UPDATE, RENDER, PRESENT, WAIT = range(len(PHASES))
+
+
+def percentile(sorted_values, p):
+    """已排序序列的百分位数（最近秩法）"""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """逐帧分阶段计时器"""
+
+    def __init__(self, window=600, csv_path=None):
+        """window 为参与统计的最近帧数，csv_path 不为 None 时逐帧写入 CSV"""
+        self.window = window
+        self.samples = [deque(maxlen=window) for _ in PHASES]
+        self.frames = deque(maxlen=window)   # 整帧耗时
+        self.steps = deque(maxlen=window)    # 每帧推进的模拟步数
+        self.frame_count = 0
+        self._current = [0] * len(PHASES)
+        self._frame_start = 0
+        self._last = 0
+
+        self._csv_file = None
+        if csv_path:
+            self._csv_file = open(csv_path, 'w', newline='')
+            self._csv_file.write(','.join(('frame', 'start_us', *(f'{p}_us' for p in PHASES),
+                                           'frame_us', 'steps')) + '\n')
+
+    def begin_frame(self):
+        """一帧开始"""
+        self._frame_start = self._last = time.perf_counter_ns()
+        self._current = [0] * len(PHASES)
+
+    def mark(self, phase):
+        """把从上一次标记到现在的时间记到 phase（PHASES 中的下标）上"""
+        now = time.perf_counter_ns()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self, steps=0):
+        """一帧结束，steps 为这一帧推进的模拟步数"""
+        current = self._current
+        for samples, value in zip(self.samples, current):
+            samples.append(value)
+        total = self._last - self._frame_start
+        self.frames.append(total)
+        self.steps.append(steps)
+        if self._csv_file is not None:
+            # 全是整数，直接拼一行比 csv.writer 快一倍
+            self._csv_file.write(f'{self.frame_count},{self._frame_start // 1000},'
+                                 f'{current[0] // 1000},{current[1] // 1000},'
+                                 f'{current[2] // 1000},{current[3] // 1000},'
+                                 f'{current[4] // 1000},{total // 1000},{steps}\n')
+        self.frame_count += 1
+
+    def stats(self):
+        """各阶段和整帧的 p50/p95/p99/最大值（毫秒）：{名称: (p50, p95, p99, max)}"""
+        result = {}
+        for name, samples in zip(PHASES + ('frame',), self.samples + [self.frames]):
+            values = sorted(samples)
+            result[name] = tuple(percentile(values, p) / 1e6 for p in (0.5, 0.95, 0.99)) + \
+                ((values[-1] / 1e6) if values else 0.0,)
+        return result
+
+    def summary_lines(self):
+        """浮层和日志用的文字，每个阶段一行"""
+        lines = [f'最近 {len(self.frames)} 帧 (毫秒)  p50 / p95 / p99 / max']
+        for name, (p50, p95, p99, worst) in self.stats().items():
+            lines.append(f'{PHASE_NAMES[name]}  {p50:6.2f} {p95:6.2f} {p99:6.2f} {worst:6.2f}')
+        return lines
+
+    def close(self):
+        """关闭 CSV 文件"""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            logger.info('逐帧计时已写入 CSV，共 %d 帧', self.frame_count)
+
+
+class ProfilerOverlay:
+    """屏幕右上角的性能浮层，文字每 refresh 秒更新一次，其余帧只 blit 缓存的图像"""
+
+    def __init__(self, profiler, font, color=(255, 255, 0), background=(0, 0, 0),
+                 refresh=0.5, clock=time.perf_counter):
+        self.profiler = profiler
+        self.font = font
+        self.color = color
+        self.background = background
+        self.refresh = refresh
+        self.clock = clock
+        self.surface = None
+        self._updated = None
+
+    def draw(self, screen):
+        """把浮层画到画面上，返回 (占用的矩形, 尺寸是否变化)"""
+        now = self.clock()
+        resized = False
+        if self.surface is None or now - self._updated >= self.refresh:
+            old_size = self.surface.get_size() if self.surface is not None else None
+            self.surface = self._render()
+            self._updated = now
+            resized = self.surface.get_size() != old_size
+        x = screen.get_width() - self.surface.get_width() - 10
+        return screen.blit(self.surface, (x, 10)), resized
+
+    def _render(self):
+        # 只在绘制时才导入 pygame，计时部分可以在无界面的环境中使用
+        import pygame
+        lines = [self.font.render(line, True, self.color)
+                 for line in self.profiler.summary_lines()]
+        width = max(line.get_width() for line in lines) + 8
+        if self.surface is not None:
+            # 数字变化时文字宽度会变，浮层只变宽不变窄，减少整屏重绘
+            width = max(width, self.surface.get_width())
+        height = sum(line.get_height() for line in lines) + 8
+        surface = pygame.Surface((width, height))
+        surface.fill(self.background)
+        y = 4
+        for line in lines:
+            surface.blit(line, (4, y))
+            y += line.get_height()
+        return surface
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+空闲格子索引
+
+用"交换删除数组 + 位置表"记录棋盘上哪些格子是空的：
+- cells 是所有格子编号的一个排列，前 count 个是空闲格子
+- slots[cell] 是格子 cell 在 cells 中的下标
+占用、释放、查询和均匀随机抽取空闲格子都是 O(1)，
+不会像拒绝采样那样在棋盘快被占满时越来越慢。
+
+格子数超过 COMPACT_THRESHOLD 时 cells/slots 改用 array('i')，每个格子 4 字节，
+2000x2000 的棋盘三个数组共约 48MB（列表加整数对象要十倍左右）；
+小棋盘仍用列表，下标访问更快。
+"""
+from array import array
+
+COMPACT_THRESHOLD = 1 << 18
+
+
+class FreeCellIndex:
+    """空闲格子索引"""
+    __slots__ = ('cells', 'slots', 'count', '_identity')
+
+    def __init__(self, cell_count, occupied=(), compact=None):
+        """初始化索引，occupied 中的格子按顺序标记为已占用
+
+        compact 为 None 时按格子数自动选择存储方式。
+        """
+        if compact is None:
+            compact = cell_count > COMPACT_THRESHOLD
+        # 保存一份恒等排列，reset() 时直接复制，比重新生成 range 快得多
+        if compact:
+            self._identity = array('i', range(cell_count))
+            self.cells = array('i', self._identity)
+            self.slots = array('i', self._identity)
+        else:
+            self._identity = tuple(range(cell_count))
+            self.cells = list(self._identity)
+            self.slots = list(self._identity)
+        self.count = cell_count
+        for cell in occupied:
+            self.take(cell)
+
+    def reset(self, occupied=()):
+        """恢复为全部空闲，再把 occupied 中的格子按顺序标记为已占用"""
+        self.cells[:] = self._identity
+        self.slots[:] = self._identity
+        self.count = len(self._identity)
+        for cell in occupied:
+            self.take(cell)
+
+    def __len__(self):
+        return self.count
+
+    def is_free(self, cell):
+        """检查格子是否空闲"""
+        return self.slots[cell] < self.count
+
+    def take(self, cell):
+        """把格子标记为已占用（与最后一个空闲格子交换位置）"""
+        cells = self.cells
+        slots = self.slots
+        slot = slots[cell]
+        count = self.count - 1
+        if slot > count:
+            return
+        last = cells[count]
+        cells[slot] = last
+        slots[last] = slot
+        cells[count] = cell
+        slots[cell] = count
+        self.count = count
+
+    def release(self, cell):
+        """把格子标记为空闲（与第一个已占用格子交换位置）"""
+        cells = self.cells
+        slots = self.slots
+        slot = slots[cell]
+        count = self.count
+        if slot < count:
+            return
+        first = cells[count]
+        cells[slot] = first
+        slots[first] = slot
+        cells[count] = cell
+        slots[cell] = count
+        self.count = count + 1
+
+    def swap(self, taken, released):
+        """同时占用 taken、释放 released（蛇移动一格时头尾的变化）
+
+        空闲格子数量不变，只需交换两者在 cells 中的位置。
+        """
+        cells = self.cells
+        slots = self.slots
+        taken_slot = slots[taken]
+        released_slot = slots[released]
+        cells[taken_slot] = released
+        slots[released] = taken_slot
+        cells[released_slot] = taken
+        slots[taken] = released_slot
+
+    def sample(self, randrange):
+        """均匀随机抽取一个空闲格子，没有空闲格子时返回 -1
+
+        randrange 是 random.randrange 这样的函数，便于传入带种子的随机源。
+        """
+        if not self.count:
+            return -1
+        return self.cells[randrange(self.count)]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+多人对战客户端和机器人
+
+GameClient 连接对战服务、加入房间，用 RoomMirror 根据服务端的增量维护房间状态。
+bot_policy 是一个简单的贪心策略（朝最近的食物走，避开墙和蛇身），
+run_swarm 在一个事件循环里同时运行许多机器人，用来在本机测试服务端：
+    python src/game_client.py --rooms 50 --bots 4 --ticks 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.engine import UP, RIGHT, DOWN, LEFT
+from src.multiplayer import RoomMirror
+from src.log_config import setup_logging
+
+logger = logging.getLogger('GameClient')
+
+# 每个方向的 (dx, dy)
+OFFSETS = {UP: (0, -1), RIGHT: (1, 0), DOWN: (0, 1), LEFT: (-1, 0)}
+
+
+class GameClient:
+    """对战客户端（一个连接对应一名玩家）"""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.player_id = None
+        self.room = None
+        self.mirror = None
+        self.bytes_received = 0
+
+    async def connect(self, host, port, room, name):
+        """连接服务并加入房间，房间已满等错误抛出 ConnectionError"""
+        self.reader, self.writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        self._send({'op': 'join', 'room': room, 'name': name})
+        message = await self.receive()
+        if message is None or message['op'] != 'welcome':
+            self.close()
+            raise ConnectionError(f'加入房间失败: {message and message.get("error")}')
+        self.player_id = message['id']
+        self.room = message['room']
+        self.mirror = RoomMirror(message['state'])
+
+    def _send(self, message):
+        self.writer.write(json.dumps(message).encode() + b'\n')
+
+    def turn(self, direction):
+        self._send({'op': 'turn', 'dir': direction})
+
+    def respawn(self):
+        self._send({'op': 'respawn'})
+
+    async def receive(self):
+        """读取一条消息，连接关闭时返回 None；增量会先应用到 mirror"""
+        line = await self.reader.readline()
+        if not line:
+            return None
+        self.bytes_received += len(line)
+        message = json.loads(line)
+        if message['op'] == 'tick' and self.mirror is not None:
+            self.mirror.apply(message)
+        return message
+
+    @property
+    def alive(self):
+        return self.mirror is not None and self.player_id in self.mirror.snakes
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def bot_policy(mirror, player_id):
+    """贪心策略：在不会立刻撞上的方向中选离最近食物最近的一个"""
+    body = mirror.snakes.get(player_id)
+    if not body:
+        return None
+    width, height = mirror.width, mirror.height
+    x, y = body[0] % width, body[0] // width
+    current = mirror.direction_of(player_id)
+    blocked = mirror.occupied()
+    # 不在生长的蛇下一步会让出尾部
+    for other in mirror.snakes.values():
+        blocked.discard(other[-1])
+
+    food = [(cell % width, cell // width) for cell in mirror.food]
+    best = None
+    best_distance = None
+    for direction, (dx, dy) in OFFSETS.items():
+        if direction == (current + 2) & 3:
+            continue
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < width and 0 <= ny < height) or ny * width + nx in blocked:
+            continue
+        distance = min((abs(fx - nx) + abs(fy - ny) for fx, fy in food), default=0)
+        if best is None or distance < best_distance:
+            best, best_distance = direction, distance
+    return best
+
+
+async def run_bot(host, port, room, name, ticks):
+    """运行一个机器人直到收到 ticks 步，返回统计"""
+    client = GameClient()
+    await client.connect(host, port, room, name)
+    received = deaths = 0
+    try:
+        while received < ticks:
+            message = await client.receive()
+            if message is None:
+                break
+            if message['op'] != 'tick':
+                continue
+            received += 1
+            if not client.alive:
+                if client.player_id in message.get('d', ()):
+                    deaths += 1
+                client.respawn()
+                continue
+            direction = bot_policy(client.mirror, client.player_id)
+            if direction is not None and direction != client.mirror.direction_of(client.player_id):
+                client.turn(direction)
+    finally:
+        client.close()
+    return {'ticks': received, 'deaths': deaths, 'bytes': client.bytes_received}
+
+
+async def run_swarm(host, port, rooms, bots_per_room, ticks):
+    """同时运行 rooms * bots_per_room 个机器人，返回每个机器人的统计"""
+    bots = [run_bot(host, port, f'room{r}', f'bot{r}-{b}', ticks)
+            for r in range(rooms) for b in range(bots_per_room)]
+    return await asyncio.gather(*bots)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='对战机器人')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--rooms', type=int, default=10)
+    parser.add_argument('--bots', type=int, default=4, help='每个房间的机器人数')
+    parser.add_argument('--ticks', type=int, default=200, help='每个机器人运行的步数')
+    parser.add_argument('--log-level', default='WARNING', help='日志级别')
+    args = parser.parse_args(argv)
+    setup_logging(args.log_level)
+    results = asyncio.run(run_swarm(args.host, args.port, args.rooms, args.bots, args.ticks))
+    received = sum(r['bytes'] for r in results)
+    print(f'{len(results)} 个机器人, 死亡 {sum(r["deaths"] for r in results)} 次, '
+          f'平均每步收到 {received / max(1, sum(r["ticks"] for r in results)):.0f} 字节')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+多人对战服务
+
+一个进程里运行多个互相独立的房间，每个房间一个 Arena（规则见 multiplayer.py），
+所有房间由同一个定时循环按固定频率推进，服务端的状态是权威的。
+协议为换行分隔的 JSON：
+
+客户端 -> 服务端
+    {"op": "join", "room": "r1", "name": "玩家"}   每个连接加入一个房间
+    {"op": "turn", "dir": 0}                        方向编码同 engine.py（0 上 1 右 2 下 3 左）
+    {"op": "respawn"}                               死亡后重新出生
+    {"op": "stats"}                                 服务端统计
+
+服务端 -> 客户端
+    {"op": "welcome", "id": 玩家 id, "room": "r1", "state": 快照}
+    {"op": "tick", ...}                             每一步的增量（蛇头、是否移除尾部、死亡、食物变化）
+    {"op": "error", "error": "..."}
+
+每个房间每一步只编码一次，同一份字节发给房间里的所有连接；
+发送缓冲区积压超过 MAX_BUFFER 的慢客户端会被断开，不会拖慢其它房间。
+本地运行：
+    python src/game_server.py --port 8766 --tick-rate 10
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.multiplayer import Arena
+from src.log_config import setup_logging
+
+logger = logging.getLogger('GameServer')
+
+MAX_LINE = 4096
+MAX_BUFFER = 256 * 1024     # 单个连接允许积压的发送字节数
+MAX_CATCH_UP = 5            # 落后超过这么多步时放弃追赶，重新对齐时钟
+
+
+def encode(message):
+    """编码一条消息（紧凑 JSON + 换行）"""
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode() + b'\n'
+
+
+class Room:
+    """一个房间：规则状态和房间里的连接"""
+
+    def __init__(self, name, arena):
+        self.name = name
+        self.arena = arena
+        self.members = {}    # 玩家 id -> StreamWriter
+
+
+class GameServer:
+    """多人对战服务"""
+
+    def __init__(self, host='127.0.0.1', port=8766, tick_rate=10, width=40, height=30,
+                 max_players=8, food_count=2, seed=None):
+        """tick_rate 为每秒步数，为 0 时不启动定时循环，由调用者手动调用 tick()"""
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.width = width
+        self.height = height
+        self.max_players = max_players
+        self.food_count = food_count
+        self.seed = seed
+        self.rooms = {}
+        self.server = None
+        self._ticker = None
+        self._writers = set()
+
+        # 统计
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.dropped_clients = 0
+        self.tick_times = deque(maxlen=1000)   # 最近每一步的处理耗时（秒）
+
+    async def start(self):
+        """开始监听，port 为 0 时由系统分配端口，实际端口保存在 self.port"""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                 limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        if self.tick_rate > 0:
+            self._ticker = asyncio.get_running_loop().create_task(self._tick_loop())
+        logger.info('对战服务已启动: %s:%d，每秒 %s 步', self.host, self.port, self.tick_rate)
+
+    async def close(self):
+        """停止定时循环和监听，断开所有连接"""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self.server.wait_closed()
+
+    # ---- 定时推进 ----
+
+    async def _tick_loop(self):
+        """固定步长推进所有房间，处理耗时不计入间隔"""
+        interval = 1.0 / self.tick_rate
+        next_tick = time.perf_counter() + interval
+        while True:
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.tick()
+            next_tick += interval
+            behind = time.perf_counter() - next_tick
+            if behind > MAX_CATCH_UP * interval:
+                logger.warning('对战服务落后 %.0f 毫秒，跳过追赶', behind * 1000)
+                next_tick = time.perf_counter() + interval
+
+    def tick(self):
+        """所有房间前进一步，把增量广播给房间里的连接"""
+        start = time.perf_counter()
+        # 断开慢客户端可能会删除房间，遍历副本
+        for room in list(self.rooms.values()):
+            data = encode(room.arena.step())
+            for player_id, writer in list(room.members.items()):
+                self._send(room, player_id, writer, data)
+        self.ticks += 1
+        self.tick_times.append(time.perf_counter() - start)
+
+    def _send(self, room, player_id, writer, data):
+        """写入发送缓冲区，不等待；积压过多的连接直接断开并移出房间"""
+        transport = writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_BUFFER:
+            logger.warning('客户端接收太慢，断开连接: 房间 %s 玩家 %s', room.name, player_id)
+            self.dropped_clients += 1
+            # close() 要等缓冲区发完才真正关闭，慢客户端要立即丢弃缓冲区
+            transport.abort()
+            self._leave(room, player_id)
+            return
+        writer.write(data)
+        self.bytes_sent += len(data)
+
+    def stats(self):
+        """服务端统计：房间数、玩家数、每步耗时（毫秒）"""
+        times = sorted(self.tick_times)
+
+        def percentile(p):
+            return times[min(len(times) - 1, int(len(times) * p))] * 1000 if times else 0.0
+
+        return {'ticks': self.ticks, 'rooms': len(self.rooms),
+                'players': sum(len(room.members) for room in self.rooms.values()),
+                'bytes_sent': self.bytes_sent, 'dropped_clients': self.dropped_clients,
+                'tick_ms_p50': percentile(0.5), 'tick_ms_p99': percentile(0.99),
+                'tick_ms_max': times[-1] * 1000 if times else 0.0}
+
+    # ---- 连接 ----
+
+    def _join(self, room_name, name):
+        """加入房间，返回 (房间, 玩家 id)，房间已满时返回 (房间, None)"""
+        room = self.rooms.get(room_name)
+        if room is None:
+            arena = Arena(self.width, self.height, food_count=self.food_count, seed=self.seed)
+            room = self.rooms[room_name] = Room(room_name, arena)
+        if len(room.members) >= self.max_players:
+            return room, None
+        return room, room.arena.add_player(name)
+
+    def _leave(self, room, player_id):
+        """离开房间；重复调用没有影响（慢客户端在广播时已经被移出）"""
+        if room.members.pop(player_id, None) is None:
+            return
+        room.arena.remove_player(player_id)
+        if not room.members and self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+    async def _handle(self, reader, writer):
+        """处理一个连接：先加入房间，之后接收转向等操作"""
+        self._writers.add(writer)
+        room = None
+        player_id = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request['op']
+                    if op == 'turn' and room is not None:
+                        room.arena.turn(player_id, int(request['dir']) & 3)
+                    elif op == 'join' and room is None:
+                        room, player_id = self._join(str(request['room']),
+                                                     str(request.get('name', ''))[:32])
+                        if player_id is None:
+                            if not room.members:
+                                del self.rooms[room.name]
+                            room = None
+                            writer.write(encode({'op': 'error', 'error': '房间已满'}))
+                            continue
+                        room.members[player_id] = writer
+                        writer.write(encode({'op': 'welcome', 'id': player_id,
+                                             'room': room.name,
+                                             'state': room.arena.snapshot()}))
+                    elif op == 'respawn' and room is not None:
+                        room.arena.respawn(player_id)
+                    elif op == 'stats':
+                        writer.write(encode({'op': 'stats', **self.stats()}))
+                    else:
+                        raise ValueError(f'无法处理的操作: {op}')
+                except (ValueError, TypeError, KeyError) as e:
+                    writer.write(encode({'op': 'error', 'error': f'请求无效: {e}'}))
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            logger.debug('连接断开: %s', e)
+        finally:
+            if room is not None:
+                self._leave(room, player_id)
+            self._writers.discard(writer)
+            writer.close()
+
+
+class GameServerThread:
+    """在后台线程中运行对战服务（用于压测）"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('port', 0)
+        self.server = GameServer(**kwargs)
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors = []
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self.server.start())
+            except OSError as e:
+                errors.append(e)
+                return
+            finally:
+                started.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, name='GameServer', daemon=True)
+        self.thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+
+    @property
+    def port(self):
+        return self.server.port
+
+    def stats(self):
+        """在服务线程中读取统计"""
+        return self.call(self.server.stats)
+
+    def call(self, func):
+        """在服务线程中执行 func 并返回结果"""
+        async def run():
+            return func()
+        return asyncio.run_coroutine_threadsafe(run(), self.loop).result()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+async def serve(**kwargs):
+    """运行服务直到被中断"""
+    server = GameServer(**kwargs)
+    await server.start()
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='多人对战服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--tick-rate', type=float, default=10, help='每秒步数')
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--max-players', type=int, default=8, help='每个房间的人数上限')
+    parser.add_argument('--food', type=int, default=2, help='每个房间的食物数')
+    parser.add_argument('--log-level', default='INFO', help='日志级别')
+    args = parser.parse_args(argv)
+    setup_logging(args.log_level)
+    try:
+        asyncio.run(serve(host=args.host, port=args.port, tick_rate=args.tick_rate,
+                          width=args.width, height=args.height,
+                          max_players=args.max_players, food_count=args.food))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from enum import Enum, auto
 import logging
-import json
 import os
+from src.score_store import HighScoreWriter, load_scores
+from src.leaderboard import Leaderboard, LeaderboardRecorder
 
 # 配置日志
 logger = logging.getLogger('GameState')
@@ -21,7 +22,13 @@ class GameState:
         """初始化游戏状态"""
         self.state = self.MENU
         self.score = 0
+        # 写盘在后台线程中进行，游戏结束时不会被慢磁盘卡住
+        self.score_writer = HighScoreWriter(self.high_scores_path())
         self.high_scores = self.load_high_scores()
+        # 每一局的完整结果写入排行榜数据库；第一次用到时才打开
+        self.leaderboard_path = os.path.join(os.path.dirname(self.high_scores_path()), 'leaderboard.db')
+        self._leaderboard = None
+        self._leaderboard_recorder = None
         logger.info('游戏状态初始化为主菜单')
         
     def start(self):
@@ -29,50 +36,50 @@ class GameState:
         old_state = self.state
         self.state = self.PLAYING
         self.score = 0
-        logger.info(f'游戏开始: 状态从 {old_state} 变为 {self.state}')
+        logger.info('游戏开始: 状态从 %s 变为 %s', old_state, self.state)
         
     def pause(self):
         """暂停游戏"""
         if self.state == self.PLAYING:
             old_state = self.state
             self.state = self.PAUSED
-            logger.info(f'游戏暂停: 状态从 {old_state} 变为 {self.state}')
+            logger.info('游戏暂停: 状态从 %s 变为 %s', old_state, self.state)
             
     def resume(self):
         """继续游戏"""
         if self.state == self.PAUSED:
             old_state = self.state
             self.state = self.PLAYING
-            logger.info(f'继续游戏: 状态从 {old_state} 变为 {self.state}')
+            logger.info('继续游戏: 状态从 %s 变为 %s', old_state, self.state)
     
-    def game_over(self):
-        """游戏结束"""
+    def game_over(self, record_score=True):
+        """游戏结束，record_score 为 False 时（比如回放录像）不计入最高分"""
         old_state = self.state
         self.state = self.GAME_OVER
-        # 总是保存分数
-        self.high_scores.append(self.score)
-        self.high_scores.sort(reverse=True)
-        self.high_scores = self.high_scores[:10]  # 只保留前10个最高分
-        self.save_high_scores()
-        logger.info(f'游戏结束: 状态从 {old_state} 变为 {self.state}, 最终得分: {self.score}')
+        if record_score:
+            self.high_scores.append(self.score)
+            self.high_scores.sort(reverse=True)
+            self.high_scores = self.high_scores[:10]  # 只保留前10个最高分
+            self.save_high_scores()
+        logger.info('游戏结束: 状态从 %s 变为 %s, 最终得分: %d', old_state, self.state, self.score)
     
     def show_menu(self):
         """显示主菜单"""
         old_state = self.state
         self.state = self.MENU
-        logger.info(f'显示主菜单: 状态从 {old_state} 变为 {self.state}')
+        logger.info('显示主菜单: 状态从 %s 变为 %s', old_state, self.state)
 
     def show_high_scores(self):
         """显示最高分榜"""
         old_state = self.state
         self.state = self.HIGH_SCORES
-        logger.info(f'显示最高分榜: 状态从 {old_state} 变为 {self.state}')
+        logger.info('显示最高分榜: 状态从 %s 变为 %s', old_state, self.state)
     
     def increase_score(self):
         """增加分数"""
         old_score = self.score
         self.score += 1
-        logger.debug(f'分数更新: {old_score} -> {self.score} (+1)')
+        logger.debug('分数更新: %d -> %d (+1)', old_score, self.score)
     
     def is_menu(self):
         return self.state == self.MENU
@@ -89,28 +96,41 @@ class GameState:
     def is_high_scores(self):
         return self.state == self.HIGH_SCORES
 
+    @staticmethod
+    def high_scores_path():
+        """最高分文件路径"""
+        return os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'high_scores.json')
+
+    @property
+    def leaderboard(self):
+        """排行榜数据库（只在当前线程读取）"""
+        if self._leaderboard is None:
+            self._leaderboard = Leaderboard(self.leaderboard_path)
+        return self._leaderboard
+
+    def record_result(self, player, length, ticks, duration):
+        """把刚结束的一局交给后台线程写入排行榜，立即返回"""
+        if self._leaderboard_recorder is None:
+            self._leaderboard_recorder = LeaderboardRecorder(self.leaderboard_path)
+        self._leaderboard_recorder.submit(player, self.score, length, ticks, duration)
+
+    def flush_results(self, timeout=None):
+        """等待已提交的对局结果写入排行榜"""
+        if self._leaderboard_recorder is None:
+            return True
+        return self._leaderboard_recorder.flush(timeout)
+
     def load_high_scores(self):
-        """从文件加载最高分记录"""
+        """从文件加载最高分记录（文件损坏时返回空列表）"""
         try:
-            data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'high_scores.json')
-            if os.path.exists(data_path):
-                with open(data_path, 'r') as f:
-                    return json.load(f)
+            return load_scores(self.high_scores_path())
         except Exception as e:
-            logger.error(f'加载最高分失败: {e}')
-        return []  # 如果文件不存在或加载失败，返回空列表
+            logger.error('加载最高分失败: %s', e)
+        return []  # 如果加载失败，返回空列表
 
     def save_high_scores(self):
-        """保存最高分记录到文件"""
-        try:
-            data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            data_path = os.path.join(data_dir, 'high_scores.json')
-            with open(data_path, 'w') as f:
-                json.dump(self.high_scores, f)
-            logger.info('最高分保存成功')
-        except Exception as e:
-            logger.error(f'保存最高分失败: {e}')
+        """把最高分记录交给后台线程写入文件，立即返回"""
+        self.score_writer.submit(self.high_scores)
 
     def get_highest_score(self):
         """获取最高分"""
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜数据库
+
+每一局的结果（玩家、得分、长度、步数、用时、时间）都写入 SQLite：
+- WAL 模式，后台线程写入的同时界面可以读取
+- 索引 (score, -id) 按 得分从高到低、同分先到先得 排序，
+  前 k 名和翻页都是索引上的范围扫描，翻页用上一页最后一条作为游标，
+  不用 OFFSET，第几页都一样快
+- score_counts 表记录每个分数出现的次数（由触发器维护），
+  查询名次只需对不同分数求和，与总局数无关
+"""
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger('Leaderboard')
+
+Result = namedtuple('Result', 'id player score length ticks duration created_at')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_score ON results (score, -id);
+CREATE INDEX IF NOT EXISTS results_by_player ON results (player, score);
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS results_count_score AFTER INSERT ON results
+BEGIN
+    INSERT INTO score_counts (score, count) VALUES (NEW.score, 1)
+    ON CONFLICT (score) DO UPDATE SET count = count + 1;
+END;
+'''
+
+_COLUMNS = 'id, player, score, length, ticks, duration, created_at'
+_ORDER = 'ORDER BY score DESC, -id DESC'
+
+
+class Leaderboard:
+    """排行榜数据库连接（每个线程使用自己的 Leaderboard 对象）"""
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        # 分数索引的插入位置是随机的，较大的页缓存能让百万行规模的写入快近一倍
+        self.conn.execute('PRAGMA cache_size=-32768')
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, player, score, length, ticks, duration, created_at=None):
+        """记录一局结果，返回其 id"""
+        if created_at is None:
+            created_at = time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO results (player, score, length, ticks, duration, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (player, score, length, ticks, duration, created_at))
+        return cursor.lastrowid
+
+    def add_many(self, rows):
+        """在一个事务中记录多局结果，rows 为 (player, score, length, ticks, duration, created_at)"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO results (player, score, length, ticks, duration, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def count(self):
+        """总局数"""
+        return self.conn.execute('SELECT COALESCE(SUM(count), 0) FROM score_counts').fetchone()[0]
+
+    def top(self, limit=10):
+        """前 limit 名"""
+        return self.page_after(None, limit)
+
+    def page_after(self, cursor, limit):
+        """从游标之后取 limit 条（cursor 为上一页最后一条 Result，None 表示从第一名开始）"""
+        if cursor is None:
+            rows = self.conn.execute(
+                f'SELECT {_COLUMNS} FROM results {_ORDER} LIMIT ?', (limit,))
+        else:
+            rows = self.conn.execute(
+                f'SELECT {_COLUMNS} FROM results WHERE (score, -id) < (?, ?) {_ORDER} LIMIT ?',
+                (cursor.score, -cursor.id, limit))
+        return [Result(*row) for row in rows]
+
+    def rank_of_score(self, score):
+        """得分为 score 的一局排第几名（同分并列，取并列中最靠前的名次）"""
+        higher = self.conn.execute(
+            'SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE score > ?',
+            (score,)).fetchone()[0]
+        return higher + 1
+
+    def best_of(self, player):
+        """某个玩家的最高分，没有记录时返回 None"""
+        return self.conn.execute('SELECT MAX(score) FROM results WHERE player = ?',
+                                 (player,)).fetchone()[0]
+
+
+class LeaderboardRecorder:
+    """在后台线程中写入排行榜，游戏线程 submit() 后立即返回
+
+    后台线程持有自己的数据库连接，队列中积累的多局结果在一个事务中写入。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._cond = threading.Condition()
+        self._pending = []
+        self._submitted = 0
+        self._written = 0
+        self._thread = None
+        self._closed = False
+
+    def submit(self, player, score, length, ticks, duration, created_at=None):
+        """提交一局结果"""
+        if created_at is None:
+            created_at = time.time()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('LeaderboardRecorder 已关闭')
+            self._pending.append((player, score, length, ticks, duration, created_at))
+            self._submitted += 1
+            self._start()
+            self._cond.notify_all()
+
+    def submit_many(self, rows):
+        """一次提交多局结果，rows 为 (player, score, length, ticks, duration, created_at)"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('LeaderboardRecorder 已关闭')
+            self._pending.extend(rows)
+            self._submitted += len(rows)
+            self._start()
+            self._cond.notify_all()
+
+    def _start(self):
+        """第一次提交时启动写线程（调用时已持有锁）"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='LeaderboardRecorder',
+                                            daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def flush(self, timeout=None):
+        """等待已提交的结果全部写完，超时返回 False"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._written >= self._submitted, timeout)
+
+    def close(self, timeout=5.0):
+        """写完剩余结果并停止写线程"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        """写线程"""
+        leaderboard = None
+        try:
+            leaderboard = Leaderboard(self.path)
+        except sqlite3.Error as e:
+            logger.error('打开排行榜数据库失败: %s', e)
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                rows, self._pending = self._pending, []
+                version = self._submitted
+            if rows and leaderboard is not None:
+                try:
+                    leaderboard.add_many(rows)
+                except sqlite3.Error as e:
+                    logger.error('写入排行榜失败: %s', e)
+            with self._cond:
+                self._written = version
+                self._cond.notify_all()
+                if self._closed and not self._pending:
+                    break
+        if leaderboard is not None:
+            leaderboard.close()
+
+
+class HighScorePager:
+    """界面上按页浏览排行榜，只在翻页时查询当前页"""
+
+    def __init__(self, leaderboard, page_size=8):
+        self.leaderboard = leaderboard
+        self.page_size = page_size
+        self.reset()
+
+    def reset(self):
+        """回到第一页，下次访问时重新查询"""
+        self._cursors = [None]   # 每一页的起始游标
+        self._rows = None
+
+    @property
+    def page_index(self):
+        """当前页码（从 0 开始）"""
+        return len(self._cursors) - 1
+
+    def rows(self):
+        """当前页的结果，多取一条用来判断是否还有下一页"""
+        if self._rows is None:
+            self._rows = self.leaderboard.page_after(self._cursors[-1], self.page_size + 1)
+        return self._rows[:self.page_size]
+
+    def has_next(self):
+        self.rows()
+        return len(self._rows) > self.page_size
+
+    def has_prev(self):
+        return len(self._cursors) > 1
+
+    def next_page(self):
+        """翻到下一页，没有下一页时返回 False"""
+        if not self.has_next():
+            return False
+        self._cursors.append(self._rows[self.page_size - 1])
+        self._rows = None
+        return True
+
+    def prev_page(self):
+        """翻到上一页，已是第一页时返回 False"""
+        if not self.has_prev():
+            return False
+        self._cursors.pop()
+        self._rows = None
+        return True
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜服务客户端
+
+游戏线程调用 submit() 只是把结果放进内存队列，立即返回；
+后台线程里的 asyncio 事件循环负责：
+- 维持 pool_size 条长连接，每条连接一个发送协程
+- 把队列里积累的结果合并成一批（最多 batch_size 条）一次发送
+- 连接失败或超时时断开重连，批次放回队首，按指数退避（带随机抖动）重试
+- 队列超过 max_pending 时丢弃最旧的结果，内存占用有上限
+page_after() 与 Leaderboard.page_after 接口相同，排行榜界面用它按页读取服务端的排行榜。
+协议见 leaderboard_server.py。
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+from src.leaderboard import Result
+
+logger = logging.getLogger('LeaderboardClient')
+
+
+class LeaderboardClient:
+    """排行榜服务客户端"""
+
+    def __init__(self, host, port, pool_size=2, batch_size=200, linger=0.005,
+                 max_pending=100000, timeout=5.0, backoff=0.1, max_backoff=5.0,
+                 query_timeout=1.0):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.linger = linger              # 等待更多结果凑成一批的时间（秒）
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.query_timeout = query_timeout   # 界面查询排行榜时最多等待的时间（秒）
+
+        # 统计
+        self.sent = 0        # 服务端已确认
+        self.dropped = 0     # 队列满时丢弃
+        self.rejected = 0    # 服务端拒绝（格式错误，不重试）
+        self.retries = 0
+
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._in_flight = 0
+        self._closing = False
+        self._wake_scheduled = False
+
+        self._loop = asyncio.new_event_loop()
+        self._wakeup = None
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                        name='LeaderboardClient', daemon=True)
+        self._thread.start()
+        ready.wait()
+        atexit.register(self.close)
+
+    # ---- 游戏线程调用的接口 ----
+
+    def submit(self, player, score, length, ticks, duration, created_at=None):
+        """上报一局结果，立即返回"""
+        if created_at is None:
+            created_at = time.time()
+        row = [player, score, length, ticks, duration, created_at]
+        with self._cond:
+            if self._closing:
+                return
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(row)
+            # 同一时刻只需要唤醒一次发送协程
+            wake = not self._wake_scheduled
+            self._wake_scheduled = True
+        if wake:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def pending(self):
+        """还没有被服务端确认的结果数"""
+        with self._cond:
+            return len(self._pending) + self._in_flight
+
+    def flush(self, timeout=None):
+        """等待队列中的结果全部被服务端确认，超时返回 False"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self, timeout=2.0):
+        """尽量把剩余结果发出去，然后关闭连接和后台线程"""
+        if self._closing:
+            return
+        self.flush(timeout)
+        with self._cond:
+            self._closing = True
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            pass  # 事件循环已经结束
+        self._thread.join(timeout)
+
+    def request(self, message, timeout=None):
+        """发送一个查询请求（top/rank/count）并等待回复，供工具和测试使用"""
+        future = asyncio.run_coroutine_threadsafe(self._request_once(message), self._loop)
+        return future.result(timeout or self.timeout)
+
+    def page_after(self, cursor, limit):
+        """从游标之后取 limit 条结果（与 Leaderboard.page_after 相同），在调用线程中等待
+
+        服务不可用或超时时抛出 ConnectionError。
+        """
+        message = {'op': 'page', 'after': None if cursor is None else list(cursor),
+                   'limit': limit}
+        try:
+            reply = self.request(message, self.query_timeout)
+        except (OSError, ValueError, asyncio.TimeoutError, concurrent.futures.TimeoutError) as e:
+            raise ConnectionError(f'查询排行榜失败: {e}') from e
+        if not reply.get('ok'):
+            raise ConnectionError(f'查询排行榜失败: {reply.get("error")}')
+        return [Result(*row) for row in reply['results']]
+
+    # ---- 后台事件循环 ----
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        ready.set()
+        workers = [self._worker() for _ in range(self.pool_size)]
+        try:
+            self._loop.run_until_complete(asyncio.gather(*workers))
+        finally:
+            self._loop.close()
+
+    def _take_batch(self):
+        """从队首取出一批结果"""
+        with self._cond:
+            count = min(len(self._pending), self.batch_size)
+            batch = [self._pending.popleft() for _ in range(count)]
+            self._in_flight += count
+            if not self._pending:
+                self._wake_scheduled = False
+            return batch
+
+    def _finish_batch(self, batch, ok):
+        """一批发送结束：成功则计数，失败则放回队首等待重试"""
+        with self._cond:
+            self._in_flight -= len(batch)
+            if ok is None:
+                self._pending.extendleft(reversed(batch))
+            elif ok:
+                self.sent += len(batch)
+            else:
+                self.rejected += len(batch)
+            self._cond.notify_all()
+
+    async def _connect(self):
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, limit=1 << 20), self.timeout)
+
+    async def _call(self, connection, message):
+        """在连接上发送一个请求并读取回复"""
+        reader, writer = connection
+        writer.write(json.dumps(message, ensure_ascii=False).encode() + b'\n')
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), self.timeout)
+        if not line:
+            raise ConnectionError('服务端关闭了连接')
+        return json.loads(line)
+
+    async def _request_once(self, message):
+        connection = await self._connect()
+        try:
+            return await self._call(connection, message)
+        finally:
+            connection[1].close()
+
+    async def _worker(self):
+        """发送协程：每个协程持有一条长连接"""
+        connection = None
+        delay = self.backoff
+        while True:
+            if self.linger and len(self._pending) < self.batch_size:
+                await asyncio.sleep(self.linger)
+            batch = self._take_batch()
+            if not batch:
+                if self._closing:
+                    break
+                self._wakeup.clear()
+                if self._pending:
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), 0.5)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                if connection is None:
+                    connection = await self._connect()
+                reply = await self._call(connection, {'op': 'submit', 'results': batch})
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                self._finish_batch(batch, None)
+                if connection is not None:
+                    connection[1].close()
+                    connection = None
+                if self._closing:
+                    break
+                self.retries += 1
+                logger.warning('上报排行榜失败（%.1f 秒后重试）: %s', delay, e)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, self.max_backoff)
+                continue
+
+            delay = self.backoff
+            ok = bool(reply.get('ok'))
+            if not ok:
+                logger.error('服务端拒绝了 %d 条结果: %s', len(batch), reply.get('error'))
+            self._finish_batch(batch, ok)
+
+        if connection is not None:
+            connection[1].close()
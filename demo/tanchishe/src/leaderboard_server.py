@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜服务
+
+基于 asyncio 的小型排行榜服务，多个游戏实例把对局结果上报到这里。
+协议为换行分隔的 JSON，每个请求一行，服务端按顺序各回复一行：
+
+    {"op": "submit", "results": [[player, score, length, ticks, duration, created_at], ...]}
+        -> {"ok": true, "accepted": n}
+    {"op": "top", "limit": 10}
+        -> {"ok": true, "results": [[id, player, score, length, ticks, duration, created_at], ...]}
+    {"op": "page", "after": 上一页最后一条结果（同 results 中的一行）或 null, "limit": 9}
+        -> {"ok": true, "results": [...]}
+    {"op": "rank", "score": 12}
+        -> {"ok": true, "rank": 3}
+    {"op": "count"}
+        -> {"ok": true, "count": 1000}
+
+提交的结果交给 LeaderboardRecorder 的写线程批量写入 SQLite，事件循环不等待磁盘；
+查询在单独的查询线程中执行（SQLite 连接只能在创建它的线程里使用），事件循环只等待结果。
+本地运行（代替正式服务）：
+    python src/leaderboard_server.py --port 8765 --db data/server_leaderboard.db
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.leaderboard import Leaderboard, LeaderboardRecorder, Result
+from src.log_config import setup_logging
+
+logger = logging.getLogger('LeaderboardServer')
+
+# 单行请求的最大长度，足够容纳上千条结果的批量提交
+MAX_LINE = 1 << 20
+MAX_TOP = 100
+
+
+def _valid_result(row):
+    """检查一条上报的结果"""
+    return (isinstance(row, list) and len(row) == 6 and isinstance(row[0], str)
+            and all(type(v) is int and v >= 0 for v in row[1:4])
+            and all(type(v) in (int, float) and v >= 0 for v in row[4:6]))
+
+
+def _limit(request):
+    """查询条数，限制在 1..MAX_TOP（SQLite 的 LIMIT 为负数时不限条数）"""
+    return max(1, min(int(request.get('limit', 10)), MAX_TOP))
+
+
+class LeaderboardServer:
+    """排行榜服务"""
+
+    def __init__(self, db_path, host='127.0.0.1', port=8765):
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.recorder = LeaderboardRecorder(db_path)
+        self.reader = None      # 查询用的连接，只在 _query_executor 的线程里使用
+        self._query_executor = ThreadPoolExecutor(max_workers=1,
+                                                  thread_name_prefix='LeaderboardQuery')
+        self.server = None
+        self.accepted = 0
+        self._writers = set()   # 当前连接，关闭服务时主动断开
+
+    async def start(self):
+        """开始监听，port 为 0 时由系统分配端口，实际端口保存在 self.port"""
+        self.reader = await self._query(Leaderboard, self.db_path)
+        self.server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                 limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info('排行榜服务已启动: %s:%d', self.host, self.port)
+
+    async def close(self):
+        """停止监听，并等待已接受的结果写入数据库"""
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self.server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, self.recorder.close)
+        if self.reader is not None:
+            await self._query(self.reader.close)
+            self.reader = None
+        self._query_executor.shutdown()
+
+    async def _query(self, func, *args):
+        """在查询线程中执行 func(*args)，不阻塞事件循环"""
+        return await asyncio.get_running_loop().run_in_executor(self._query_executor, func, *args)
+
+    async def _handle(self, reader, writer):
+        """处理一个连接上的所有请求"""
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line))
+                except (ValueError, TypeError, KeyError) as e:
+                    response = {'ok': False, 'error': f'请求无效: {e}'}
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            # ValueError: 单行请求超过 MAX_LINE
+            logger.debug('连接断开: %s', e)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def dispatch(self, request):
+        """处理一个请求，返回回复"""
+        op = request['op']
+        if op == 'submit':
+            results = request['results']
+            if not isinstance(results, list) or not all(map(_valid_result, results)):
+                raise ValueError('results 格式不正确')
+            self.recorder.submit_many([tuple(row) for row in results])
+            self.accepted += len(results)
+            return {'ok': True, 'accepted': len(results)}
+        if op == 'top':
+            limit = _limit(request)
+            results = await self._query(self.reader.top, limit)
+            return {'ok': True, 'results': [list(r) for r in results]}
+        if op == 'page':
+            limit = _limit(request)
+            cursor = request.get('after')
+            if cursor is not None:
+                # 游标是上一页的最后一条结果，查询只用到其中的 id 和得分
+                cursor = Result(*cursor)
+                cursor = cursor._replace(id=int(cursor.id), score=int(cursor.score))
+            results = await self._query(self.reader.page_after, cursor, limit)
+            return {'ok': True, 'results': [list(r) for r in results]}
+        if op == 'rank':
+            return {'ok': True, 'rank': await self._query(self.reader.rank_of_score,
+                                                          int(request['score']))}
+        if op == 'count':
+            return {'ok': True, 'count': await self._query(self.reader.count)}
+        raise ValueError(f'未知操作: {op}')
+
+
+class ServerThread:
+    """在后台线程中运行排行榜服务（用于测试和压测）"""
+
+    def __init__(self, db_path, host='127.0.0.1', port=0):
+        self.server = LeaderboardServer(db_path, host, port)
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors = []
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self.server.start())
+            except OSError as e:
+                errors.append(e)
+                return
+            finally:
+                started.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, name='LeaderboardServer', daemon=True)
+        self.thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+
+    @property
+    def port(self):
+        return self.server.port
+
+    def stop(self):
+        """停止服务并等待数据写完"""
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+async def serve(db_path, host, port):
+    """运行服务直到被中断"""
+    server = LeaderboardServer(db_path, host, port)
+    await server.start()
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='排行榜服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--db', default='data/server_leaderboard.db', help='SQLite 数据库文件')
+    parser.add_argument('--log-level', default='INFO', help='日志级别')
+    args = parser.parse_args(argv)
+    setup_logging(args.log_level)
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+日志配置
+
+游戏模块只创建具名 logger，不在导入时配置日志，
+由程序入口调用 setup_logging() 统一配置：
+- 日志级别来自命令行参数或环境变量 SNAKE_LOG_LEVEL，默认 WARNING，
+  低于该级别的调用在 isEnabledFor 检查处就返回，不做任何格式化
+- 主线程只把日志记录原样放进队列，格式化和写控制台由 QueueListener 的后台线程完成
+- 可选的内存环形缓冲区保存最近 N 条记录（包括 DEBUG），程序退出时一次性写入文件，
+  保留诊断信息而不产生每帧 I/O；控制台仍只输出配置的级别及以上
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from collections import deque
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_LEVEL = logging.WARNING
+LEVEL_ENV = 'SNAKE_LOG_LEVEL'
+EVENT_LOG_ENV = 'SNAKE_EVENT_LOG'
+
+# 当前生效的配置，shutdown_logging() 时清理
+_listener = None
+_handlers = []
+event_log = None
+
+
+def parse_level(value):
+    """把 'debug'、'INFO'、'10' 这样的字符串转换为日志级别数值"""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    level = logging.getLevelName(text.upper())
+    if not isinstance(level, int):
+        raise ValueError(f'未知的日志级别: {value}')
+    return level
+
+
+class EventRingBuffer(logging.Handler):
+    """只保存最近 capacity 条日志记录的内存缓冲区
+
+    emit 只把记录追加到定长 deque，不格式化也不做 I/O；
+    需要时再用 lines() 或 dump() 取出。
+    """
+
+    def __init__(self, capacity=1000):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self):
+        """按时间顺序返回格式化后的日志行"""
+        return [self.format(record) for record in list(self.records)]
+
+    def dump(self, path):
+        """把缓冲区中的记录写入文件，返回写入的条数"""
+        lines = self.lines()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + '\n')
+        return len(lines)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """入队时不格式化的 QueueHandler
+
+    标准的 QueueHandler.prepare 会在调用日志的线程里格式化消息并复制记录，
+    这里原样入队，由监听线程里各个 handler 自己格式化。
+    记录在同一进程内传递，参数和异常信息不需要先转成字符串；
+    代价是参数对象在格式化之前被修改时，输出的是修改后的值。
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=None, event_log_size=None, event_log_path=None, stream=None):
+    """配置根 logger
+
+    level 为 None 时读取环境变量 SNAKE_LOG_LEVEL（默认 WARNING），是控制台输出的级别；
+    event_log_size 为 None 时读取环境变量 SNAKE_EVENT_LOG（默认 0，不启用环形缓冲区）。
+    启用环形缓冲区时根 logger 放开到 DEBUG，DEBUG 记录只进入缓冲区，不输出到控制台；
+    不启用时根 logger 就是 level，低级别的调用在 isEnabledFor 处直接返回。
+    给出 event_log_path 时，程序退出前把环形缓冲区写入该文件。
+    重复调用会先撤销上一次的配置。返回环形缓冲区（未启用时为 None）。
+    """
+    global _listener, event_log
+    shutdown_logging()
+    event_log = None
+
+    if level is None:
+        level = os.environ.get(LEVEL_ENV, DEFAULT_LEVEL)
+    level = parse_level(level)
+    if event_log_size is None:
+        event_log_size = int(os.environ.get(EVENT_LOG_ENV, 0))
+
+    console = logging.StreamHandler(stream or sys.stderr)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    console.setLevel(level)
+    targets = [console]
+    root_level = level
+    if event_log_size > 0:
+        event_log = EventRingBuffer(event_log_size)
+        targets.append(event_log)
+        root_level = min(level, logging.DEBUG)
+
+    # 主线程的 handler 只负责入队，真正的处理在监听线程中进行
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *targets,
+                                               respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(root_level)
+    root.addHandler(queue_handler)
+    _handlers.append(queue_handler)
+
+    if event_log is not None and event_log_path:
+        atexit.register(_dump_event_log, event_log, event_log_path)
+    return event_log
+
+
+def _dump_event_log(buffer, path):
+    """退出时写出环形缓冲区"""
+    shutdown_logging()
+    try:
+        count = buffer.dump(path)
+    except OSError as e:
+        print(f'写入事件日志失败: {e}', file=sys.stderr)
+    else:
+        print(f'已写入 {count} 条事件日志: {path}', file=sys.stderr)
+
+
+def shutdown_logging():
+    """停止监听线程（会先处理完队列中的记录）并移除 setup_logging 添加的 handler"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    root = logging.getLogger()
+    while _handlers:
+        root.removeHandler(_handlers.pop())
+
+
+atexit.register(shutdown_logging)
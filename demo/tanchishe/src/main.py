@@ -1,78 +1,266 @@
 # -*- coding: utf-8 -*-
+# 最先导入，导入时刻是启动计时的起点
+from startup_timer import startup
 import pygame
 import sys
+import os
 import logging
+import math
 import time
-from snake import Snake
-from food import Food
+import argparse
+import atexit
+from collections import deque
+# 让 src 包内以 "src." 开头的导入在直接运行 main.py 时也能找到
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import SnakeEngine, UP, DOWN, LEFT, RIGHT, EVENT_EAT, EVENT_CRASH
 from settings import Settings
 from game_state import GameState
 from ui_manager import UIManager
 from sound_manager import SoundManager
+from asset_bundle import open_bundle
+from renderer import BoardRenderer
+from log_config import setup_logging, parse_level
+from replay import Replay, ReplayRecorder, ReplayPlayer
+from frame_profiler import FrameProfiler, ProfilerOverlay, EVENTS, UPDATE, RENDER, PRESENT, WAIT
+from profile_capture import (CpuCapture, AllocationTracker, parse_profile_spec,
+                             PROFILE_ENV, PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR, DEFAULT_CPU_FRAMES)
+startup.mark('导入模块')
 
-# 配置日志
-logging.basicConfig(level=logging.DEBUG,
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# 日志由 main() 通过 log_config.setup_logging() 配置
 logger = logging.getLogger('Game')
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, replay=None, record_path=None, leaderboard_client=None, board_size=None):
+        """replay 不为 None 时回放该录像；record_path 不为 None 时每局结束后把录像保存到该文件；
+        leaderboard_client 不为 None 时对局结果上报到排行榜服务，而不是写入本地排行榜；
+        board_size 为 (宽, 高) 格子数，比窗口大时镜头跟随蛇头"""
+        # 只初始化第一帧用得到的模块；混音器由 SoundManager 在后台线程中初始化
+        pygame.display.init()
+        pygame.font.init()
         self.settings = Settings()
+        if board_size is not None:
+            self.settings.board_width, self.settings.board_height = board_size
         self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
         pygame.display.set_caption("贪吃蛇")
+        startup.mark('打开窗口')
         
-        self.snake = Snake()
-        self.food = Food()
+        # 游戏规则由无界面的模拟引擎负责，Game 只负责输入、音效和绘制
+        # 回放时初始长度取自录像，否则同一串输入会得到不同的结果
+        self.engine = SnakeEngine(
+            width=self.settings.board_width,
+            height=self.settings.board_height,
+            init_length=replay.init_length if replay is not None else self.settings.SNAKE_INIT_LENGTH)
         self.game_state = GameState()
+        # 资源包（build_assets.py 生成）存在时字体和音效从包里读取，否则读取单独的文件
+        self.asset_bundle = open_bundle()
         self.ui_manager = UIManager(self)
-        self.sound_manager = SoundManager()
+        # 音频设备初始化和解码在第一帧之后由 run_game() 放到后台进行
+        self.sound_manager = SoundManager(
+            background=True, cache_dir=self.settings.sound_cache_dir,
+            frequency=self.settings.audio_frequency, buffer=self.settings.audio_buffer,
+            channels=self.settings.audio_channels, bundle=self.asset_bundle)
+        self.renderer = BoardRenderer(self.settings, self.engine, self.ui_manager)
         
-        # 添加移动计时器
-        self.last_move_time = time.time()
+        # 固定步长的模拟计时：用单调的高精度时钟累积真实时间，
+        # 每满 move_delay 秒推进一步，一帧内可以推进多步
+        self.sim_clock = time.perf_counter
         self.move_delay = 1.0 / self.settings.snake_speed  # 移动间隔时间
+        self.time_scale = self.settings.time_scale  # 时间倍率，机器人回放可以加速或放慢
+        self.sim_accumulator = 0.0
+        self.last_sim_time = self.sim_clock()
+        # 还没有生效的转向，每一步只消耗一个，快速连按的两次转向不会互相覆盖
+        self.turn_queue = deque(maxlen=self.settings.turn_queue_size)
+        # 空闲界面没有输入时的休眠时间（毫秒），见 _wait_for_events
+        self.idle_delay = self.settings.idle_delay_min
+
+        # 录像：每局都记录种子和转向，回放时由录像代替键盘输入
+        self.recorder = ReplayRecorder()
+        self.record_path = record_path
+        self.last_replay = None
+        self.replay_player = ReplayPlayer(replay) if replay is not None else None
+        self.leaderboard_client = leaderboard_client
+        # 逐帧计时，默认关闭；按 F3 或用 --profile-csv 启动时打开
+        self.profiler = None
+        self.profiler_overlay = None
+        self.show_profiler = False
+        # 按需采集：F4 用 cProfile 采集 cpu_capture_frames 帧，F5 比较每局的内存分配
+        self.profile_dir = DEFAULT_PROFILE_DIR
+        self.cpu_capture_frames = DEFAULT_CPU_FRAMES
+        self.cpu_capture = None
+        self.alloc_tracker = None
+        if replay is not None and (replay.width, replay.height) != (self.engine.width, self.engine.height):
+            raise ValueError(f'录像的棋盘大小 {replay.width}x{replay.height} 与当前设置不一致')
         
+        # 为 True 时第一帧之后把启动耗时打印到标准输出（--startup-report）
+        self.startup_report = False
+
         logger.info('游戏初始化完成')
-        # 初始化时播放背景音乐
+        # 初始化时播放背景音乐（音频加载完成后才真正开始）
         self.sound_manager.play_background_music()
+        startup.mark('创建游戏')
 
     def run_game(self):
         clock = pygame.time.Clock()
+        # 先把第一帧画出来，再在后台初始化音频、解码音效
+        self._update_screen()
+        startup.mark('第一帧')
+        self.sound_manager.load_async()
+        startup.report(sys.stdout if self.startup_report else None)
         while True:
+            self._run_frame(clock)
+
+    def _run_frame(self, clock):
+        """运行一帧
+
+        游戏进行中按固定帧率轮询事件、推进模拟并绘制；
+        菜单、暂停、结束和排行榜界面没有任何东西会自己变化，
+        这时进入空闲模式，没有输入就休眠，只在收到事件或状态切换后才重绘。
+        """
+        if self.cpu_capture is not None and self.cpu_capture.frame():
+            self.stop_cpu_capture()
+        if self.game_state.is_playing():
+            if self.profiler is not None:
+                self._run_profiled_frame(clock)
+                return
             self._check_events()
-            
             if self.game_state.is_playing():
                 self._update_game()
-            
             self._update_screen()
             clock.tick(self.settings.fps)
+        else:
+            self._wait_for_events()
+            self._update_screen()
+            if self.game_state.is_playing():
+                # 刚从空闲界面恢复游戏，丢掉等待期间累积的时间，避免第一帧被当成卡顿
+                clock.tick()
+                self._reset_sim_clock()
+
+    def _run_profiled_frame(self, clock):
+        """与游戏进行中的一帧相同，但记录每个阶段的耗时"""
+        profiler = self.profiler
+        profiler.begin_frame()
+        self._check_events()
+        profiler.mark(EVENTS)
+        steps = self._update_game() if self.game_state.is_playing() else 0
+        profiler.mark(UPDATE)
+        dirty_rects = self._render()
+        profiler.mark(RENDER)
+        self._present(dirty_rects)
+        profiler.mark(PRESENT)
+        clock.tick(self.settings.fps)
+        profiler.mark(WAIT)
+        profiler.end_frame(steps)
+
+    def enable_profiler(self, csv_path=None):
+        """打开逐帧计时，csv_path 不为 None 时逐帧写入 CSV"""
+        if self.profiler is None:
+            self.profiler = FrameProfiler(csv_path=csv_path)
+            atexit.register(self.profiler.close)
+            self.profiler_overlay = ProfilerOverlay(self.profiler, self.ui_manager.small_font)
+        return self.profiler
+
+    def toggle_profiler_overlay(self):
+        """显示/隐藏性能浮层（第一次显示时打开逐帧计时）"""
+        self.enable_profiler()
+        self.show_profiler = not self.show_profiler
+        self.renderer.invalidate()
+
+    def start_cpu_capture(self, frames=None):
+        """用 cProfile 采集接下来的 frames 帧（默认 cpu_capture_frames），结束后写出 .pstats"""
+        if self.cpu_capture is None:
+            self.cpu_capture = CpuCapture(frames or self.cpu_capture_frames, self.profile_dir)
+            # 采集中途退出时也写出已采集的部分
+            atexit.register(self.cpu_capture.stop)
+        return self.cpu_capture
+
+    def stop_cpu_capture(self):
+        """结束 CPU 采集，返回 .pstats 文件路径（没有在采集时返回 None）"""
+        capture = self.cpu_capture
+        if capture is None:
+            return None
+        self.cpu_capture = None
+        atexit.unregister(capture.stop)
+        return capture.stop()
+
+    def toggle_cpu_capture(self):
+        """开始 CPU 采集；正在采集时提前结束"""
+        if self.cpu_capture is None:
+            self.start_cpu_capture()
+        else:
+            self.stop_cpu_capture()
+
+    def enable_alloc_tracking(self):
+        """打开内存分配比较：从现在（或下一局开局）到游戏结束的分配写成报告"""
+        if self.alloc_tracker is None:
+            self.alloc_tracker = AllocationTracker(self.profile_dir)
+            logger.info('已打开内存分配比较')
+            if self.game_state.is_playing():
+                self.alloc_tracker.begin()
+        return self.alloc_tracker
+
+    def toggle_alloc_tracking(self):
+        """打开/关闭内存分配比较"""
+        if self.alloc_tracker is None:
+            self.enable_alloc_tracking()
+        else:
+            self.alloc_tracker.close()
+            self.alloc_tracker = None
+            logger.info('已关闭内存分配比较')
+
+    def _wait_for_events(self):
+        """空闲界面：有事件就处理，没有就休眠
+
+        pygame.event.wait(timeout) 内部每毫秒轮询一次，空闲时反而比 tick(60) 更耗 CPU，
+        所以这里用 pygame.time.wait 真正休眠。休眠时间从 idle_delay_min 开始，
+        一直没有输入就逐次加倍到 idle_delay_max，收到输入后恢复为最短间隔，
+        保证鼠标悬停和点击仍然跟手。
+        """
+        events = pygame.event.get()
+        if events:
+            self.idle_delay = self.settings.idle_delay_min
+            for event in events:
+                self._handle_event(event)
+        else:
+            pygame.time.wait(self.idle_delay)
+            self.idle_delay = min(self.idle_delay * 2, self.settings.idle_delay_max)
 
     def _check_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.MOUSEMOTION:
-                # 更新按钮悬停状态
-                mouse_pos = pygame.mouse.get_pos()
-                self.ui_manager.update_button_states(mouse_pos)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # 处理鼠标点击
-                mouse_pos = pygame.mouse.get_pos()
-                self._handle_mouse_click(event, mouse_pos)
+            self._handle_event(event)
+
+    def _handle_event(self, event):
+        """处理单个事件"""
+        if event.type == pygame.QUIT:
+            sys.exit()
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                            pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED):
+            # 窗口内容可能已丢失，下一帧整屏重绘
+            self.renderer.invalidate()
+        elif event.type == pygame.KEYDOWN:
+            self._check_keydown_events(event)
+        elif event.type == pygame.MOUSEMOTION:
+            # 更新按钮悬停状态
+            mouse_pos = pygame.mouse.get_pos()
+            changed = self.ui_manager.update_button_states(mouse_pos)
+            if changed and not self.game_state.is_playing():
+                # 按钮悬停状态改变，需要重绘菜单
+                self.renderer.invalidate()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # 处理鼠标点击
+            mouse_pos = pygame.mouse.get_pos()
+            self._handle_mouse_click(event, mouse_pos)
 
     def _handle_mouse_click(self, event, pos):
         """处理鼠标点击"""
-        logger.debug(f'处理鼠标点击 - 位置: {pos}, 当前游戏状态: {self.game_state}')
+        logger.debug('处理鼠标点击 - 位置: %s, 当前游戏状态: %s', pos, self.game_state)
         # 更新按钮状态
         self.ui_manager.update_button_states(pos)
         # 处理按钮点击
         action = self.ui_manager.handle_input(event, self.game_state)
-        logger.debug(f'UI处理结果: {action}')
+        logger.debug('UI处理结果: %s', action)
         
         if action:
-            logger.info(f'执行动作: {action}')
+            logger.info('执行动作: %s', action)
             self.sound_manager.play_menu_select_sound()
             if action == 'start':
                 self._start_new_game()
@@ -86,7 +274,16 @@ class Game:
             elif action == 'quit_to_menu':
                 self.game_state.show_menu()
             elif action == 'high_scores':
+                # 刚结束的一局可能还在后台写入，稍等一下再显示
+                self.game_state.flush_results(timeout=0.2)
+                self.ui_manager.reset_score_page()
                 self.game_state.show_high_scores()
+            elif action == 'next_page':
+                if self.ui_manager.next_score_page():
+                    self.renderer.invalidate()
+            elif action == 'prev_page':
+                if self.ui_manager.prev_score_page():
+                    self.renderer.invalidate()
 
     def _check_keydown_events(self, event):
         if event.key == pygame.K_q:
@@ -107,64 +304,246 @@ class Game:
         elif event.key == pygame.K_s:
             self.sound_manager.toggle_sound()
             self.sound_manager.play_menu_select_sound()
+        elif event.key == pygame.K_F3:
+            self.toggle_profiler_overlay()
+        elif event.key == pygame.K_F4:
+            self.toggle_cpu_capture()
+        elif event.key == pygame.K_F5:
+            self.toggle_alloc_tracking()
         
         # 只在游戏进行中处理方向键
         if self.game_state.is_playing():
             if event.key == pygame.K_RIGHT:
-                self.snake.change_direction("RIGHT")
+                self._queue_turn(RIGHT)
                 self.sound_manager.play_move_sound()
             elif event.key == pygame.K_LEFT:
-                self.snake.change_direction("LEFT")
+                self._queue_turn(LEFT)
                 self.sound_manager.play_move_sound()
             elif event.key == pygame.K_UP:
-                self.snake.change_direction("UP")
+                self._queue_turn(UP)
                 self.sound_manager.play_move_sound()
             elif event.key == pygame.K_DOWN:
-                self.snake.change_direction("DOWN")
+                self._queue_turn(DOWN)
                 self.sound_manager.play_move_sound()
 
     def _start_new_game(self):
         """开始新游戏"""
         logger.info('开始新游戏')
-        self.snake = Snake()
-        self.food = Food()
+        if self.replay_player is not None:
+            self.engine.reset(self.replay_player.replay.seed)
+            self.replay_player.rewind()
+        else:
+            self.engine.reset()
+        self.recorder.start(self.engine)
+        self.turn_queue.clear()
+        self._reset_sim_clock()
+        self.renderer.invalidate()
         self.game_state.start()
+        if self.alloc_tracker is not None:
+            self.alloc_tracker.begin()
         logger.debug('游戏状态已重置')
 
+    def _queue_turn(self, direction):
+        """记录一次转向，下一步模拟时生效（连续相同的转向只记一次）"""
+        if not self.turn_queue or self.turn_queue[-1] != direction:
+            self.turn_queue.append(direction)
+
+    def _reset_sim_clock(self):
+        """从现在开始重新累积模拟时间（开局、从暂停恢复时调用）"""
+        self.sim_accumulator = 0.0
+        self.last_sim_time = self.sim_clock()
+
     def _update_game(self):
-        """更新游戏状态"""
-        current_time = time.time()
-        # 检查是否到达移动时间
-        if current_time - self.last_move_time >= self.move_delay:
-            self.snake.move()
-            self.last_move_time = current_time
-            
-            # 检查是否吃到食物
-            if self.snake.check_food_collision(self.food):
-                self.snake.grow()
-                self.food.respawn(self.snake.body)
-                self.game_state.increase_score()
-                self.sound_manager.play_eat_sound()
-            
-            # 检查是否撞墙或撞到自己
-            if self.snake.check_collision():
-                self.game_state.game_over()
-                self.sound_manager.play_crash_sound()
+        """更新游戏状态
+
+        把距离上一帧经过的时间（乘以 time_scale）累积起来，每满 move_delay
+        推进一步，所以 snake_speed 可以高于帧率，步数也只取决于经过的时间。
+        一帧最多推进 max_steps_per_frame 步，卡顿太久时丢弃多余的时间，
+        避免越追越慢。返回这一帧推进的步数。
+        """
+        now = self.sim_clock()
+        self.sim_accumulator += (now - self.last_sim_time) * self.time_scale
+        self.last_sim_time = now
+
+        steps = 0
+        while self.sim_accumulator >= self.move_delay:
+            if steps == self.settings.max_steps_per_frame:
+                self.sim_accumulator = 0.0
+                break
+            self.sim_accumulator -= self.move_delay
+            steps += 1
+            if self._step_game():
+                self.sim_accumulator = 0.0
+                break
+        return steps
+
+    def _step_game(self):
+        """推进一步模拟并处理得分和音效，游戏结束时返回 True"""
+        tick = self.engine.steps
+        if self.replay_player is not None:
+            action = self.replay_player.action_for(tick)
+        else:
+            action = self.turn_queue.popleft() if self.turn_queue else None
+            if action is not None:
+                self.recorder.record(tick, action)
+        events, done = self.engine.step(action)
+
+        # 检查是否吃到食物
+        if events & EVENT_EAT:
+            self.game_state.increase_score()
+            self.sound_manager.play_eat_sound(self.game_state.score)
+
+        # 检查是否撞墙、撞到自己或者占满了整个棋盘
+        if events & EVENT_CRASH:
+            self.sound_manager.play_crash_sound()
+        elif self.replay_player is not None and self.replay_player.finished(self.engine.steps):
+            # 录像在对局中途结束（比如录制时直接退出了）
+            done = True
+        if done:
+            self._end_game()
+        return done
+
+    def _end_game(self):
+        """对局结束：切换到结束界面并保存录像（回放不计入最高分）"""
+        self.game_state.game_over(record_score=self.replay_player is None)
+        if self.replay_player is None:
+            player = self.settings.player_name
+            length, ticks = self.engine.length, self.engine.steps
+            duration = ticks * self.move_delay
+            if self.leaderboard_client is not None:
+                # 只放进客户端的内存队列，网络发送和重试都在后台线程中进行
+                self.leaderboard_client.submit(player, self.game_state.score, length, ticks, duration)
+            else:
+                self.game_state.record_result(player, length, ticks, duration)
+            self.last_replay = self.recorder.finish(self.engine)
+            if self.record_path:
+                try:
+                    self.last_replay.save(self.record_path)
+                    logger.info('录像已保存: %s', self.record_path)
+                except OSError as e:
+                    logger.error('保存录像失败: %s', e)
+        if self.alloc_tracker is not None:
+            self.alloc_tracker.end()
 
     def _update_screen(self):
-        """更新屏幕显示"""
-        self.screen.fill(self.settings.bg_color)
-        
-        # 绘制游戏元素
-        if not self.game_state.is_menu():
-            self.snake.draw(self.screen)
-            self.food.draw(self.screen)
-        
-        # 绘制UI
-        self.ui_manager.draw(self.screen, self.game_state)
-        
-        pygame.display.flip()
+        """更新屏幕显示：只提交变化的区域，状态切换时整屏刷新"""
+        self._present(self._render())
+
+    def _render(self):
+        """绘制这一帧，返回需要提交的矩形（None 表示整屏）"""
+        dirty_rects = self.renderer.render(self.screen, self.game_state)
+        if self.show_profiler and self.game_state.is_playing():
+            rect, resized = self.profiler_overlay.draw(self.screen)
+            if resized:
+                # 浮层变小时旧的边缘还留在画面上，下一帧整屏重绘
+                self.renderer.invalidate()
+            if dirty_rects is not None:
+                dirty_rects.append(rect)
+        return dirty_rects
+
+    def _present(self, dirty_rects):
+        """把绘制结果提交到屏幕"""
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+
+def parse_board_size(text):
+    """解析 --board 参数，比如 "2000x2000" -> (2000, 2000)"""
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'棋盘大小格式应为 宽x高: {text}')
+    if width < 4 or height < 1:
+        raise argparse.ArgumentTypeError(f'棋盘太小: {text}')
+    return width, height
+
+
+def parse_speed(text):
+    """解析 --speed 参数，必须是有限的正数（为 0 或负数时模拟时间不再前进，游戏会卡住）"""
+    try:
+        speed = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'时间倍率应为数字: {text}')
+    if not (math.isfinite(speed) and speed > 0):
+        raise argparse.ArgumentTypeError(f'时间倍率必须大于 0: {text}')
+    return speed
+
+
+def parse_server_address(text):
+    """解析 --leaderboard-server 参数，比如 "example.com:8765" -> ('example.com', 8765)，省略主机时为本机"""
+    host, _, port = text.strip().rpartition(':')
+    try:
+        port = int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'排行榜服务地址格式应为 主机:端口: {text}')
+    if not 0 < port < 65536:
+        raise argparse.ArgumentTypeError(f'端口超出范围: {text}')
+    return host.strip('[]') or '127.0.0.1', port
+
+
+def main(argv=None):
+    """解析命令行参数、配置日志并启动游戏"""
+    parser = argparse.ArgumentParser(description='贪吃蛇')
+    parser.add_argument('--log-level', type=parse_level, default=None,
+                        help='日志级别（DEBUG/INFO/WARNING/...），默认读取环境变量 SNAKE_LOG_LEVEL，否则为 WARNING')
+    parser.add_argument('--event-log', type=int, default=None, metavar='N',
+                        help='在内存中保留最近 N 条日志（包括 DEBUG），默认读取环境变量 SNAKE_EVENT_LOG')
+    parser.add_argument('--event-log-file', default=None, metavar='PATH',
+                        help='退出时把内存中的日志写入该文件')
+    parser.add_argument('--record', default=None, metavar='PATH',
+                        help='每局结束后把录像保存到该文件')
+    parser.add_argument('--replay', default=None, metavar='PATH',
+                        help='回放录像文件')
+    parser.add_argument('--speed', type=parse_speed, default=None,
+                        help='模拟时间倍率，比如 --speed 8 以 8 倍速快进回放')
+    parser.add_argument('--leaderboard-server', type=parse_server_address,
+                        default=os.environ.get('SNAKE_LEADERBOARD'), metavar='HOST:PORT',
+                        help='把对局结果上报到排行榜服务，默认读取环境变量 SNAKE_LEADERBOARD')
+    parser.add_argument('--grid', action='store_true', help='绘制棋盘网格线')
+    parser.add_argument('--profile-csv', default=None, metavar='PATH',
+                        help='记录每一帧各阶段的耗时并写入 CSV（F3 显示性能浮层）')
+    parser.add_argument('--profile', type=parse_profile_spec, default=os.environ.get(PROFILE_ENV),
+                        metavar='MODES',
+                        help='按需采集：cpu[:帧数] 用 cProfile 采集，alloc 比较每局的内存分配，'
+                             '可以用逗号组合，默认读取环境变量 SNAKE_PROFILE（游戏中 F4/F5 切换）')
+    parser.add_argument('--profile-dir', default=os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR),
+                        metavar='DIR', help='采集结果的保存目录，默认读取环境变量 SNAKE_PROFILE_DIR')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='显示第一帧后打印各启动阶段的耗时')
+    parser.add_argument('--board', type=parse_board_size, default=None, metavar='WxH',
+                        help='棋盘大小（格子数），比如 --board 2000x2000，默认铺满窗口')
+    args = parser.parse_args(argv)
+    setup_logging(args.log_level, args.event_log, args.event_log_file)
+
+    replay = Replay.load(args.replay) if args.replay else None
+    client = None
+    if args.leaderboard_server:
+        # 用到时才导入，不使用排行榜服务时启动不加载 asyncio
+        from leaderboard_client import LeaderboardClient
+        client = LeaderboardClient(*args.leaderboard_server)
+    board_size = args.board
+    if board_size is None and replay is not None:
+        board_size = (replay.width, replay.height)
+    game = Game(replay=replay, record_path=args.record, leaderboard_client=client,
+                board_size=board_size)
+    if args.speed is not None:
+        game.time_scale = args.speed
+    game.settings.show_grid = args.grid
+    game.startup_report = args.startup_report
+    if args.profile_csv:
+        game.enable_profiler(args.profile_csv)
+    game.profile_dir = args.profile_dir
+    if args.profile is not None:
+        cpu_frames, alloc = args.profile
+        if alloc:
+            game.enable_alloc_tracking()
+        if cpu_frames is not None:
+            game.cpu_capture_frames = cpu_frames
+            game.start_cpu_capture()
+    if replay is not None:
+        game._start_new_game()
+    game.run_game()
 
 if __name__ == '__main__':
-    game = Game()
-    game.run_game() 
\ No newline at end of file
+    main()
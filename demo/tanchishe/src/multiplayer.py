@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+多人对战规则和增量状态
+
+Arena 在一个棋盘上同时运行多条蛇，单条蛇的规则与 SnakeEngine 一致
+（不允许 180 度掉头、吃到食物后下一步才生长、蛇头可以进入刚空出来的尾部格子），
+另外：
+- 撞墙、撞到任何一条蛇的身体、两条蛇的蛇头进入同一格，都会死亡，尸体立即移除
+- 棋盘上同时有 food_count 个食物，食物格子从空闲格子索引中取出，
+  新蛇和新食物都不会生成在食物上
+
+step() 返回的不是完整状态，而是这一步的增量（空的字段省略）：
+
+    {"op": "tick", "n": 步数,
+     "l": [离开的玩家 id, ...],
+     "j": [[id, 名字, 蛇身格子列表], ...],        新加入或重生的蛇
+     "m": [[id, 新蛇头, 是否生长], ...],          生长时不移除尾部
+     "d": [死亡的玩家 id, ...],
+     "f": [[旧食物, 新食物], ...]}                 新食物为 -1 表示棋盘已满
+
+snapshot() 返回完整状态，客户端加入时用它初始化，之后按顺序应用增量，
+RoomMirror 实现了客户端一侧的状态维护。
+"""
+import os
+from collections import deque
+
+from src.engine import (SnakeEngine, UP, RIGHT, DOWN, LEFT, MASK64, SPLITMIX_GAMMA,
+                        mix64)
+from src.free_cells import FreeCellIndex
+
+# 生成新蛇时最多尝试的次数
+SPAWN_ATTEMPTS = 64
+
+
+class ArenaSnake:
+    """对战中的一条蛇"""
+    __slots__ = ('id', 'name', 'body', 'direction', 'next_direction', 'growing',
+                 'score', 'alive')
+
+    def __init__(self, player_id, name):
+        self.id = player_id
+        self.name = name
+        self.body = deque()
+        self.direction = RIGHT
+        self.next_direction = RIGHT
+        self.growing = False
+        self.score = 0
+        self.alive = False
+
+
+class Arena:
+    """多条蛇共用一个棋盘的对战规则（服务端的权威状态）"""
+
+    def __init__(self, width=40, height=30, init_length=3, food_count=1, seed=None):
+        if width < init_length + 2 or height < 1:
+            raise ValueError(f'棋盘大小无效: {width}x{height}')
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.width = width
+        self.height = height
+        self.cell_count = width * height
+        self.init_length = init_length
+        self.food_count = food_count
+        self.seed = seed
+        self._seed_key = seed & MASK64
+        self._draws = 0
+
+        self._neighbours = SnakeEngine._build_neighbours(width, height)
+        self.occupied = bytearray(self.cell_count)   # 被蛇身占用的格子
+        # 空闲格子 = 既没有蛇也没有食物的格子
+        self.free_cells = FreeCellIndex(self.cell_count)
+        self.snakes = {}
+        self.food = []
+        self.tick = 0
+        self._next_id = 1
+        self._joined = []
+        self._left = []
+        for _ in range(food_count):
+            self._spawn_food()
+
+    def _randrange(self, n):
+        """基于计数器的随机数，与 SnakeEngine 相同"""
+        self._draws += 1
+        return mix64((self._seed_key + self._draws * SPLITMIX_GAMMA) & MASK64) % n
+
+    def _spawn_food(self):
+        """在空闲格子中放置一个食物，返回其格子，棋盘已满时返回 -1"""
+        cell = self.free_cells.sample(self._randrange)
+        if cell >= 0:
+            self.free_cells.take(cell)
+            self.food.append(cell)
+        return cell
+
+    # ---- 玩家管理 ----
+
+    def add_player(self, name):
+        """加入一名玩家并生成他的蛇，找不到出生位置时返回 None"""
+        snake = ArenaSnake(self._next_id, name)
+        if not self._place(snake):
+            return None
+        self._next_id += 1
+        self.snakes[snake.id] = snake
+        return snake.id
+
+    def respawn(self, player_id):
+        """让已死亡的玩家重新出生，成功时返回 True"""
+        snake = self.snakes.get(player_id)
+        if snake is None or snake.alive:
+            return False
+        return self._place(snake)
+
+    def remove_player(self, player_id):
+        """移除玩家和他的蛇"""
+        snake = self.snakes.pop(player_id, None)
+        if snake is None:
+            return
+        self._clear_body(snake)
+        # 还没有广播出去的加入记录作废，否则客户端会先移除再加入
+        self._joined = [entry for entry in self._joined if entry[0] != player_id]
+        self._left.append(player_id)
+
+    def turn(self, player_id, direction):
+        """改变方向（不允许 180 度掉头）"""
+        snake = self.snakes.get(player_id)
+        if snake is not None and direction != (snake.direction + 2) & 3:
+            snake.next_direction = direction
+
+    def _place(self, snake):
+        """随机选一个蛇头位置，蛇身向左、方向向右，蛇头前方两格也要空着"""
+        free = self.free_cells
+        width = self.width
+        length = self.init_length
+        for _ in range(SPAWN_ATTEMPTS):
+            head = free.sample(self._randrange)
+            if head < 0:
+                return False
+            x = head % width
+            if x < length - 1 or x > width - 3:
+                continue
+            cells = range(head + 2, head - length, -1)
+            if all(free.is_free(cell) for cell in cells):
+                break
+        else:
+            return False
+
+        snake.body = deque(range(head, head - length, -1))
+        for cell in snake.body:
+            self.occupied[cell] = 1
+            free.take(cell)
+        snake.direction = snake.next_direction = RIGHT
+        snake.growing = False
+        snake.score = 0
+        snake.alive = True
+        self._joined.append([snake.id, snake.name, list(snake.body)])
+        return True
+
+    def _clear_body(self, snake):
+        for cell in snake.body:
+            self.occupied[cell] = 0
+            self.free_cells.release(cell)
+        snake.body.clear()
+        snake.alive = False
+
+    # ---- 模拟 ----
+
+    def step(self):
+        """所有蛇同时前进一格，返回这一步的增量"""
+        self.tick += 1
+        neighbours = self._neighbours
+        occupied = self.occupied
+        free = self.free_cells
+        alive = [snake for snake in self.snakes.values() if snake.alive]
+
+        # 先确定新蛇头，并移除不在生长的蛇的尾部
+        heads = []
+        head_counts = {}
+        for snake in alive:
+            direction = snake.direction = snake.next_direction
+            head = neighbours[direction][snake.body[0]]
+            head_counts[head] = head_counts.get(head, 0) + 1
+            if snake.growing:
+                snake.growing = False
+                heads.append((head, 1))
+            else:
+                tail = snake.body.pop()
+                occupied[tail] = 0
+                free.release(tail)
+                heads.append((head, 0))
+
+        moves = []
+        dying = []
+        for snake, (head, grew) in zip(alive, heads):
+            if head < 0 or occupied[head] or head_counts[head] > 1:
+                dying.append(snake)
+            else:
+                moves.append((snake, head, grew))
+
+        # 先让存活的蛇占住新格子，再移除尸体，尸体的格子这一步就可以放食物
+        for snake, head, grew in moves:
+            occupied[head] = 1
+            free.take(head)
+            snake.body.appendleft(head)
+        dead = []
+        for snake in dying:
+            self._clear_body(snake)
+            dead.append(snake.id)
+
+        food = self.food
+        eaten = []
+        for snake, head, grew in moves:
+            if head in food:
+                snake.growing = True
+                snake.score += 1
+                food.remove(head)
+                eaten.append(head)
+        food_changes = [[cell, self._spawn_food()] for cell in eaten]
+
+        delta = {'op': 'tick', 'n': self.tick}
+        if self._left:
+            delta['l'] = self._left
+            self._left = []
+        if self._joined:
+            delta['j'] = self._joined
+            self._joined = []
+        if moves:
+            delta['m'] = [[snake.id, head, grew] for snake, head, grew in moves]
+        if dead:
+            delta['d'] = dead
+        if food_changes:
+            delta['f'] = food_changes
+        return delta
+
+    def snapshot(self):
+        """完整状态，给新加入的客户端初始化用
+
+        snapshot 之后 step() 增量里的 "j" 可能再次包含已经在快照中的蛇，
+        客户端按 id 覆盖即可。
+        """
+        return {'op': 'snapshot', 'n': self.tick, 'width': self.width, 'height': self.height,
+                'snakes': [[s.id, s.name, list(s.body)] for s in self.snakes.values()
+                           if s.alive],
+                'food': list(self.food)}
+
+
+class RoomMirror:
+    """客户端根据快照和增量维护的房间状态"""
+
+    def __init__(self, snapshot):
+        self.width = snapshot['width']
+        self.height = snapshot['height']
+        self.tick = snapshot['n']
+        self.snakes = {}
+        self.names = {}
+        for player_id, name, body in snapshot['snakes']:
+            self.snakes[player_id] = deque(body)
+            self.names[player_id] = name
+        self.food = list(snapshot['food'])
+
+    def apply(self, delta):
+        """按顺序应用一步的增量"""
+        snakes = self.snakes
+        self.tick = delta['n']
+        for player_id in delta.get('l', ()):
+            snakes.pop(player_id, None)
+            self.names.pop(player_id, None)
+        for player_id, name, body in delta.get('j', ()):
+            snakes[player_id] = deque(body)
+            self.names[player_id] = name
+        for player_id, head, grew in delta.get('m', ()):
+            body = snakes[player_id]
+            body.appendleft(head)
+            if not grew:
+                body.pop()
+        for player_id in delta.get('d', ()):
+            snakes.pop(player_id, None)
+        if 'f' in delta:
+            food = self.food
+            for old, new in delta['f']:
+                food.remove(old)
+                if new >= 0:
+                    food.append(new)
+
+    def occupied(self):
+        """所有蛇身占用的格子"""
+        cells = set()
+        for body in self.snakes.values():
+            cells.update(body)
+        return cells
+
+    def direction_of(self, player_id):
+        """根据蛇头和第二节推算当前方向，蛇不存在时返回 None"""
+        body = self.snakes.get(player_id)
+        if not body:
+            return None
+        if len(body) < 2:
+            return RIGHT
+        offset = body[0] - body[1]
+        if offset == 1:
+            return RIGHT
+        if offset == -1:
+            return LEFT
+        return DOWN if offset > 0 else UP
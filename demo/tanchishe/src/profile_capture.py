@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+按需采集 cProfile / tracemalloc 数据
+
+不需要在线上机器上挂外部工具，通过热键或环境变量 SNAKE_PROFILE 打开：
+- cpu：用 cProfile 采集接下来 N 帧（默认 600 帧，60 FPS 下约 10 秒），
+  结束后写出 .pstats 文件（可以用 python -m pstats 或 snakeviz 查看），
+  并把累计耗时最多的几个函数写进日志
+- alloc：开局和游戏结束时各取一次 tracemalloc 快照，按代码行比较，
+  把内存增长最多的分配位置写成文本报告，用来发现热循环里的临时对象
+  （比如 Snake.move 每步创建的元组、UIManager 每帧创建的 Surface）
+
+SNAKE_PROFILE 的格式为逗号分隔的模式，cpu 后面可以带帧数：
+    SNAKE_PROFILE=cpu          从启动开始采集 600 帧
+    SNAKE_PROFILE=cpu:300      采集 300 帧
+    SNAKE_PROFILE=alloc        每局比较一次分配
+    SNAKE_PROFILE=cpu:300,alloc
+未打开时游戏循环只多一次 None 判断。
+"""
+import io
+import logging
+import os
+import time
+import tracemalloc
+
+logger = logging.getLogger('ProfileCapture')
+
+PROFILE_ENV = 'SNAKE_PROFILE'
+PROFILE_DIR_ENV = 'SNAKE_PROFILE_DIR'
+DEFAULT_PROFILE_DIR = 'logs/profiles'
+DEFAULT_CPU_FRAMES = 600
+
+
+def parse_profile_spec(text):
+    """解析 SNAKE_PROFILE，返回 (cpu 帧数或 None, 是否比较分配)"""
+    cpu_frames = None
+    alloc = False
+    for part in (text or '').split(','):
+        name, _, value = part.strip().lower().partition(':')
+        if not name:
+            continue
+        if name == 'cpu':
+            try:
+                cpu_frames = int(value) if value else DEFAULT_CPU_FRAMES
+            except ValueError:
+                raise ValueError(f'cpu 帧数应为整数: {part}')
+            if cpu_frames <= 0:
+                raise ValueError(f'cpu 帧数应大于 0: {part}')
+        elif name == 'alloc':
+            alloc = True
+        else:
+            raise ValueError(f'未知的采集模式: {part}（可选 cpu[:帧数]、alloc）')
+    return cpu_frames, alloc
+
+
+def output_path(directory, prefix, suffix):
+    """directory 下按时间命名的新文件路径，同一秒内多次采集时加序号"""
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f'{prefix}-{time.strftime("%Y%m%d-%H%M%S")}')
+    path = stem + suffix
+    index = 1
+    while os.path.exists(path):
+        path = f'{stem}-{index}{suffix}'
+        index += 1
+    return path
+
+
+class CpuCapture:
+    """用 cProfile 采集固定帧数"""
+
+    def __init__(self, frames=DEFAULT_CPU_FRAMES, directory=DEFAULT_PROFILE_DIR, top=15):
+        self.frames = frames
+        self.directory = directory
+        self.top = top
+        self.frame_count = 0
+        self.path = None
+        # cProfile 和 pstats 只在采集时才导入，不拖慢游戏启动
+        import cProfile
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        logger.info('开始 CPU 采集，共 %d 帧', frames)
+
+    def frame(self):
+        """每帧调用一次，采满 frames 帧时返回 True"""
+        self.frame_count += 1
+        return self.frame_count > self.frames
+
+    def stop(self):
+        """停止采集并写出 .pstats 文件，返回文件路径"""
+        if self.path is not None:
+            return self.path
+        self._profile.disable()
+        self.path = output_path(self.directory, 'cpu', '.pstats')
+        self._profile.dump_stats(self.path)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('CPU 采集结束（%d 帧），已写入 %s\n%s',
+                        min(self.frame_count, self.frames), self.path, self.summary())
+        return self.path
+
+    def summary(self):
+        """累计耗时最多的 top 个函数（pstats 的文本格式）"""
+        import pstats
+        text = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=text)
+        stats.sort_stats('cumulative').print_stats(self.top)
+        return text.getvalue()
+
+
+def is_ignored(filename):
+    """分配报告中不列出的文件"""
+    return filename == tracemalloc.__file__ or filename.startswith(('<frozen importlib', '<unknown>'))
+
+
+class AllocationTracker:
+    """比较开局和游戏结束时的 tracemalloc 快照"""
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, top=20, frames=1):
+        """frames 为每次分配保存的调用栈深度，1 表示只记分配发生的那一行"""
+        self.directory = directory
+        self.top = top
+        self.path = None
+        self._baseline = None
+        # 由自己打开的 tracemalloc 由自己关闭
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(frames)
+
+    def begin(self):
+        """开局时调用：记录基准快照"""
+        self._baseline = tracemalloc.take_snapshot()
+
+    def end(self):
+        """游戏结束时调用：与基准比较并写出报告，返回报告路径（没有基准时返回 None）"""
+        if self._baseline is None:
+            return None
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline, 'lineno')
+        self._baseline = None
+        lines = self.report_lines(stats)
+        self.path = output_path(self.directory, 'alloc', '.txt')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('本局内存分配变化已写入 %s\n%s', self.path, '\n'.join(lines[:11]))
+        return self.path
+
+    def report_lines(self, stats):
+        """按内存增长排序的前 top 个分配位置"""
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f'当前 {current / 1024:.1f} KiB，峰值 {peak / 1024:.1f} KiB；'
+                 f'增长最多的 {self.top} 个分配位置：']
+        # 不统计 tracemalloc 自身和导入机制的分配；比较之后按文件名直接排除，
+        # 比 Snapshot.filter_traces 的通配符匹配快得多，也不会把匹配本身的分配算进来
+        stats = sorted((stat for stat in stats
+                        if not is_ignored(stat.traceback[0].filename)),
+                       key=lambda stat: stat.size_diff, reverse=True)
+        lines.extend(str(stat) for stat in stats[:self.top])
+        return lines
+
+    def close(self):
+        """关闭由自己打开的 tracemalloc"""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+        self._baseline = None
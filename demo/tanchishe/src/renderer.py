@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+增量（脏矩形）渲染器
+
+游戏进行中只重绘发生变化的格子：新的蛇头、空出来的尾部、
+新旧食物位置以及分数显示区域，然后用 pygame.display.update(rects)
+只提交这些矩形。游戏状态切换、开新局或界面被标记为失效时才整屏重绘。
+背景（含网格线、边框）和格子图块由 BoardLayers 预先渲染，
+整屏重绘是一次背景 blit 加一批图块 blits，擦除格子是从背景拷回对应矩形。
+
+棋盘比窗口大时改用镜头（camera.py）：视野跟随蛇头，每次变化都重画视野，
+只扫描视野内的格子，开销与棋盘大小和蛇的长度无关。
+"""
+from collections import deque
+import pygame
+from src.board_layers import BoardLayers
+from src.camera import Camera
+
+
+class BoardRenderer:
+    """负责把模拟引擎的状态绘制到屏幕上"""
+
+    def __init__(self, settings, engine, ui_manager):
+        """初始化渲染器"""
+        self.settings = settings
+        self.engine = engine
+        self.ui_manager = ui_manager
+
+        # 上一次绘制时的状态，用来计算这一帧有哪些格子变了
+        self._drawn_body = deque()
+        self._drawn_steps = 0
+        self._drawn_food = -1
+        self._drawn_score = None
+        self._drawn_state = None
+        self._hud_rect = None
+        self._needs_full_redraw = True
+        self._layers = None
+        self._layers_key = None
+        self.camera = None
+
+    def invalidate(self):
+        """标记整屏失效，下一帧整屏重绘（比如鼠标悬停改变了按钮外观）
+
+        修改网格线、边框、颜色等外观设置后也要调用，整屏重绘时会按新设置重新生成图层。
+        """
+        self._needs_full_redraw = True
+
+    def render(self, screen, game_state):
+        """绘制一帧
+
+        返回需要提交的矩形列表（可能为空，表示这一帧什么都没变）；
+        返回 None 表示整屏重绘过，应调用 pygame.display.flip()。
+        """
+        if self._needs_full_redraw or game_state.state != self._drawn_state:
+            self._draw_full(screen, game_state)
+            return None
+        if not game_state.is_playing():
+            # 菜单、暂停等界面只在状态切换或失效时才重绘
+            return []
+        return self._draw_changes(screen, game_state)
+
+    def cell_rect(self, cell):
+        """格子对应的屏幕矩形"""
+        grid_size = self.settings.grid_size
+        width = self.engine.width
+        return pygame.Rect((cell % width) * grid_size, (cell // width) * grid_size,
+                           grid_size, grid_size)
+
+    def _layers_key_for(self, screen):
+        """决定图层外观的所有参数，任何一项变化都要重新生成图层"""
+        settings = self.settings
+        return (screen.get_size(), screen.get_bitsize(), self.engine.width, self.engine.height,
+                settings.grid_size, settings.show_grid, settings.border_width,
+                tuple(settings.bg_color), tuple(settings.grid_line_color),
+                tuple(settings.border_color), tuple(settings.snake_color),
+                tuple(settings.food_color))
+
+    def _get_layers(self, screen):
+        """按画面的大小、像素格式和外观设置生成图层（参数不变时复用），棋盘放不下时同时建立镜头"""
+        layers = self._layers
+        key = self._layers_key_for(screen)
+        if layers is None or key != self._layers_key:
+            grid_size = self.settings.grid_size
+            engine = self.engine
+            view_width = screen.get_width() // grid_size
+            view_height = screen.get_height() // grid_size
+            if engine.width <= view_width and engine.height <= view_height:
+                self.camera = None
+                layers = BoardLayers(self.settings, engine.width, engine.height, screen)
+            else:
+                self.camera = Camera(view_width, view_height, engine.width, engine.height)
+                layers = BoardLayers(self.settings, self.camera.view_width,
+                                     self.camera.view_height, screen, viewport=True)
+            self._layers = layers
+            self._layers_key = key
+        return layers
+
+    def _draw_board(self, screen, layers):
+        """画背景、蛇和食物"""
+        engine = self.engine
+        camera = self.camera
+        screen.blit(layers.background, (0, 0))
+        if camera is None:
+            layers.draw_snake(screen, engine.body)
+            if engine.food >= 0:
+                layers.draw_food(screen, engine.food)
+            return
+        camera.follow(engine.head)
+        layers.draw_snake(screen, camera.visible_cells(engine.occupied))
+        food = camera.to_view(engine.food) if engine.food >= 0 else -1
+        if food >= 0:
+            layers.draw_food(screen, food)
+
+    def _draw_full(self, screen, game_state):
+        """整屏重绘，并记录当前状态作为之后增量绘制的基准"""
+        engine = self.engine
+        layers = self._get_layers(screen)
+
+        if game_state.is_menu():
+            screen.fill(self.settings.bg_color)
+        else:
+            self._draw_board(screen, layers)
+
+        if game_state.is_playing():
+            self._hud_rect = self.ui_manager.draw_score(screen, game_state.score)
+        else:
+            self.ui_manager.draw(screen, game_state)
+            self._hud_rect = None
+
+        # 镜头模式每次都重画视野，不需要复制（可能很长的）蛇身
+        self._drawn_body = deque(engine.body) if self.camera is None else deque()
+        self._drawn_steps = engine.steps
+        self._drawn_food = engine.food
+        self._drawn_score = game_state.score
+        self._drawn_state = game_state.state
+        self._needs_full_redraw = False
+
+    def _draw_changes(self, screen, game_state):
+        """游戏进行中只重绘变化的格子，返回脏矩形列表"""
+        engine = self.engine
+        body = engine.body
+        moved = engine.steps - self._drawn_steps
+        if not moved and engine.food == self._drawn_food and \
+                game_state.score == self._drawn_score:
+            return []
+        if self.camera is not None:
+            self._draw_full(screen, game_state)
+            return [screen.get_rect()]
+        if moved < 0 or moved > len(body):
+            self._draw_full(screen, game_state)
+            return [screen.get_rect()]
+
+        # 把这段时间里新增的蛇头按先后顺序补进上一帧的蛇身，
+        # 多出来的尾部就是空出来的格子
+        drawn = self._drawn_body
+        heads = [body[i] for i in range(moved - 1, -1, -1)]
+        drawn.extendleft(heads)
+        vacated = []
+        while len(drawn) > len(body):
+            vacated.append(drawn.pop())
+        if drawn and (drawn[0] != body[0] or drawn[-1] != body[-1]):
+            # 与引擎状态对不上（比如引擎被外部重置），退回整屏重绘
+            self._draw_full(screen, game_state)
+            return [screen.get_rect()]
+
+        food = engine.food
+        if food != self._drawn_food and self._drawn_food >= 0:
+            vacated.append(self._drawn_food)
+
+        layers = self._layers
+        occupied = engine.occupied
+        changed = []
+        for cell in vacated:
+            if not occupied[cell] and cell != food:
+                layers.restore(screen, self.cell_rect(cell))
+                changed.append(cell)
+        layers.draw_snake(screen, heads)
+        changed.extend(heads)
+        if food != self._drawn_food and food >= 0:
+            layers.draw_food(screen, food)
+            changed.append(food)
+
+        rects = [self.cell_rect(cell) for cell in changed]
+
+        # 分数变化，或者有格子画到了分数上面，都要重绘分数区域
+        if game_state.score != self._drawn_score or (
+                self._hud_rect is not None and self._hud_rect.collidelist(rects) >= 0):
+            rects.append(self._redraw_hud(screen, game_state.score))
+
+        self._drawn_steps = engine.steps
+        self._drawn_food = food
+        self._drawn_score = game_state.score
+        return rects
+
+    def _redraw_hud(self, screen, score):
+        """清空分数区域、补画下面的格子，再画分数，返回需要提交的矩形"""
+        old_rect = self._hud_rect
+        if old_rect is not None:
+            self._layers.restore(screen, old_rect)
+            self._redraw_cells_in(screen, old_rect)
+        new_rect = self.ui_manager.draw_score(screen, score)
+        self._hud_rect = new_rect
+        return new_rect.union(old_rect) if old_rect is not None else new_rect
+
+    def _redraw_cells_in(self, screen, rect):
+        """重画与矩形相交的所有格子"""
+        engine = self.engine
+        grid_size = self.settings.grid_size
+        x0 = max(rect.left // grid_size, 0)
+        x1 = min((rect.right - 1) // grid_size, engine.width - 1)
+        y0 = max(rect.top // grid_size, 0)
+        y1 = min((rect.bottom - 1) // grid_size, engine.height - 1)
+        occupied = engine.occupied
+        cells = [y * engine.width + x for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+        self._layers.draw_snake(screen, [cell for cell in cells if occupied[cell]])
+        food = engine.food
+        if food >= 0:
+            food_y, food_x = divmod(food, engine.width)
+            if x0 <= food_x <= x1 and y0 <= food_y <= y1:
+                self._layers.draw_food(screen, food)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+对局录像
+
+SnakeEngine 的食物位置只取决于种子，所以一局游戏可以完全由
+(棋盘参数, 种子, 每次转向发生在第几步) 复现。录像文件格式：
+
+    b'SNKR' 版本号(1 字节)
+    varint: width, height, init_length, seed, ticks, score, 输入个数
+    每个输入一个 varint: (与上一个输入相差的步数 << 2) | 方向
+    CRC32(4 字节，小端，覆盖前面所有内容)
+
+varint 为 LEB128 无符号编码。一般每次转向只占 1~2 个字节。
+"""
+import struct
+import zlib
+
+from src.engine import SnakeEngine
+
+MAGIC = b'SNKR'
+VERSION = 1
+
+
+class ReplayError(ValueError):
+    """录像数据损坏或版本不支持"""
+
+
+def write_varint(out, value):
+    """把非负整数以 LEB128 编码追加到 bytearray"""
+    if value < 0:
+        raise ValueError(f'varint 不能为负数: {value}')
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """从 data[pos:] 读取一个 varint，返回 (值, 新位置)"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError('录像数据被截断')
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """一局游戏的录像"""
+
+    def __init__(self, width, height, init_length, seed, inputs=None, ticks=0, score=0):
+        """inputs 为按步数排序的 (tick, direction) 列表，表示第 tick 步开始前转向"""
+        self.width = width
+        self.height = height
+        self.init_length = init_length
+        self.seed = seed
+        self.inputs = list(inputs or [])
+        self.ticks = ticks
+        self.score = score
+
+    def __eq__(self, other):
+        if not isinstance(other, Replay):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    def __repr__(self):
+        return (f'Replay({self.width}x{self.height}, seed={self.seed}, '
+                f'ticks={self.ticks}, score={self.score}, inputs={len(self.inputs)})')
+
+    def to_bytes(self):
+        """编码为录像文件内容"""
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        for value in (self.width, self.height, self.init_length, self.seed,
+                      self.ticks, self.score, len(self.inputs)):
+            write_varint(out, value)
+        last_tick = 0
+        for tick, direction in self.inputs:
+            write_varint(out, ((tick - last_tick) << 2) | direction)
+            last_tick = tick
+        out += struct.pack('<I', zlib.crc32(out))
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """从录像文件内容解码"""
+        data = bytes(data)
+        if len(data) < len(MAGIC) + 5 or data[:len(MAGIC)] != MAGIC:
+            raise ReplayError('不是录像文件')
+        body, (crc,) = data[:-4], struct.unpack('<I', data[-4:])
+        if zlib.crc32(body) != crc:
+            raise ReplayError('录像校验失败')
+        if body[len(MAGIC)] != VERSION:
+            raise ReplayError(f'不支持的录像版本: {body[len(MAGIC)]}')
+
+        pos = len(MAGIC) + 1
+        header = []
+        for _ in range(7):
+            value, pos = read_varint(body, pos)
+            header.append(value)
+        width, height, init_length, seed, ticks, score, count = header
+        inputs = []
+        tick = 0
+        for _ in range(count):
+            value, pos = read_varint(body, pos)
+            tick += value >> 2
+            inputs.append((tick, value & 3))
+        if pos != len(body):
+            raise ReplayError('录像末尾有多余数据')
+        return cls(width, height, init_length, seed, inputs, ticks, score)
+
+    def save(self, path):
+        """写入文件"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """从文件读取"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """在游戏过程中记录录像"""
+
+    def __init__(self):
+        self.replay = None
+
+    def start(self, engine):
+        """开局时调用，记录棋盘参数和种子"""
+        self.replay = Replay(engine.width, engine.height, engine.init_length, engine.seed)
+
+    def record(self, tick, direction):
+        """记录第 tick 步开始前的一次转向（同一步多次转向只保留最后一次）"""
+        inputs = self.replay.inputs
+        if inputs and inputs[-1][0] == tick:
+            inputs[-1] = (tick, direction)
+        else:
+            inputs.append((tick, direction))
+
+    def finish(self, engine):
+        """结束时调用，返回完整的录像"""
+        replay = self.replay
+        replay.ticks = engine.steps
+        replay.score = engine.score
+        return replay
+
+
+class ReplayPlayer:
+    """按步数依次给出录像中的转向，用于在游戏窗口中回放"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.rewind()
+
+    def rewind(self):
+        """回到录像开头"""
+        self._index = 0
+
+    def action_for(self, tick):
+        """返回第 tick 步的转向，没有转向时返回 None（tick 必须递增调用）"""
+        inputs = self.replay.inputs
+        if self._index < len(inputs) and inputs[self._index][0] == tick:
+            self._index += 1
+            return inputs[self._index - 1][1]
+        return None
+
+    def finished(self, tick):
+        """录像是否已经播放完"""
+        return tick >= self.replay.ticks
+
+
+def record(policy, width=40, height=30, init_length=3, seed=None, max_ticks=100000):
+    """让 policy 玩一局并录像，用于机器人评测
+
+    policy(engine) 返回方向编码或 None（保持方向），
+    在对局结束或达到 max_ticks 步时停止。返回 Replay。
+    """
+    engine = SnakeEngine(width, height, init_length, seed=seed)
+    recorder = ReplayRecorder()
+    recorder.start(engine)
+    while not engine.done and engine.steps < max_ticks:
+        action = policy(engine)
+        if action is not None:
+            recorder.record(engine.steps, action)
+        engine.step(action)
+    return recorder.finish(engine)
+
+
+def simulate(replay, on_step=None):
+    """无界面地以最快速度重放录像，返回最终的引擎
+
+    on_step(engine, events) 在每一步之后调用，可以用来检查中间状态。
+    """
+    engine = SnakeEngine(replay.width, replay.height, replay.init_length, seed=replay.seed)
+    step = engine.step
+    inputs = iter(replay.inputs)
+    next_tick, next_direction = next(inputs, (-1, None))
+    for tick in range(replay.ticks):
+        if tick == next_tick:
+            events, done = step(next_direction)
+            next_tick, next_direction = next(inputs, (-1, None))
+        else:
+            events, done = step()
+        if on_step is not None:
+            on_step(engine, events)
+        if done:
+            break
+    return engine
+
+
+def verify(replay):
+    """重放录像并检查步数和得分是否与录像记录一致"""
+    engine = simulate(replay)
+    return engine.steps == replay.ticks and engine.score == replay.score
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+最高分持久化
+
+- atomic_write_json：先写同目录下的临时文件并 fsync，再用 os.replace 原子替换，
+  写到一半崩溃时旧文件保持完整；替换后的文件保留原文件的权限
+- HighScoreWriter：后台线程负责写盘，游戏线程 submit() 后立即返回；
+  写盘期间多次提交只写最新的一份，退出前 flush
+- load_scores：检查文件内容是否为非负整数列表，损坏的文件改名为 *.corrupt 保留
+"""
+import atexit
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+
+logger = logging.getLogger('ScoreStore')
+
+
+def atomic_write_json(path, data):
+    """把 data 以 JSON 格式原子地写入 path"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.',
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 创建的文件只有所有者可读写：沿用原文件的权限，没有原文件时按 umask 处理
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _target_mode(path):
+    """原文件的权限位；原文件不存在时为新建普通文件的默认权限"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def is_valid_scores(data):
+    """分数列表必须是非负整数组成的列表"""
+    return isinstance(data, list) and all(
+        type(score) is int and score >= 0 for score in data)
+
+
+def load_scores(path):
+    """读取分数列表，文件不存在时返回空列表
+
+    文件损坏（不是合法 JSON 或内容不是非负整数列表）时记录错误，
+    把它改名为 path + '.corrupt' 留作排查，并返回空列表。
+    """
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if not is_valid_scores(data):
+            raise ValueError(f'内容格式不正确: {data!r:.80}')
+        return data
+    except ValueError as e:
+        logger.error('最高分文件已损坏: %s (%s)', path, e)
+        try:
+            os.replace(path, path + '.corrupt')
+        except OSError:
+            pass
+        return []
+
+
+class HighScoreWriter:
+    """在后台线程中写入最高分文件
+
+    写线程在第一次 submit() 时启动，并注册退出时的 close()，
+    保证程序正常退出前最后一次提交已经写入。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writes = 0              # 实际写盘次数
+        self._cond = threading.Condition()
+        self._pending = None         # 等待写入的最新数据
+        self._submitted = 0          # 已提交的版本号
+        self._written = 0            # 已写完的版本号
+        self._thread = None
+        self._closed = False
+
+    def submit(self, scores):
+        """提交一份分数列表，立即返回"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('HighScoreWriter 已关闭')
+            self._pending = list(scores)
+            self._submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='HighScoreWriter',
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """等待已提交的数据全部写完，超时返回 False"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._written >= self._submitted, timeout)
+
+    def close(self, timeout=5.0):
+        """写完剩余数据并停止写线程"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        """写线程：取出最新的数据写盘，中间的提交被合并"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                scores, version = self._pending, self._submitted
+                self._pending = None
+            try:
+                atomic_write_json(self.path, scores)
+                self.writes += 1
+                logger.info('最高分保存成功')
+            except OSError as e:
+                logger.error('保存最高分失败: %s', e)
+            with self._cond:
+                self._written = version
+                self._cond.notify_all()
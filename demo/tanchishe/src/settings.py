@@ -1,4 +1,35 @@
 # 游戏设置和常量配置
+import functools
+import logging
+import os
+
+logger = logging.getLogger('Settings')
+
+AUDIO_BUFFER_DEFAULT = 256
+AUDIO_BUFFER_MIN = 32
+AUDIO_BUFFER_MAX = 8192
+
+
+@functools.lru_cache(maxsize=None)
+def parse_audio_buffer(value):
+    """解析 SNAKE_AUDIO_BUFFER：无效时用默认值，超出范围时截断，并取不大于它的 2 的幂
+
+    每个不同的取值只警告一次（模块导入时会创建多个 Settings）。
+    """
+    if not value:
+        return AUDIO_BUFFER_DEFAULT
+    try:
+        frames = int(value)
+    except ValueError:
+        logger.warning('SNAKE_AUDIO_BUFFER=%r 不是整数，使用默认值 %d', value, AUDIO_BUFFER_DEFAULT)
+        return AUDIO_BUFFER_DEFAULT
+    clamped = min(max(frames, AUDIO_BUFFER_MIN), AUDIO_BUFFER_MAX)
+    clamped = 1 << (clamped.bit_length() - 1)
+    if clamped != frames:
+        logger.warning('SNAKE_AUDIO_BUFFER=%d 应为 %d~%d 之间的 2 的幂，改为 %d',
+                       frames, AUDIO_BUFFER_MIN, AUDIO_BUFFER_MAX, clamped)
+    return clamped
+
 
 class Settings:
     """游戏设置类"""
@@ -7,8 +38,22 @@ class Settings:
         self.screen_width = 800  # 游戏窗口宽度
         self.screen_height = 600  # 游戏窗口高度
         self.grid_size = 20  # 网格大小
+        # 棋盘大小（格子数），默认正好铺满窗口；比窗口大时镜头跟随蛇头
+        self.board_width = self.screen_width // self.grid_size
+        self.board_height = self.screen_height // self.grid_size
         self.fps = 60  # 游戏帧率（控制画面刷新）
         self.snake_speed = 4  # 蛇的移动速度（每秒移动的格子数）
+        self.time_scale = 1.0  # 模拟时间倍率（大于 1 加速，小于 1 放慢）
+        self.max_steps_per_frame = 64  # 每帧最多追赶的模拟步数
+        self.turn_queue_size = 3  # 最多缓存的待生效转向次数
+        self.player_name = os.environ.get('SNAKE_PLAYER', '玩家')  # 排行榜上显示的玩家名
+        self.leaderboard_page_size = 8  # 排行榜每页显示的条数
+        self.idle_delay_min = 10  # 菜单、暂停等界面收到输入后的轮询间隔（毫秒）
+        self.idle_delay_max = 100  # 菜单、暂停等界面长时间无输入时的轮询间隔（毫秒）
+        self.audio_frequency = 44100  # 混音器采样率
+        self.audio_channels = 2  # 混音器声道数（立体声）
+        self.audio_buffer = parse_audio_buffer(os.environ.get('SNAKE_AUDIO_BUFFER'))  # 混音器缓冲区（采样帧），越小延迟越低，声音断续时调大
+        self.sound_cache_dir = os.environ.get('SNAKE_SOUND_CACHE') or None  # 合成音效的磁盘缓存目录，默认只缓存在内存中
 
         # 颜色定义 (RGB)
         self.bg_color = (0, 0, 0)  # 背景色
@@ -16,6 +61,9 @@ class Settings:
         self.snake_color = (0, 255, 0)  # 蛇的颜色
         self.food_color = (255, 0, 0)  # 食物的颜色
         self.border_color = (128, 128, 128)  # 边框颜色
+        self.grid_line_color = (40, 40, 40)  # 棋盘网格线颜色
+        self.show_grid = False  # 是否绘制棋盘网格线
+        self.border_width = 0  # 棋盘边框宽度（像素，0 表示不画边框）
 
         # 方向键定义
         self.UP = 'UP'
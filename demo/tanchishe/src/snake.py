@@ -1,6 +1,50 @@
 # -*- coding: utf-8 -*-
-import pygame
+from collections import deque
+from collections.abc import Sequence
 from src.settings import Settings, SNAKE_INIT_LENGTH
+from src.free_cells import FreeCellIndex
+
+
+class SnakeBody(Sequence):
+    """蛇身视图
+
+    蛇身实际保存在 Snake 内部的 deque 中（蛇头在前），
+    这个视图让 Food.respawn(snake.body) 等调用方可以照常索引、遍历和使用 in，
+    其中 in 查询走占用索引，是 O(1) 的。
+    视图不能增删节数（移动和生长只走 Snake.move），
+    但可以替换单节蛇身（比如测试里直接摆放蛇头），替换时会同步更新占用索引。
+    """
+    __slots__ = ('_snake',)
+
+    def __init__(self, snake):
+        self._snake = snake
+
+    def __len__(self):
+        return len(self._snake._segments)
+
+    def __getitem__(self, index):
+        segments = self._snake._segments
+        if isinstance(index, slice):
+            return list(segments)[index]
+        return segments[index]
+
+    def __setitem__(self, index, position):
+        self._snake._replace_segment(index, position)
+
+    def __iter__(self):
+        return iter(self._snake._segments)
+
+    def __contains__(self, position):
+        return self._snake.contains(position)
+
+    @property
+    def free_cells(self):
+        """蛇身之外的空闲格子索引，供 Food 在 O(1) 时间内生成食物"""
+        return self._snake.free_cells
+
+    def __repr__(self):
+        return f'SnakeBody({list(self._snake._segments)!r})'
+
 
 class Snake:
     def __init__(self):
@@ -11,17 +55,31 @@ class Snake:
         center_x = self.settings.screen_width // 2
         center_y = self.settings.screen_height // 2
         
+        # 占用索引：按网格编号记录每个格子上有几节蛇身，
+        # 自身碰撞和"格子是否被占用"的查询都是 O(1)
+        self.grid_cols = self.settings.screen_width // self.settings.grid_size
+        self.grid_rows = self.settings.screen_height // self.settings.grid_size
+        self.occupancy = bytearray(self.grid_cols * self.grid_rows)
+        # 空闲格子索引：格子上的蛇身数量在 0 和 1 之间变化时同步更新
+        self.free_cells = FreeCellIndex(self.grid_cols * self.grid_rows)
+
         # 根据初始长度创建蛇身
-        self.body = []
+        # 蛇身保存在 deque 中，头部插入和尾部移除都是 O(1)
+        self._segments = deque()
+        self._body_view = SnakeBody(self)
         for i in range(SNAKE_INIT_LENGTH):
             # 初始向左排列，每段之间间隔一个网格
-            self.body.append((center_x - i * self.settings.grid_size, center_y))
+            segment = (center_x - i * self.settings.grid_size, center_y)
+            self._segments.append(segment)
+            self._occupy(segment)
 
         # 初始方向为右
         self.direction = 'RIGHT'
         self.next_direction = self.direction
         self.color = (0, 255, 0)  # 绿色
         self.is_growing = False
+        self._tile = None  # 绘制用的蛇身图块，第一次 draw() 时生成
+        self._tile_color = None
 
     def move(self):
         """移动蛇"""
@@ -29,7 +87,7 @@ class Snake:
         self.direction = self.next_direction
         
         # 获取当前头部位置
-        x, y = self.body[0]
+        x, y = self._segments[0]
         
         # 根据方向移动
         if self.direction == 'RIGHT':
@@ -42,14 +100,63 @@ class Snake:
             y += self.settings.grid_size
         
         # 在头部添加新位置
-        self.body.insert(0, (x, y))
+        self._segments.appendleft((x, y))
+        self._occupy((x, y))
 
         # 移除尾部（除非正在生长）
         if not self.is_growing:
-            self.body.pop()
+            self._vacate(self._segments.pop())
         else:
             self.is_growing = False
 
+    @property
+    def body(self):
+        """蛇身视图（蛇头在前），支持按下标替换单节"""
+        return self._body_view
+
+    def _replace_segment(self, index, position):
+        """替换一节蛇身，并同步更新占用索引"""
+        self._vacate(self._segments[index])
+        self._segments[index] = position
+        self._occupy(position)
+
+    def cell_index(self, position):
+        """把像素坐标转换为网格编号，出界返回 -1"""
+        x, y = position
+        if 0 <= x < self.settings.screen_width and 0 <= y < self.settings.screen_height:
+            return (y // self.settings.grid_size) * self.grid_cols + x // self.settings.grid_size
+        return -1
+
+    def _occupy(self, position):
+        """占用索引中记录一节蛇身"""
+        cell = self.cell_index(position)
+        if cell >= 0:
+            if not self.occupancy[cell]:
+                self.free_cells.take(cell)
+            self.occupancy[cell] += 1
+
+    def _vacate(self, position):
+        """占用索引中移除一节蛇身"""
+        cell = self.cell_index(position)
+        if cell >= 0:
+            self.occupancy[cell] -= 1
+            if not self.occupancy[cell]:
+                self.free_cells.release(cell)
+
+    def is_occupied(self, position):
+        """检查某个位置是否有蛇身（O(1)）"""
+        cell = self.cell_index(position)
+        return cell >= 0 and self.occupancy[cell] > 0
+
+    def contains(self, position):
+        """检查某个坐标是否恰好是一节蛇身"""
+        grid_size = self.settings.grid_size
+        cell = self.cell_index(position)
+        if cell >= 0 and position[0] % grid_size == 0 and position[1] % grid_size == 0:
+            return self.occupancy[cell] > 0
+        # 出界或没有对齐网格的坐标不在占用索引里，退回线性查找
+        return tuple(position) in self._segments
+
     def change_direction(self, new_direction):
         """改变方向"""
         # 防止180度转向
@@ -65,27 +172,27 @@ class Snake:
             self.next_direction = new_direction
 
     def grow(self):
-        """让蛇生长"""
+        """让蛇生长（下一次移动时不移除尾部，占用索引随 move() 更新）"""
         self.is_growing = True
 
     def check_collision(self):
         """检查碰撞"""
-        head = self.body[0]
+        head = self._segments[0]
 
         # 检查是否撞墙
         if (head[0] < 0 or head[0] >= self.settings.screen_width or
             head[1] < 0 or head[1] >= self.settings.screen_height):
             return True
 
-        # 检查是否撞到自己
-        if head in self.body[1:]:
+        # 检查是否撞到自己：蛇头所在格子上还有其他蛇身
+        if self.occupancy[self.cell_index(head)] > 1:
             return True
 
         return False
 
     def get_head_position(self):
         """获取蛇头位置"""
-        return self.body[0]
+        return self._segments[0]
 
     def check_food_collision(self, food):
         """检查是否吃到食物"""
@@ -93,8 +200,12 @@ class Snake:
 
     def draw(self, screen):
         """绘制蛇"""
-        for segment in self.body:
-            pygame.draw.rect(screen, self.color,
-                           (segment[0], segment[1],
-                            self.settings.grid_size - 2,
-                            self.settings.grid_size - 2)) 
\ No newline at end of file
+        # 只在绘制时才导入 pygame，保证无界面的模拟不依赖图形库
+        from src.board_layers import make_tile
+        # 图块只生成一次，所有蛇身格子用一次 blits 提交
+        tile = self._tile
+        if tile is None or self._tile_color != self.color:
+            size = self.settings.grid_size - 2
+            tile = self._tile = make_tile((size, size), self.color, screen)
+            self._tile_color = self.color
+        screen.blits([(tile, segment) for segment in self._segments], False)
\ No newline at end of file
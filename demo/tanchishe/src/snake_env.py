@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+单局贪吃蛇强化学习环境
+
+接口与 Gymnasium 相同（reset(seed) -> (观测, info)，
+step(action) -> (观测, 奖励, terminated, truncated, info)），但不依赖 gymnasium。
+规则直接来自 SnakeEngine（与 Snake / Food / GameState 的规则逐步一致，游戏本身也用它模拟），
+不需要打开窗口或截屏。
+
+观测类型（observation 参数）：
+    'grid'      uint8 (3, 高, 宽)，三个通道依次为蛇身（含蛇头）、蛇头、食物，取值 0/1
+    'features'  float32 (11,)，各项含义见 FeatureObservation
+    'rgb'       uint8 (高 * cell_size, 宽 * cell_size, 3)，颜色与游戏设置相同
+观测写在预先分配好的 NumPy 数组里，每一步只改动变化的格子，返回的始终是同一个数组：
+step() 不分配新的数组，需要保存历史观测时由调用方 copy()。
+
+奖励：reward_fn(env, events) 给出基础奖励（默认吃到食物 +1、撞到 -1），
+shaping 中的每个函数 hook(env, events) 的返回值累加到奖励上（比如 food_distance_shaping）。
+hook 中可以读取 env.engine 和上一步的 env.previous_head、env.previous_food。
+"""
+import numpy as np
+
+from src.engine import SnakeEngine, EVENT_EAT, EVENT_CRASH, UP, RIGHT, DOWN, LEFT
+from src.settings import Settings
+
+ACTION_COUNT = 4  # 动作为方向编码 UP / RIGHT / DOWN / LEFT（与 engine 相同），不允许掉头
+
+
+def default_reward(env, events):
+    """吃到食物 +1，撞墙或撞到自己 -1"""
+    if events & EVENT_CRASH:
+        return -1.0
+    if events & EVENT_EAT:
+        return 1.0
+    return 0.0
+
+
+def food_distance_shaping(scale=0.1):
+    """基于势函数的奖励塑形：每向食物靠近一格加 scale，远离一格减 scale"""
+    def hook(env, events):
+        engine = env.engine
+        if events or engine.food < 0:
+            return 0.0
+        return scale * (_distance(engine, env.previous_head, env.previous_food)
+                        - _distance(engine, engine.head, engine.food))
+    return hook
+
+
+def _distance(engine, a, b):
+    """两个格子之间的曼哈顿距离"""
+    width = engine.width
+    return abs(a % width - b % width) + abs(a // width - b // width)
+
+
+class GridObservation:
+    """三通道占用网格，每步只改动蛇头、蛇尾和食物所在的格子"""
+
+    BODY, HEAD, FOOD = 0, 1, 2
+
+    def __init__(self, engine, settings):
+        self.buffer = np.zeros((3, engine.height, engine.width), dtype=np.uint8)
+        self._flat = self.buffer.reshape(3, -1)
+
+    def reset(self, engine):
+        flat = self._flat
+        flat.fill(0)
+        for cell in engine.body:
+            flat[self.BODY, cell] = 1
+        flat[self.HEAD, engine.head] = 1
+        if engine.food >= 0:
+            flat[self.FOOD, engine.food] = 1
+
+    def update(self, engine, old_head, old_tail, old_food):
+        flat = self._flat
+        if not engine.occupied[old_tail]:
+            flat[self.BODY, old_tail] = 0
+        head = engine.head
+        flat[self.BODY, head] = 1
+        flat[self.HEAD, old_head] = 0
+        flat[self.HEAD, head] = 1
+        if old_food != engine.food:
+            if old_food >= 0:
+                flat[self.FOOD, old_food] = 0
+            if engine.food >= 0:
+                flat[self.FOOD, engine.food] = 1
+
+
+class FeatureObservation:
+    """紧凑特征向量（float32）：
+        0-3   上、右、下、左走一步是否会撞到（墙或蛇身；下一步会空出来的蛇尾不算）
+        4-7   当前方向（独热编码）
+        8-9   食物相对蛇头的 x、y 偏移，除以棋盘宽、高
+        10    蛇身长度占棋盘格子数的比例
+    """
+
+    SIZE = 11
+
+    def __init__(self, engine, settings):
+        self.buffer = np.zeros(self.SIZE, dtype=np.float32)
+
+    def reset(self, engine):
+        self.update(engine, None, None, None)
+
+    def update(self, engine, old_head, old_tail, old_food):
+        buffer = self.buffer
+        head = engine.head
+        occupied = engine.occupied
+        # 不在生长时蛇尾会先移走，走进蛇尾所在的格子是安全的
+        tail = -1 if engine.is_growing else engine.body[-1]
+        neighbours = engine._neighbours
+        for direction in (UP, RIGHT, DOWN, LEFT):
+            cell = neighbours[direction][head]
+            buffer[direction] = cell < 0 or (occupied[cell] and cell != tail)
+            buffer[4 + direction] = direction == engine.direction
+        width = engine.width
+        if engine.food >= 0:
+            buffer[8] = (engine.food % width - head % width) / width
+            buffer[9] = (engine.food // width - head // width) / engine.height
+        else:
+            buffer[8] = buffer[9] = 0.0
+        buffer[10] = len(engine.body) / engine.cell_count
+
+
+class RgbObservation:
+    """与游戏画面配色相同的 RGB 图像，每个格子 cell_size x cell_size 像素"""
+
+    def __init__(self, engine, settings, cell_size=4):
+        self.width = engine.width
+        self.buffer = np.zeros((engine.height * cell_size, engine.width * cell_size, 3), dtype=np.uint8)
+        # (行, 格内行, 列, 格内列, 颜色) 视图：给一个格子上色是一次切片赋值
+        self._cells = self.buffer.reshape(engine.height, cell_size, engine.width, cell_size, 3)
+        self._background = np.array(settings.bg_color, dtype=np.uint8)
+        self._snake = np.array(settings.snake_color, dtype=np.uint8)
+        self._food = np.array(settings.food_color, dtype=np.uint8)
+
+    def _paint(self, cell, color):
+        y, x = divmod(cell, self.width)
+        self._cells[y, :, x, :] = color
+
+    def reset(self, engine):
+        self.buffer[:] = self._background
+        for cell in engine.body:
+            self._paint(cell, self._snake)
+        if engine.food >= 0:
+            self._paint(engine.food, self._food)
+
+    def update(self, engine, old_head, old_tail, old_food):
+        if not engine.occupied[old_tail]:
+            self._paint(old_tail, self._background)
+        self._paint(engine.head, self._snake)
+        if old_food != engine.food and engine.food >= 0:
+            self._paint(engine.food, self._food)
+
+
+OBSERVATIONS = {
+    'grid': GridObservation,
+    'features': FeatureObservation,
+    'rgb': RgbObservation,
+}
+
+
+class SnakeEnv:
+    """单局贪吃蛇环境（Gymnasium 风格接口）"""
+
+    def __init__(self, width=20, height=20, init_length=3, observation='grid',
+                 reward_fn=default_reward, shaping=(), max_steps=None, cell_size=4):
+        """max_steps 不为 None 时，一局超过这么多步就截断（truncated）；
+        cell_size 只用于 'rgb' 观测"""
+        if observation not in OBSERVATIONS:
+            raise ValueError(f'未知的观测类型: {observation}（可选 {", ".join(OBSERVATIONS)}）')
+        self.engine = SnakeEngine(width, height, init_length, seed=0)
+        self.observation_type = observation
+        settings = Settings()
+        if observation == 'rgb':
+            self._observer = RgbObservation(self.engine, settings, cell_size)
+        else:
+            self._observer = OBSERVATIONS[observation](self.engine, settings)
+        self._observer.reset(self.engine)
+        self.observation = self._observer.buffer
+        self.reward_fn = reward_fn
+        self.shaping = list(shaping)
+        self.max_steps = max_steps
+        self.previous_head = self.previous_food = -1
+        # info 每步原地更新后返回同一个字典
+        self._info = {'score': 0, 'length': 0, 'steps': 0, 'events': 0, 'seed': None}
+
+    @property
+    def observation_shape(self):
+        return self.observation.shape
+
+    @property
+    def observation_dtype(self):
+        return self.observation.dtype
+
+    @property
+    def action_count(self):
+        return ACTION_COUNT
+
+    def reset(self, seed=None):
+        """开始新的一局，返回 (观测, info)"""
+        self.engine.reset(seed)
+        self._observer.reset(self.engine)
+        return self.observation, self._update_info(0)
+
+    def step(self, action):
+        """推进一步，返回 (观测, 奖励, terminated, truncated, info)"""
+        engine = self.engine
+        if engine.done:
+            raise RuntimeError('对局已结束，请先调用 reset()')
+        self.previous_head = head = engine.body[0]
+        tail = engine.body[-1]
+        self.previous_food = food = engine.food
+        events, done = engine.step(action)
+        self._observer.update(engine, head, tail, food)
+
+        reward = self.reward_fn(self, events)
+        for hook in self.shaping:
+            reward += hook(self, events)
+        truncated = (not done and self.max_steps is not None and engine.steps >= self.max_steps)
+        return self.observation, reward, done, truncated, self._update_info(events)
+
+    def _update_info(self, events):
+        info = self._info
+        engine = self.engine
+        info['score'] = engine.score
+        info['length'] = len(engine.body)
+        info['steps'] = engine.steps
+        info['events'] = events
+        info['seed'] = engine.seed
+        return info
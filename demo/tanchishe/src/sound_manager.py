@@ -1,25 +1,123 @@
 import os
+import logging
+import threading
 import pygame
+from src.voice_pool import VoicePool, MUSIC_CHANNEL, channel_count
+
+# 日志由程序入口通过 log_config.setup_logging() 配置
+logger = logging.getLogger('SoundManager')
+
+EAT_VARIANTS = 8      # 吃食物音效的变体数，每一级比上一级高一个半音
+EAT_LEVEL_SCORE = 5   # 每得这么多分，吃食物音效升高一级
+
+# 要合成的音效和各自的变体数（build_assets.py 按同一张表预先合成到资源包）
+SOUND_VARIANTS = {
+    'move': 1,
+    'eat': EAT_VARIANTS,
+    'crash': 1,
+    'menu_select': 1,
+    'background': 1,
+}
+
 
 class SoundManager:
-    """音效管理器"""
-    def __init__(self):
+    """音效管理器
+
+    background 为 True 时构造函数不碰音频设备，由 load_async() 在后台线程中
+    初始化混音器并解码音效，游戏可以先显示第一帧；加载完成前播放音效是空操作，
+    请求播放的背景音乐在加载完成后自动开始。
+
+    音效和背景音乐由 synth.py 在内存中合成（cache_dir 不为 None 时合成结果同时缓存到该目录；
+    bundle 为资源包时优先使用其中预先合成的 PCM），NumPy 不可用时退回读取 assets/sounds 下的 WAV 文件。
+
+    混音器按 frequency、channels、buffer 初始化，buffer 越小延迟越低（256 帧在 44.1 kHz 下约 6 ms）。
+    音效声道按类别预留，由 VoicePool 做限速和按优先级抢占（见 voice_pool.py）。
+    """
+    def __init__(self, background=False, cache_dir=None, frequency=44100, buffer=256, channels=2,
+                 bundle=None):
         """初始化音效管理器"""
-        pygame.mixer.init()
+        self.cache_dir = cache_dir
+        self.bundle = bundle
+        self.sound_cache = None
+        self.mixer_args = {'frequency': frequency, 'size': -16, 'channels': channels, 'buffer': buffer}
+        self.voices = None
         self.sounds = {}
-        self.background_music = None
-        self.load_sounds()
+        self.eat_variants = []   # 按分数升调的吃食物音效
+        self.background_music = None   # 退回读取文件时背景音乐的路径
+        self._music_sound = None        # 合成的背景音乐，在保留的声道上循环播放
+        self._music_channel = None
         self.music_playing = False
         self.sound_enabled = True
         self.music_enabled = True
-        
-        # 设置音效音量
-        pygame.mixer.set_num_channels(8)  # 设置混音通道数
-        
+        self.ready = threading.Event()
+        # 背景音乐的状态会被加载线程和主线程同时修改
+        self._music_lock = threading.Lock()
+        self._loader = None
+        if not background:
+            self.load()
+
+    def load(self):
+        """初始化混音器并加载所有音效（可以在后台线程中调用）"""
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(**self.mixer_args)
+            self._setup_channels()
+            try:
+                self.synthesize_sounds()
+            except ImportError as e:
+                logger.info('无法合成音效（%s），改为读取 WAV 文件', e)
+                self.load_sounds()
+        except pygame.error as e:
+            # 没有音频设备时照常游戏，只是没有声音
+            logger.warning('初始化音频失败，关闭声音: %s', e)
+            self.background_music = None
+        # 在锁内标记就绪：否则 play_background_music 可能在 set() 之后、取得锁之前
+        # 看到就绪并开始播放，这里又播放一次
+        with self._music_lock:
+            self.ready.set()
+            if self.music_playing:
+                # 加载期间已经请求播放背景音乐
+                self._start_music()
+
+    def load_async(self):
+        """在后台线程中加载，返回加载线程"""
+        if self._loader is None and not self.ready.is_set():
+            self._loader = threading.Thread(target=self.load, name='SoundLoader', daemon=True)
+            self._loader.start()
+        return self._loader
+
+    def wait_ready(self, timeout=None):
+        """等待加载完成，返回是否已完成"""
+        return self.ready.wait(timeout)
+
+    def _setup_channels(self):
+        """按类别预留声道：0 号给背景音乐，其余由 VoicePool 分配"""
+        count = channel_count()
+        pygame.mixer.set_num_channels(count)
+        # 全部预留，Sound.play() 的自动分配不会占用这些声道
+        pygame.mixer.set_reserved(count)
+        self._music_channel = pygame.mixer.Channel(MUSIC_CHANNEL)
+        self.voices = VoicePool(pygame.mixer.Channel)
+
+    def synthesize_sounds(self):
+        """按混音器的采样率和声道数合成所有音效，不读写任何文件（除非指定了 cache_dir 或 bundle）"""
+        from pygame.sndarray import make_sound
+        from src.synth import SoundCache, EFFECTS, semitones
+        rate, _, channels = pygame.mixer.get_init()
+        self.sound_cache = cache = SoundCache(self.cache_dir, self.bundle)
+        variants = {}
+        for name, count in SOUND_VARIANTS.items():
+            # 同一音效的所有变体一次合成
+            samples = cache.samples(EFFECTS[name], rate, channels, semitones(count))
+            variants[name] = [make_sound(variant) for variant in samples]
+        self.eat_variants = variants['eat']
+        self._music_sound = variants.pop('background')[0]
+        self.sounds = {name: sounds[0] for name, sounds in variants.items()}
+
     def load_sounds(self):
-        """加载所有音效"""
+        """从 WAV 文件加载所有音效"""
         sound_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'sounds')
-        
+
         # 加载音效
         sound_files = {
             'move': 'move.wav',
@@ -27,45 +125,73 @@ class SoundManager:
             'crash': 'crash.wav',
             'menu_select': 'menu_select.wav'
         }
-        
+
+        # 全部解码完再一次性替换，另一个线程不会看到加载了一半的字典
+        sounds = {}
         for sound_name, filename in sound_files.items():
             filepath = os.path.join(sound_dir, filename)
             if os.path.exists(filepath):
-                self.sounds[sound_name] = pygame.mixer.Sound(filepath)
-        
+                sounds[sound_name] = pygame.mixer.Sound(filepath)
+        self.sounds = sounds
+
         # 加载背景音乐
         background_path = os.path.join(sound_dir, 'background.wav')
         if os.path.exists(background_path):
             self.background_music = background_path
-        
+
     def play_sound(self, sound_name):
         """播放指定音效"""
         if not self.sound_enabled:
             return
-            
-        if sound_name in self.sounds:
-            self.sounds[sound_name].play()
-    
+
+        sound = self.sounds.get(sound_name)
+        if sound is not None:
+            self._play(sound_name, sound)
+
+    def _play(self, sound_name, sound):
+        if self.voices is not None:
+            self.voices.play(sound_name, sound)
+        else:
+            sound.play()
+
     def play_background_music(self):
-        """播放背景音乐"""
-        if not self.music_enabled or not self.background_music:
+        """播放背景音乐（还在加载时记下请求，加载完成后开始播放）"""
+        if not self.music_enabled:
+            return
+        with self._music_lock:
+            if self.ready.is_set():
+                self._start_music()
+            else:
+                self.music_playing = True
+
+    def _start_music(self):
+        if self._music_sound is not None and self._music_channel is not None:
+            self._music_channel.play(self._music_sound, loops=-1)
+            self.music_playing = True
+            return
+        if not self.background_music:
+            self.music_playing = False
             return
-            
         pygame.mixer.music.load(self.background_music)
         pygame.mixer.music.play(-1)  # -1表示循环播放
         self.music_playing = True
-    
+
     def stop_background_music(self):
         """停止背景音乐"""
-        if self.music_playing:
-            pygame.mixer.music.stop()
-            self.music_playing = False
-    
+        with self._music_lock:
+            if self.music_playing:
+                if self.ready.is_set() and pygame.mixer.get_init():
+                    if self._music_channel is not None:
+                        self._music_channel.stop()
+                    else:
+                        pygame.mixer.music.stop()
+                self.music_playing = False
+
     def toggle_sound(self):
         """切换音效开关"""
         self.sound_enabled = not self.sound_enabled
         return self.sound_enabled
-    
+
     def toggle_music(self):
         """切换音乐开关"""
         self.music_enabled = not self.music_enabled
@@ -79,9 +205,13 @@ class SoundManager:
         """播放移动音效"""
         self.play_sound('move')
 
-    def play_eat_sound(self):
-        """播放吃食物音效"""
-        self.play_sound('eat')
+    def play_eat_sound(self, score=0):
+        """播放吃食物音效，分数越高音调越高"""
+        variants = self.eat_variants
+        if variants and self.sound_enabled:
+            self._play('eat', variants[min(score // EAT_LEVEL_SCORE, len(variants) - 1)])
+        else:
+            self.play_sound('eat')
 
     def play_crash_sound(self):
         """播放碰撞音效"""
@@ -89,4 +219,4 @@ class SoundManager:
 
     def play_menu_select_sound(self):
         """播放菜单选择音效"""
-        self.play_sound('menu_select') 
\ No newline at end of file
+        self.play_sound('menu_select')
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时统计
+
+main.py 最先导入这个模块，导入时刻作为起点；启动过程中在各个阶段结束时调用
+startup.mark(名称)，第一帧提交到屏幕后输出每个阶段的耗时和到第一帧的总耗时，
+方便跟踪冷启动时间。解释器自身的启动不在统计范围内
+（需要时可以用 benchmarks/bench_suite.py 的 startup 项测量整个进程）。
+"""
+import logging
+import time
+
+logger = logging.getLogger('Startup')
+
+
+class StartupTimer:
+    """按顺序记录启动阶段的完成时刻"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = clock()
+        self.marks = []
+
+    def mark(self, name):
+        """记录一个阶段在此刻完成"""
+        self.marks.append((name, self.clock()))
+
+    def elapsed(self):
+        """从起点到最后一个阶段的总耗时（秒）"""
+        return self.marks[-1][1] - self.origin if self.marks else 0.0
+
+    def report_lines(self):
+        """每个阶段一行：阶段耗时和累计耗时（毫秒）"""
+        lines = []
+        previous = self.origin
+        for name, moment in self.marks:
+            lines.append(f'{name:<12}{(moment - previous) * 1000:8.1f} ms'
+                         f'{(moment - self.origin) * 1000:10.1f} ms')
+            previous = moment
+        return lines
+
+    def report(self, stream=None):
+        """写日志（INFO）；stream 不为 None 时同时输出到该流"""
+        lines = self.report_lines()
+        if stream is not None:
+            stream.write('启动耗时（阶段 / 累计）：\n' + '\n'.join(lines) + '\n')
+        logger.info('到第一帧共 %.1f ms\n%s', self.elapsed() * 1000, '\n'.join(lines))
+
+
+# 整个进程共用一个计时器，起点是 main.py 开始导入的时刻
+startup = StartupTimer()
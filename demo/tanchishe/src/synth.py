@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+程序化音效合成
+
+音效由一组参数描述（见 EFFECTS），直接在内存中用 NumPy 合成 16 位采样，
+再由 pygame.sndarray.make_sound 变成 pygame.mixer.Sound，运行时不读写 WAV 文件，也不依赖 scipy。
+同一种音效的多个变体（比如随分数升调的吃食物音效）作为一批一起合成：
+变体的音高是一个列向量，与时间轴广播后一次算出所有变体的波形。
+
+合成结果按参数的哈希缓存（SoundCache）：内存中总是缓存；指定目录时同时把 .npy
+写到以哈希命名的文件里，参数不变就直接读取，参数一改哈希随之改变，不会用到旧结果。
+指定资源包（asset_bundle.AssetBundle）时先在包里按同样的哈希查找预先合成的结果，
+找到时直接包装映射内存，不复制也不合成。
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from src.asset_bundle import PCM_PREFIX
+
+logger = logging.getLogger('Synth')
+
+# 合成算法改动时加一，让旧的磁盘缓存全部失效
+SYNTH_VERSION = 1
+SAMPLE_RATE = 44100
+
+# 每个音效的合成参数：
+#   freqs     叠加的正弦波频率（Hz），乘以变体的音高倍数
+#   duration  时长（秒）
+#   decay     指数衰减系数，0 表示不衰减
+#   sweep     频率按 exp(-sweep * t) 下滑（扫频），0 表示不扫频
+#   noise     与随机噪声相乘（seed 固定，结果可复现）
+#   mod       振幅调制频率（Hz），0 表示不调制
+#   gain      音量系数
+#   normalize 是否把峰值拉满
+EFFECTS = {
+    'move': {'freqs': (440,), 'duration': 0.1, 'decay': 10, 'normalize': False},
+    'eat': {'freqs': (880, 1320), 'duration': 0.15, 'decay': 15},
+    'crash': {'freqs': (220,), 'duration': 0.2, 'decay': 10, 'noise': True, 'seed': 7},
+    'menu_select': {'freqs': (1500,), 'duration': 0.08, 'decay': 20, 'sweep': 20},
+    'background': {'freqs': (220, 277.18, 329.63), 'duration': 5.0, 'mod': 0.5, 'gain': 0.3},
+}
+
+
+def semitones(count, step=1):
+    """从原调开始、每个变体升高 step 个半音的音高倍数"""
+    return tuple(2 ** (i * step / 12) for i in range(count))
+
+
+def render(spec, sample_rate=SAMPLE_RATE, pitches=(1.0,)):
+    """合成一批变体，返回形状为 (变体数, 采样数) 的 float32 波形，取值在 [-1, 1]
+
+    全程使用 float32：NumPy 的 float32 sin 走 SIMD，比 float64 快一个数量级，
+    5 秒的背景音乐相位误差也在 1e-3 弧度以内，听不出差别。
+    """
+    count = int(sample_rate * spec['duration'])
+    t = np.arange(count, dtype=np.float32) / np.float32(sample_rate)    # (n,)
+    pitch = np.asarray(pitches, dtype=np.float32)[:, None, None]        # (v, 1, 1)
+    freqs = np.asarray(spec['freqs'], dtype=np.float32)[None, :, None]  # (1, f, 1)
+    frequency = pitch * freqs                                           # (v, f, 1)
+    if spec.get('sweep'):
+        frequency = frequency * np.exp(np.float32(-spec['sweep']) * t)  # (v, f, n)
+    wave = np.sin(np.float32(2 * np.pi) * frequency * t).sum(axis=1)    # (v, n)
+
+    # 与变体无关的包络只算一次，再广播到所有变体
+    envelope = np.full(count, spec.get('gain', 1.0), dtype=np.float32)
+    if spec.get('noise'):
+        envelope *= np.random.default_rng(spec.get('seed', 0)).random(count, dtype=np.float32)
+    if spec.get('decay'):
+        envelope *= np.exp(np.float32(-spec['decay']) * t)
+    if spec.get('mod'):
+        envelope *= 0.5 + 0.5 * np.sin(np.float32(2 * np.pi * spec['mod']) * t)
+    wave *= envelope
+
+    if spec.get('normalize', True):
+        peak = np.abs(wave).max(axis=1, keepdims=True)
+        wave /= np.where(peak > 0, peak, np.float32(1.0))
+    return wave
+
+
+def to_samples(wave, channels=2):
+    """float 波形 -> int16 采样，形状为 (变体数, 采样数, 声道数)，声道数为 1 时没有最后一维"""
+    samples = (np.clip(wave, -1.0, 1.0) * 32767).astype(np.int16)
+    if channels == 1:
+        return samples
+    return np.ascontiguousarray(np.repeat(samples[:, :, None], channels, axis=2))
+
+
+def cache_key(spec, sample_rate, channels, pitches):
+    """参数的内容哈希，用作缓存键和磁盘缓存的文件名"""
+    payload = json.dumps({'version': SYNTH_VERSION, 'spec': spec, 'rate': sample_rate,
+                          'channels': channels, 'pitches': [round(p, 9) for p in pitches]},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class SoundCache:
+    """按参数哈希缓存的合成结果"""
+
+    def __init__(self, directory=None, bundle=None):
+        """directory 不为 None 时同时缓存到该目录（每个结果一个 .npy 文件）；
+        bundle 不为 None 时优先使用资源包中预先合成的结果"""
+        self.directory = directory
+        self.bundle = bundle
+        self._memory = {}
+        self.hits = 0
+        self.bundle_hits = 0
+        self.disk_hits = 0
+        self.renders = 0
+
+    def samples(self, spec, sample_rate=SAMPLE_RATE, channels=2, pitches=(1.0,)):
+        """返回 int16 采样（见 to_samples），优先使用缓存"""
+        key = cache_key(spec, sample_rate, channels, pitches)
+        samples = self._memory.get(key)
+        if samples is not None:
+            self.hits += 1
+            return samples
+        samples = self._from_bundle(key)
+        if samples is not None:
+            self.bundle_hits += 1
+        else:
+            samples = self._load(key)
+            if samples is not None:
+                self.disk_hits += 1
+            else:
+                samples = to_samples(render(spec, sample_rate, pitches), channels)
+                self.renders += 1
+                self._save(key, samples)
+        self._memory[key] = samples
+        return samples
+
+    def _from_bundle(self, key):
+        name = PCM_PREFIX + key
+        if self.bundle is None or name not in self.bundle:
+            return None
+        # 只读数组，直接指向资源包的映射内存
+        shape = self.bundle.meta(name)['shape']
+        return np.frombuffer(self.bundle.get(name), dtype='<i2').reshape(shape)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npy')
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            return np.load(self._path(key), allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            # 文件损坏时重新合成并覆盖
+            logger.warning('音效缓存读取失败，重新合成: %s', e)
+            return None
+
+    def _save(self, key, samples):
+        if self.directory is None:
+            return
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # 先写临时文件再原子替换，不会留下写了一半的缓存
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, samples, allow_pickle=False)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning('音效缓存写入失败: %s', e)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
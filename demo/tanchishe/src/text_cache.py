@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+文字渲染缓存
+
+中文字体文件很大，font.render() 每次都要重新光栅化整串文字。
+菜单、按钮上的文字几乎不变，把渲染好的 Surface 按
+(字体, 文字, 抗锯齿, 颜色) 缓存起来，命中时直接复用。
+"""
+from collections import OrderedDict
+
+
+class TextCache:
+    """有容量上限的 LRU 文字 Surface 缓存"""
+
+    def __init__(self, max_entries=128):
+        """max_entries 为最多缓存的 Surface 数量，0 表示不缓存"""
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """与 font.render(text, antialias, color) 相同，但会复用缓存的结果"""
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if self.max_entries > 0:
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存（比如更换字体后）"""
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def stats(self):
+        """返回命中统计"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
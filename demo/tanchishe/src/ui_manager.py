@@ -3,22 +3,26 @@ import pygame
 import os
 from game_state import GameState
 from settings import Settings
+from text_cache import TextCache
+from leaderboard import HighScorePager
+from asset_bundle import FONT_ASSET
+import sqlite3
 import logging
 
-# 配置日志
-logging.basicConfig(level=logging.DEBUG,
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# 日志由程序入口通过 log_config.setup_logging() 配置
 logger = logging.getLogger('UI_Manager')
 
 class Button:
     """按钮类"""
-    def __init__(self, x, y, width, height, text, font, color=(255, 255, 255)):
+    def __init__(self, x, y, width, height, text, font, color=(255, 255, 255), text_cache=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.font = font
         self.color = color
         self.is_hovered = False
-        logger.debug(f'创建按钮: {text}, 位置: ({x}, {y}), 大小: {width}x{height}')
+        # 文字缓存，未提供时每次都直接渲染
+        self.text_cache = text_cache
+        logger.debug('创建按钮: %s, 位置: (%d, %d), 大小: %dx%d', text, x, y, width, height)
         
     def draw(self, screen):
         """绘制按钮"""
@@ -28,8 +32,11 @@ class Button:
                 min(self.color[2] + 50, 255)) if self.is_hovered else self.color
         pygame.draw.rect(screen, color, self.rect, 2)
         
-        # 绘制按钮文本
-        text_surface = self.font.render(self.text, True, color)
+        # 绘制按钮文本（普通和悬停两种颜色各缓存一份）
+        if self.text_cache is not None:
+            text_surface = self.text_cache.render(self.font, self.text, True, color)
+        else:
+            text_surface = self.font.render(self.text, True, color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
         
@@ -38,10 +45,82 @@ class Button:
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = event.pos
             clicked = self.rect.collidepoint(mouse_pos)
-            logger.debug(f'按钮 "{self.text}" 处理点击事件, 位置: {mouse_pos}, 在按钮区域内: {clicked}')
+            logger.debug('按钮 "%s" 处理点击事件, 位置: %s, 在按钮区域内: %s', self.text, mouse_pos, clicked)
             return clicked
         return False
 
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                         'assets', 'fonts', 'WenQuanYiMicroHei.ttf')
+
+
+def load_font(size):
+    """加载指定大小的中文字体，自带字体加载失败时依次尝试系统字体"""
+    try:
+        font = pygame.font.Font(FONT_PATH, size)
+        print(f"成功加载字体: {FONT_PATH}")
+        return font
+    except Exception as e:
+        print(f"加载自定义字体失败: {e}")
+        print("使用系统默认字体")
+    # 尝试使用系统字体
+    try:
+        if os.name == 'posix':  # macOS 和 Linux
+            return pygame.font.SysFont('PingFang SC', size)
+        elif os.name == 'nt':  # Windows
+            return pygame.font.SysFont('Microsoft YaHei', size)
+        return pygame.font.SysFont('Arial', size)
+    except Exception as e:
+        print(f"加载系统字体也失败: {e}")
+        return pygame.font.SysFont('Arial', size)
+
+
+def bundle_font_loader(bundle):
+    """返回从资源包加载子集字体的 loader，以及子集包含的字符"""
+    def load(size):
+        return pygame.font.Font(bundle.open(FONT_ASSET), size)
+    return load, frozenset(bundle.meta(FONT_ASSET)['chars'])
+
+
+class LazyFont:
+    """第一次使用时才加载的字体
+
+    用法与 pygame.font.Font 相同（render、size、get_height 等都转给真正的字体）。
+    对象本身在加载前后不变，TextCache 以它为键缓存的文字始终有效。
+    charset 不为 None 时 loader 加载的是只含这些字符的子集字体，
+    要渲染的文字含有其他字符（比如玩家名）时改用 fallback 加载的完整字体。
+    """
+    def __init__(self, size, loader=load_font, charset=None, fallback=load_font):
+        self.size_pt = size
+        self._loader = loader
+        self._font = None
+        self._charset = charset
+        self._fallback_loader = fallback
+        self._fallback = None
+
+    @property
+    def loaded(self):
+        return self._font is not None
+
+    def get(self):
+        """返回真正的字体，第一次调用时加载"""
+        if self._font is None:
+            self._font = self._loader(self.size_pt)
+        return self._font
+
+    def render(self, text, *args):
+        if self._charset is not None and not self._charset.issuperset(text):
+            if self._fallback is None:
+                self._fallback = self._fallback_loader(self.size_pt)
+            return self._fallback.render(text, *args)
+        return self.get().render(text, *args)
+
+    def __getattr__(self, name):
+        # 其余属性和方法（size、get_height、metrics ...）
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+
 class UIManager:
     """UI管理器"""
     def __init__(self, game):
@@ -49,51 +128,51 @@ class UIManager:
         self.game = game
         self.settings = game.settings
         
-        # 加载自定义字体
-        font_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                'assets', 'fonts', 'WenQuanYiMicroHei.ttf')
-        try:
-            self.font = pygame.font.Font(font_path, 48)
-            self.small_font = pygame.font.Font(font_path, 24)
-            print(f"成功加载字体: {font_path}")
-        except Exception as e:
-            print(f"加载自定义字体失败: {e}")
-            print("使用系统默认字体")
-            # 尝试使用系统字体
-            try:
-                if os.name == 'posix':  # macOS 和 Linux
-                    self.font = pygame.font.SysFont('PingFang SC', 48)
-                    self.small_font = pygame.font.SysFont('PingFang SC', 24)
-                elif os.name == 'nt':  # Windows
-                    self.font = pygame.font.SysFont('Microsoft YaHei', 48)
-                    self.small_font = pygame.font.SysFont('Microsoft YaHei', 24)
-                else:
-                    self.font = pygame.font.SysFont('Arial', 48)
-                    self.small_font = pygame.font.SysFont('Arial', 24)
-            except Exception as e:
-                print(f"加载系统字体也失败: {e}")
-                self.font = pygame.font.SysFont('Arial', 48)
-                self.small_font = pygame.font.SysFont('Arial', 24)
-        
+        # 字体在第一次渲染文字时才加载：第一帧只用到大号字体，
+        # 小号字体等到显示分数或排行榜时再加载
+        # 有资源包时从包里加载子集字体
+        bundle = getattr(game, 'asset_bundle', None)
+        if bundle is not None and FONT_ASSET in bundle:
+            loader, charset = bundle_font_loader(bundle)
+            self.font = LazyFont(48, loader, charset)
+            self.small_font = LazyFont(24, loader, charset)
+        else:
+            self.font = LazyFont(48)
+            self.small_font = LazyFont(24)
+
+        # 文字渲染缓存：菜单、按钮的文字只在第一次绘制时光栅化
+        self.text_cache = TextCache()
+        # 分数只在变化时重新渲染，单独缓存，避免挤掉菜单文字
+        self._score_surface = None
+        self._score_value = None
+
+        cache = self.text_cache
         self.buttons = {
             'menu': {
-                'start': Button(300, 200, 200, 50, '开始游戏', self.font),
-                'high_scores': Button(300, 270, 200, 50, '最高分', self.font),
-                'quit': Button(300, 340, 200, 50, '退出', self.font)
+                'start': Button(300, 200, 200, 50, '开始游戏', self.font, text_cache=cache),
+                'high_scores': Button(300, 270, 200, 50, '最高分', self.font, text_cache=cache),
+                'quit': Button(300, 340, 200, 50, '退出', self.font, text_cache=cache)
             },
             'pause': {
-                'resume': Button(300, 200, 200, 50, '继续', self.font),
-                'restart': Button(300, 270, 200, 50, '重新开始', self.font),
-                'quit_to_menu': Button(300, 340, 200, 50, '返回主菜单', self.font)
+                'resume': Button(300, 200, 200, 50, '继续', self.font, text_cache=cache),
+                'restart': Button(300, 270, 200, 50, '重新开始', self.font, text_cache=cache),
+                'quit_to_menu': Button(300, 340, 200, 50, '返回主菜单', self.font, text_cache=cache)
             },
             'game_over': {
-                'restart': Button(300, 270, 200, 50, '重新开始', self.font),
-                'quit_to_menu': Button(300, 340, 200, 50, '返回主菜单', self.font)
+                'restart': Button(300, 270, 200, 50, '重新开始', self.font, text_cache=cache),
+                'quit_to_menu': Button(300, 340, 200, 50, '返回主菜单', self.font, text_cache=cache)
             },
             'high_scores': {
-                'back': Button(300, 400, 200, 50, '返回', self.font)
+                'prev_page': Button(80, 400, 200, 50, '上一页', self.font, text_cache=cache),
+                'back': Button(300, 400, 200, 50, '返回', self.font, text_cache=cache),
+                'next_page': Button(520, 400, 200, 50, '下一页', self.font, text_cache=cache)
             }
         }
+        # 排行榜分页浏览器，第一次显示排行榜时创建
+        self.score_pager = None
+        # 当前没有画出来的翻页按钮，不响应悬停和点击（由 _draw_high_scores 更新）
+        self._hidden_buttons = {self.buttons['high_scores']['prev_page'],
+                                self.buttons['high_scores']['next_page']}
         
     def draw(self, screen, game_state):
         """绘制UI"""
@@ -101,18 +180,18 @@ class UIManager:
             self._draw_menu(screen)
         elif game_state.is_paused():
             self._draw_pause_menu(screen)
-            self._draw_score(screen, game_state.score)
+            self.draw_score(screen, game_state.score)
         elif game_state.is_game_over():
             self._draw_game_over(screen, game_state.score)
         elif game_state.is_high_scores():
-            self._draw_high_scores(screen, game_state.get_high_scores())
+            self._draw_high_scores(screen, game_state)
         elif game_state.is_playing():
-            self._draw_score(screen, game_state.score)
+            self.draw_score(screen, game_state.score)
     
     def _draw_menu(self, screen):
         """绘制主菜单"""
         screen.fill(self.settings.bg_color)
-        title = self.font.render("贪吃蛇", True, self.settings.grid_color)
+        title = self.text_cache.render(self.font, "贪吃蛇", True, self.settings.grid_color)
         title_rect = title.get_rect(center=(self.settings.screen_width // 2, 100))
         screen.blit(title, title_rect)
         
@@ -127,7 +206,7 @@ class UIManager:
         overlay.set_alpha(128)
         screen.blit(overlay, (0, 0))
         
-        title = self.font.render("游戏暂停", True, self.settings.grid_color)
+        title = self.text_cache.render(self.font, "游戏暂停", True, self.settings.grid_color)
         title_rect = title.get_rect(center=(self.settings.screen_width // 2, 100))
         screen.blit(title, title_rect)
         
@@ -142,75 +221,146 @@ class UIManager:
         overlay.set_alpha(128)
         screen.blit(overlay, (0, 0))
         
-        title = self.font.render("游戏结束", True, self.settings.grid_color)
+        title = self.text_cache.render(self.font, "游戏结束", True, self.settings.grid_color)
         title_rect = title.get_rect(center=(self.settings.screen_width // 2, 100))
         screen.blit(title, title_rect)
         
-        score_text = self.font.render(f"得分: {score}", True, self.settings.grid_color)
+        score_text = self.text_cache.render(self.font, f"得分: {score}", True, self.settings.grid_color)
         score_rect = score_text.get_rect(center=(self.settings.screen_width // 2, 170))
         screen.blit(score_text, score_rect)
         
         for button in self.buttons['game_over'].values():
             button.draw(screen)
     
-    def _draw_high_scores(self, screen, high_scores):
-        """绘制最高分榜"""
-        title = self.font.render('最高分排行榜', True, self.settings.grid_color)
+    def _get_score_pager(self, game_state):
+        """返回排行榜分页浏览器，数据库打不开时返回 None
+
+        结果上报到排行榜服务时（--leaderboard-server）本地排行榜没有记录，改为按页查询服务端。
+        """
+        if self.score_pager is None:
+            client = getattr(self.game, 'leaderboard_client', None)
+            try:
+                source = client if client is not None else game_state.leaderboard
+                self.score_pager = HighScorePager(source, self.settings.leaderboard_page_size)
+            except sqlite3.Error as e:
+                logger.error('打开排行榜失败: %s', e)
+        return self.score_pager
+
+    def reset_score_page(self):
+        """回到排行榜第一页，并在下次绘制时重新查询"""
+        if self.score_pager is not None:
+            self.score_pager.reset()
+
+    def next_score_page(self):
+        """排行榜翻到下一页，返回是否翻页"""
+        return self.score_pager is not None and self.score_pager.next_page()
+
+    def prev_score_page(self):
+        """排行榜翻到上一页，返回是否翻页"""
+        return self.score_pager is not None and self.score_pager.prev_page()
+
+    def _draw_high_scores(self, screen, game_state):
+        """绘制最高分榜（只查询当前页）"""
+        title = self.text_cache.render(self.font, '最高分排行榜', True, self.settings.grid_color)
         title_rect = title.get_rect(center=(self.settings.screen_width // 2, 100))
         screen.blit(title, title_rect)
-        
-        if not high_scores:
-            text = self.font.render('暂无记录', True, self.settings.grid_color)
-            text_rect = text.get_rect(center=(self.settings.screen_width // 2, 200))
-            screen.blit(text, text_rect)
-        else:
-            for i, score in enumerate(high_scores[:10]):
-                text = self.small_font.render(f'第{i+1}名: {score}分', True, self.settings.grid_color)
+
+        pager = self._get_score_pager(game_state)
+        try:
+            rows = pager.rows() if pager is not None else []
+        except (sqlite3.Error, ConnectionError) as e:
+            logger.error('读取排行榜失败: %s', e)
+            rows = []
+
+        page_buttons = self.buttons['high_scores']
+        self._hidden_buttons = {page_buttons['prev_page'], page_buttons['next_page']}
+        if rows:
+            first_rank = pager.page_index * pager.page_size + 1
+            for i, result in enumerate(rows):
+                text = self.text_cache.render(
+                    self.small_font,
+                    f'第{first_rank + i}名: {result.score}分  {result.player}  长度 {result.length}',
+                    True, self.settings.grid_color)
                 text_rect = text.get_rect(center=(self.settings.screen_width // 2, 150 + i * 30))
                 screen.blit(text, text_rect)
-        
+            page = self.text_cache.render(self.small_font, f'第 {pager.page_index + 1} 页', True,
+                                          self.settings.grid_color)
+            screen.blit(page, page.get_rect(center=(self.settings.screen_width // 2, 480)))
+            for name, visible in (('prev_page', pager.has_prev()), ('next_page', pager.has_next())):
+                if visible:
+                    page_buttons[name].draw(screen)
+                    self._hidden_buttons.discard(page_buttons[name])
+        else:
+            # 排行榜还没有记录时显示旧的前十名列表
+            high_scores = game_state.get_high_scores()
+            if not high_scores:
+                text = self.text_cache.render(self.font, '暂无记录', True, self.settings.grid_color)
+                text_rect = text.get_rect(center=(self.settings.screen_width // 2, 200))
+                screen.blit(text, text_rect)
+            else:
+                for i, score in enumerate(high_scores[:10]):
+                    text = self.text_cache.render(self.small_font, f'第{i+1}名: {score}分', True,
+                                                  self.settings.grid_color)
+                    text_rect = text.get_rect(center=(self.settings.screen_width // 2, 150 + i * 30))
+                    screen.blit(text, text_rect)
+
         self.buttons['high_scores']['back'].draw(screen)
-    
-    def _draw_score(self, screen, score):
-        """绘制分数"""
-        score_text = self.small_font.render(f'得分: {score}', True, self.settings.grid_color)
-        screen.blit(score_text, (10, 10))
+
+    def draw_score(self, screen, score):
+        """绘制分数，返回分数文字占用的矩形（供增量渲染使用）"""
+        if score != self._score_value:
+            self._score_surface = self.small_font.render(f'得分: {score}', True,
+                                                         self.settings.grid_color)
+            self._score_value = score
+        return screen.blit(self._score_surface, (10, 10))
     
     def update_button_states(self, mouse_pos):
-        """更新按钮状态"""
-        logger.debug(f'更新按钮状态 - 鼠标位置: {mouse_pos}')
+        """更新按钮状态，返回是否有按钮的悬停状态发生了变化"""
+        # 鼠标每移动一下都会调用，关闭调试日志时不做任何格式化
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug('更新按钮状态 - 鼠标位置: %s', mouse_pos)
+        changed = False
         for menu_buttons in self.buttons.values():
             for name, button in menu_buttons.items():
                 was_hovered = button.is_hovered
-                button.is_hovered = button.rect.collidepoint(mouse_pos)
+                button.is_hovered = (button not in self._hidden_buttons
+                                     and button.rect.collidepoint(mouse_pos))
                 if was_hovered != button.is_hovered:
-                    logger.debug(f'按钮 "{name}" 在 {menu_buttons} 中的悬停状态改变: {button.is_hovered}')
+                    changed = True
+                    if debug:
+                        logger.debug('按钮 "%s" 的悬停状态改变: %s', name, button.is_hovered)
+        return changed
     
     def handle_input(self, event, game_state):
         """处理UI输入"""
-        logger.debug(f'处理UI输入 - 当前游戏状态: {game_state}')
+        logger.debug('处理UI输入 - 当前游戏状态: %s', game_state)
         if game_state.is_menu():
             logger.debug('处理主菜单按钮')
             for name, button in self.buttons['menu'].items():
                 if button.handle_event(event):
-                    logger.info(f'主菜单按钮点击: {name}')
+                    logger.info('主菜单按钮点击: %s', name)
                     return name
         elif game_state.is_paused():
             logger.debug('处理暂停菜单按钮')
             for name, button in self.buttons['pause'].items():
                 if button.handle_event(event):
-                    logger.info(f'暂停菜单按钮点击: {name}')
+                    logger.info('暂停菜单按钮点击: %s', name)
                     return name
         elif game_state.is_game_over():
             logger.debug('处理游戏结束按钮')
             for name, button in self.buttons['game_over'].items():
                 if button.handle_event(event):
-                    logger.info(f'游戏结束按钮点击: {name}')
+                    logger.info('游戏结束按钮点击: %s', name)
                     return name
         elif game_state.is_high_scores():
             logger.debug('处理最高分榜按钮')
             for name, button in self.buttons['high_scores'].items():
+                if button in self._hidden_buttons:
+                    continue
                 if button.handle_event(event):
-                    logger.info(f'最高分榜按钮点击: {name}')
-                    return 'quit_to_menu'  # 从最高分榜返回主菜单
+                    logger.info('最高分榜按钮点击: %s', name)
+                    if name == 'back':
+                        return 'quit_to_menu'  # 从最高分榜返回主菜单
+                    return name
         return None 
\ No newline at end of file
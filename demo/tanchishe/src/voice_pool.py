@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+音效的声道分配
+
+混音器的声道按音效类别预留（VOICE_CATEGORIES），每个音效属于一个类别并有自己的优先级和
+最短重复间隔（EFFECT_POLICIES）：
+- 同一音效在最短间隔内重复触发时直接丢弃（比如连续按方向键时的移动音效）
+- 类别的声道都在播放时，抢占其中优先级最低（相同时最早开始）的一个；
+  正在播放的都比新音效优先级高时丢弃新音效
+这样快速输入产生的大量移动音效只会占用自己的声道，不会挤掉吃食物和碰撞音效。
+
+0 号声道留给背景音乐，音效声道从 1 号开始。声道对象只需要 play(sound)、stop() 和
+get_busy() 三个方法，测试中可以用假对象代替 pygame.mixer.Channel。
+"""
+import logging
+import time
+
+logger = logging.getLogger('VoicePool')
+
+MUSIC_CHANNEL = 0
+
+# 类别 -> 预留的声道数
+VOICE_CATEGORIES = {
+    'event': 2,   # 吃食物、碰撞
+    'ui': 1,      # 菜单
+    'move': 2,    # 移动
+}
+
+# 音效 -> (类别, 优先级, 最短重复间隔（秒）)，优先级越大越重要
+EFFECT_POLICIES = {
+    'move': ('move', 0, 0.06),
+    'menu_select': ('ui', 1, 0.03),
+    'eat': ('event', 2, 0.0),
+    'crash': ('event', 3, 0.0),
+}
+
+
+def channel_count(categories=VOICE_CATEGORIES):
+    """背景音乐加上所有类别一共需要的声道数"""
+    return MUSIC_CHANNEL + 1 + sum(categories.values())
+
+
+class VoicePool:
+    """按类别分配声道，带限速和按优先级抢占"""
+
+    def __init__(self, channel_factory, categories=VOICE_CATEGORIES,
+                 policies=EFFECT_POLICIES, clock=time.perf_counter):
+        """channel_factory(编号) 返回声道对象，编号从 MUSIC_CHANNEL + 1 开始依次分给各类别"""
+        self.policies = policies
+        self.clock = clock
+        self.voices = {}
+        index = MUSIC_CHANNEL + 1
+        for category, count in categories.items():
+            # 每个声道记录 [声道, 优先级, 开始时刻]
+            self.voices[category] = [[channel_factory(index + i), -1, 0.0] for i in range(count)]
+            index += count
+        self._last_played = {}
+        self.played = 0
+        self.throttled = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def play(self, name, sound):
+        """播放音效，返回所用的声道；被限速或没有可用声道时返回 None"""
+        category, priority, interval = self.policies[name]
+        now = self.clock()
+        last = self._last_played.get(name)
+        if last is not None and now - last < interval:
+            self.throttled += 1
+            return None
+
+        voices = self.voices[category]
+        voice = None
+        for candidate in voices:
+            if not candidate[0].get_busy():
+                voice = candidate
+                break
+        if voice is None:
+            # 抢占优先级最低、开始最早的声道
+            voice = min(voices, key=lambda v: (v[1], v[2]))
+            if voice[1] > priority:
+                self.dropped += 1
+                logger.debug('没有可用声道，丢弃音效 %s', name)
+                return None
+            voice[0].stop()
+            self.stolen += 1
+
+        voice[0].play(sound)
+        voice[1] = priority
+        voice[2] = now
+        self._last_played[name] = now
+        self.played += 1
+        return voice[0]
+
+    def stop_all(self):
+        """停止所有音效声道"""
+        for voices in self.voices.values():
+            for voice in voices:
+                voice[0].stop()
+
+    def stats(self):
+        """播放、限速、抢占、丢弃的次数"""
+        return {'played': self.played, 'throttled': self.throttled,
+                'stolen': self.stolen, 'dropped': self.dropped}
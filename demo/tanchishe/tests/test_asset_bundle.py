@@ -0,0 +1,159 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import io
+import mmap
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.asset_bundle import (AssetBundle, BundleError, open_bundle, write_bundle,
+                              ALIGNMENT, FONT_ASSET, PCM_PREFIX)
+from src.build_assets import collect_ui_text
+from src.synth import EFFECTS, SoundCache, cache_key
+from ui_manager import LazyFont
+
+
+class TestAssetBundle(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.snkb')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        """测试写入后读出的内容、附加信息和对齐"""
+        samples = np.arange(30, dtype='<i2').reshape(5, 3, 2)
+        write_bundle(self.path, [('a', b'hello', {'kind': 'text'}),
+                                 ('b', samples, {'shape': [5, 3, 2]}),
+                                 ('empty', b'', {})])
+        with AssetBundle(self.path) as bundle:
+            self.assertEqual(sorted(bundle.names()), ['a', 'b', 'empty'])
+            self.assertEqual(bytes(bundle.get('a')), b'hello')
+            self.assertEqual(bundle.meta('a'), {'kind': 'text'})
+            self.assertEqual(bytes(bundle.get('b')), samples.tobytes())
+            self.assertEqual(len(bundle.get('empty')), 0)
+            for name in bundle.names():
+                self.assertEqual(bundle.entries[name]['offset'] % ALIGNMENT, 0)
+            self.assertIn('a', bundle)
+            self.assertNotIn('c', bundle)
+
+    def test_zero_copy(self):
+        """测试取出的资源直接指向映射内存"""
+        write_bundle(self.path, [('a', b'x' * 100, {})])
+        bundle = AssetBundle(self.path)
+        view = bundle.get('a')
+        self.assertTrue(view.readonly)
+        self.assertIsInstance(view.obj, mmap.mmap)
+        del view
+        bundle.close()
+
+    def test_stream(self):
+        """测试以文件对象读取资源"""
+        write_bundle(self.path, [('a', b'0123456789', {})])
+        with AssetBundle(self.path) as bundle:
+            stream = bundle.open('a')
+            self.assertEqual(stream.read(3), b'012')
+            stream.seek(-2, io.SEEK_END)
+            self.assertEqual(stream.read(), b'89')
+            stream.seek(4)
+            self.assertEqual(stream.read(100), b'456789')
+            self.assertEqual(stream.read(1), b'')
+
+    def test_open_bundle_invalid(self):
+        """测试文件不存在或格式不对时返回 None"""
+        self.assertIsNone(open_bundle(self.path))
+        with open(self.path, 'wb') as f:
+            f.write(b'not a bundle at all')
+        self.assertIsNone(open_bundle(self.path))
+        with self.assertRaises(BundleError):
+            AssetBundle(self.path)
+
+    def test_sound_cache_uses_bundle(self):
+        """测试 SoundCache 按参数哈希使用资源包中的采样，不再合成"""
+        spec = EFFECTS['move']
+        reference = SoundCache().samples(spec, 22050, 2)
+        key = cache_key(spec, 22050, 2, (1.0,))
+        write_bundle(self.path, [(PCM_PREFIX + key, reference, {'shape': list(reference.shape)})])
+        with AssetBundle(self.path) as bundle:
+            cache = SoundCache(bundle=bundle)
+            samples = cache.samples(spec, 22050, 2)
+            np.testing.assert_array_equal(samples, reference)
+            self.assertEqual((cache.bundle_hits, cache.renders), (1, 0))
+            # 格式不同时哈希不同，改为现场合成
+            cache.samples(spec, 44100, 2)
+            self.assertEqual((cache.bundle_hits, cache.renders), (1, 1))
+            del samples
+            cache = None
+
+
+class TestFontSubset(unittest.TestCase):
+    def test_collect_ui_text(self):
+        """测试只收集界面文字，不含文档字符串和日志"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'ui.py')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('"""模块说明"""\n'
+                        'def draw(font, score):\n'
+                        '    """函数说明"""\n'
+                        '    logger.info("日志 %s", score)\n'
+                        '    print("打印")\n'
+                        '    font.render(f"得分: {score}\\n")\n'
+                        '    return "返回"\n')
+            chars = collect_ui_text([path])
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(chars, set('得分: 返回'))
+
+    def test_lazy_font_fallback(self):
+        """测试子集字体不包含的字符改用完整字体渲染"""
+        loaded = []
+
+        class FakeFont:
+            def __init__(self, kind):
+                self.kind = kind
+
+            def render(self, text, *args):
+                return (self.kind, text)
+
+        def loader(kind):
+            return lambda size: loaded.append(kind) or FakeFont(kind)
+
+        font = LazyFont(24, loader('subset'), frozenset('得分: 0123456789'), loader('full'))
+        self.assertEqual(font.render('得分: 12', True), ('subset', '得分: 12'))
+        self.assertEqual(loaded, ['subset'])
+        self.assertEqual(font.render('玩家', True), ('full', '玩家'))
+        self.assertEqual(loaded, ['subset', 'full'])
+
+    def test_build_subset_font(self):
+        """测试生成的子集字体可以直接从资源包加载"""
+        try:
+            import fontTools  # noqa: F401
+        except ImportError:
+            self.skipTest('没有安装 fontTools')
+        import pygame
+        from src.build_assets import FONT_PATH, subset_font
+        data, chars = subset_font(FONT_PATH, set('贪吃蛇0123456789'))
+        self.assertEqual(chars, '0123456789吃蛇贪')
+        self.assertLess(len(data), os.path.getsize(FONT_PATH) // 10)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'font.snkb')
+            write_bundle(path, [(FONT_ASSET, data, {'chars': chars})])
+            pygame.font.init()
+            with AssetBundle(path) as bundle:
+                font = pygame.font.Font(bundle.open(FONT_ASSET), 24)
+                self.assertGreater(font.render('贪吃蛇', True, (255, 255, 255)).get_width(), 0)
+                del font
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import numpy as np
+from src.batch_env import BatchSnakeEnv, ACTION_NONE, mix64, neighbour_table
+from src.engine import SnakeEngine, NEIGHBOUR_TABLE_LIMIT, mix64 as scalar_mix64
+
+
+class TestBatchSnakeEnv(unittest.TestCase):
+    def _compare(self, n_envs, width, height, steps, seed):
+        """用同样的种子和动作同时运行批量环境和 SnakeEngine，逐步比较"""
+        env = BatchSnakeEnv(n_envs, width, height, seed=seed)
+        engines = [SnakeEngine(width, height, seed=int(s)) for s in env.seeds]
+        rng = np.random.default_rng(seed)
+        finished = 0
+        for _ in range(steps):
+            actions = rng.integers(-1, 4, size=n_envs)
+            events, dones = env.step(actions)
+            for i, engine in enumerate(engines):
+                action = None if actions[i] == ACTION_NONE else int(actions[i])
+                expected_events, expected_done = engine.step(action)
+                self.assertEqual(events[i], expected_events)
+                self.assertEqual(dones[i], expected_done)
+                if expected_done:
+                    finished += 1
+                    self.assertEqual(env.final_scores[i], engine.score)
+                    engine.reset(int(env.seeds[i]))
+                self.assertEqual(env.body(i), list(engine.body))
+                self.assertEqual(env.food[i], engine.food)
+                self.assertEqual(env.score[i], engine.score)
+        return finished
+
+    def test_mix64_matches_engine(self):
+        """测试向量化的随机数与标量版本逐位一致"""
+        values = [0, 1, 12345, (1 << 64) - 1, 0x9E3779B97F4A7C15]
+        batch = mix64(np.array(values, dtype=np.uint64))
+        self.assertEqual(batch.tolist(), [scalar_mix64(v) for v in values])
+
+    def test_matches_engine_small_board(self):
+        """测试小棋盘上（频繁吃到食物、占满棋盘）与 SnakeEngine 完全一致"""
+        finished = self._compare(n_envs=16, width=4, height=3, steps=400, seed=11)
+        self.assertGreater(finished, 0)
+
+    def test_matches_engine_default_board(self):
+        """测试默认棋盘上与 SnakeEngine 完全一致"""
+        self._compare(n_envs=8, width=40, height=30, steps=300, seed=5)
+
+    def test_no_op_actions(self):
+        """测试不传动作时保持方向直到撞墙"""
+        env = BatchSnakeEnv(4, 10, 5, seed=1)
+        heads = env.heads.copy()
+        events, dones = env.step()
+        np.testing.assert_array_equal(env.heads, heads + 1)
+        self.assertFalse(events.any())
+        self.assertFalse(dones.any())
+        self.assertEqual(env.grid.shape, (4, 5, 10))
+        for _ in range(4):
+            events, dones = env.step()
+        self.assertTrue(dones.all())
+        np.testing.assert_array_equal(env.seeds, np.arange(4, 8, dtype=np.uint64) + 1)
+        self.assertTrue((env.length == 3).all())
+
+    def test_neighbour_table_matches_engine(self):
+        """测试向量化生成的相邻格子表与 SnakeEngine 相同，包括按需计算的大棋盘"""
+        for width, height in ((7, 5), (1024, NEIGHBOUR_TABLE_LIMIT // 1024 + 1)):
+            engine = SnakeEngine(width, height, seed=0)
+            table = neighbour_table(width, height).reshape(4, -1)
+            cells = [0, width - 1, width, width * height // 2, width * height - 1]
+            for direction in range(4):
+                self.assertEqual(table[direction, cells].tolist(),
+                                 [engine._neighbours[direction][cell] for cell in cells])
+
+    def test_large_board(self):
+        """测试超过 NEIGHBOUR_TABLE_LIMIT 格子的大棋盘也能运行，并与 SnakeEngine 一致"""
+        width, height = 1024, NEIGHBOUR_TABLE_LIMIT // 1024 + 1
+        env = BatchSnakeEnv(2, width, height, seed=3)
+        engines = [SnakeEngine(width, height, seed=int(s)) for s in env.seeds]
+        for action in [0, 0, 3, 3, 2, -1, -1, 1]:
+            events, dones = env.step(np.full(2, action))
+            for i, engine in enumerate(engines):
+                self.assertEqual(events[i], engine.step(None if action < 0 else action)[0])
+                self.assertEqual(env.body(i), list(engine.body))
+
+
+if __name__ == '__main__':
+    unittest.main()
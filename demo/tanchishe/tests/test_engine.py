@@ -0,0 +1,194 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import subprocess
+import unittest
+from array import array
+from src.engine import (SnakeEngine, NeighbourRow, UP, DOWN, LEFT, RIGHT, DIRECTION_NAMES,
+                        EVENT_NONE, EVENT_EAT, EVENT_CRASH, EVENT_BOARD_FULL)
+from src.settings import Settings
+from src.snake import Snake
+
+
+class TestSnakeEngine(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.settings = Settings()
+        self.engine = SnakeEngine(seed=1)
+
+    def _body_xy(self, engine):
+        """把引擎的蛇身转换为像素坐标，便于和 Snake 比较"""
+        grid_size = self.settings.grid_size
+        return [(x * grid_size, y * grid_size)
+                for x, y in map(engine.cell_to_xy, engine.body)]
+
+    def test_initial_state_matches_snake(self):
+        """测试初始状态与 Snake 一致"""
+        self.assertEqual(self._body_xy(self.engine), list(Snake().body))
+        self.assertEqual(self.engine.direction, RIGHT)
+        self.assertEqual(self.engine.score, 0)
+        self.assertFalse(self.engine.done)
+        # 食物不会生成在蛇身上
+        self.assertNotIn(self.engine.food, self.engine.body)
+
+    def test_matches_snake_movement(self):
+        """测试相同操作序列下引擎与 Snake 的移动轨迹一致"""
+        snake = Snake()
+        actions = [None, 'DOWN', None, 'LEFT', 'UP', 'RIGHT', None, 'UP', 'LEFT']
+        for name in actions:
+            if name is not None:
+                snake.change_direction(name)
+            snake.move()
+            events, done = self.engine.step(
+                None if name is None else DIRECTION_NAMES.index(name))
+            self.assertFalse(done)
+            self.assertEqual(self._body_xy(self.engine), list(snake.body))
+
+    def test_reverse_direction_ignored(self):
+        """测试不允许 180 度掉头"""
+        head_x, head_y = self.engine.cell_to_xy(self.engine.head)
+        self.engine.step(LEFT)
+        self.assertEqual(self.engine.direction, RIGHT)
+        self.assertEqual(self.engine.cell_to_xy(self.engine.head), (head_x + 1, head_y))
+
+    def test_growth_on_next_move(self):
+        """测试吃到食物后下一步才生长"""
+        self.engine.food = self.engine.head + 1
+        events, done = self.engine.step()
+        self.assertEqual(events, EVENT_EAT)
+        self.assertEqual(self.engine.score, 1)
+        self.assertEqual(self.engine.length, 3)
+        self.engine.food = -1
+        self.engine.step()
+        self.assertEqual(self.engine.length, 4)
+
+    def test_wall_collision(self):
+        """测试撞墙"""
+        events, done = EVENT_NONE, False
+        while not done:
+            events, done = self.engine.step()
+        self.assertEqual(events, EVENT_CRASH)
+        self.assertEqual(self.engine.cell_to_xy(self.engine.head)[0], self.engine.width - 1)
+        # 结束后继续 step 不再改变状态
+        self.assertEqual(self.engine.step(), (EVENT_NONE, True))
+
+    def test_self_collision(self):
+        """测试撞到自己"""
+        engine = SnakeEngine(init_length=5, seed=1)
+        engine.food = -1
+        self.assertEqual(engine.step(DOWN), (EVENT_NONE, False))
+        self.assertEqual(engine.step(LEFT), (EVENT_NONE, False))
+        self.assertEqual(engine.step(UP), (EVENT_CRASH, True))
+        # 撞上时蛇身保持完整，尾部没有被移走
+        self.assertEqual(engine.length, 5)
+        self.assertTrue(all(engine.occupied[cell] for cell in engine.body))
+
+    def test_length_after_self_crash(self):
+        """测试撞到自己结束时长度等于初始长度加得分（吃到食物的下一步就撞上时还没生长）"""
+        self_crashes = 0
+        for seed in range(200):
+            engine = SnakeEngine(width=8, height=8, init_length=3, seed=seed)
+            rng = random.Random(seed)
+            ate = False
+            done = False
+            while not done:
+                action = rng.choice((UP, RIGHT, DOWN, LEFT))
+                events, done = engine.step(action)
+                if not done:
+                    ate = bool(events & EVENT_EAT)
+            head = engine._neighbours[engine.direction][engine.head]
+            if events != EVENT_CRASH or head < 0:
+                continue
+            self_crashes += 1
+            self.assertEqual(engine.length, engine.init_length + engine.score - ate)
+            self.assertEqual(sum(engine.occupied), engine.length)
+        self.assertGreater(self_crashes, 0)
+
+    def test_move_into_vacated_tail(self):
+        """测试蛇头可以进入刚空出来的尾部格子"""
+        engine = SnakeEngine(width=4, height=4, init_length=3, seed=1)
+        engine.food = -1
+        engine.body.clear()
+        engine.occupied[:] = bytes(engine.cell_count)
+        # 2x2 的环形蛇身：头 (0,1)，然后 (1,1)、(1,0)、尾 (0,0)
+        for cell in (4, 5, 1, 0):
+            engine.body.append(cell)
+            engine.occupied[cell] = 1
+        engine.free_cells.reset(engine.body)
+        engine.direction = engine.next_direction = UP
+        self.assertEqual(engine.step(), (EVENT_NONE, False))
+        self.assertEqual(engine.head, 0)
+
+    def test_board_full(self):
+        """测试吃掉最后一个食物、占满棋盘时确定地结束"""
+        engine = SnakeEngine(width=3, height=1, init_length=2, seed=1)
+        self.assertEqual(engine.food, 2)
+        engine.is_growing = True
+        events, done = engine.step()
+        self.assertEqual(events, EVENT_EAT | EVENT_BOARD_FULL)
+        self.assertTrue(done)
+        self.assertEqual(engine.food, -1)
+        self.assertEqual(engine.length, 3)
+
+    def test_free_cells_in_sync(self):
+        """测试空闲格子索引始终与蛇身一致"""
+        engine = SnakeEngine(width=8, height=6, seed=3)
+        for i in range(3000):
+            events, done = engine.step((UP, RIGHT, DOWN, LEFT)[(i * 7 // 5) % 4])
+            if done:
+                engine.reset(i)
+                continue
+            free = set(engine.free_cells.cells[:engine.free_cells.count])
+            self.assertEqual(free, set(range(engine.cell_count)) - set(engine.body))
+            self.assertNotIn(engine.food, engine.body)
+
+    def test_seed_determinism(self):
+        """测试相同种子得到相同的对局"""
+        def play(seed):
+            engine = SnakeEngine(seed=seed)
+            trace = []
+            for i in range(500):
+                events, done = engine.step((UP, RIGHT, DOWN, LEFT)[(i // 7) % 4])
+                trace.append((engine.head, engine.food, events))
+                if done:
+                    engine.reset(seed + i)
+            return trace
+        self.assertEqual(play(42), play(42))
+
+    def test_neighbour_rows_match_table(self):
+        """测试大棋盘按需计算的相邻格子与查找表一致"""
+        table = SnakeEngine._build_neighbours(7, 5)
+        for direction in range(4):
+            row = NeighbourRow(direction, 7, 5)
+            self.assertEqual([row[cell] for cell in range(35)], table[direction])
+
+    def test_large_board(self):
+        """测试大棋盘使用紧凑存储，规则不变"""
+        engine = SnakeEngine(width=1000, height=600, seed=2)
+        self.assertIsInstance(engine._neighbours[0], NeighbourRow)
+        self.assertIsInstance(engine.free_cells.cells, array)
+        head_x, head_y = engine.cell_to_xy(engine.head)
+        engine.food = engine.head + 1
+        engine.step()
+        engine.step(DOWN)
+        self.assertEqual(engine.length, 4)
+        self.assertEqual(engine.cell_to_xy(engine.head), (head_x + 1, head_y + 1))
+        # 一直向下直到撞到下边缘
+        for _ in range(engine.height - head_y - 2):
+            events, done = engine.step()
+            self.assertFalse(done)
+        self.assertEqual(engine.step(), (EVENT_CRASH, True))
+
+    def test_no_pygame_import(self):
+        """测试引擎模块不依赖 pygame"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ('import sys; import src.engine, src.snake, src.food; '
+                'sys.exit(1 if "pygame" in sys.modules else 0)')
+        result = subprocess.run([sys.executable, '-c', code], cwd=root)
+        self.assertEqual(result.returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
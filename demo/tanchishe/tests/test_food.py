@@ -135,5 +135,29 @@ class TestFood(unittest.TestCase):
             self.assertEqual(pos[0] % self.settings.grid_size, 0)
             self.assertEqual(pos[1] % self.settings.grid_size, 0)
 
+    def test_spawn_uses_snake_index(self):
+        """测试使用蛇自带的空闲格子索引生成食物"""
+        for _ in range(5):
+            self.snake.grow()
+            self.snake.move()
+        self.assertEqual(len(self.snake.body.free_cells),
+                         len(self.snake.occupancy) - len(self.snake.body))
+        for _ in range(50):
+            self.assertTrue(self.food.respawn(self.snake.body))
+            self.assertNotIn(self.food.position, self.snake.body)
+
+    def test_board_full(self):
+        """测试棋盘被占满时确定地报告，而不是无限循环"""
+        grid_size = self.settings.grid_size
+        cells = [(x, y)
+                 for x in range(0, self.settings.screen_width, grid_size)
+                 for y in range(0, self.settings.screen_height, grid_size)]
+        last = cells.pop()
+        self.assertTrue(self.food.respawn(cells))
+        self.assertEqual(self.food.position, last)
+        self.assertFalse(self.food.respawn(cells + [last]))
+        self.assertIsNone(self.food.position)
+        self.assertFalse(self.food.check_collision(last))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
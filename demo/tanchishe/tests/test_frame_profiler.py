@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import csv
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pygame
+from src.frame_profiler import (FrameProfiler, ProfilerOverlay, PHASES, EVENTS, UPDATE,
+                                RENDER, PRESENT, WAIT, percentile)
+
+
+class FakeNs:
+    """手动推进的纳秒计时器"""
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.directory = tempfile.mkdtemp()
+        self.timer = FakeNs()
+        patcher = mock.patch('src.frame_profiler.time.perf_counter_ns', self.timer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        shutil.rmtree(self.directory)
+
+    def run_frame(self, profiler, durations, steps=1):
+        """按给定的各阶段耗时（微秒）模拟一帧"""
+        profiler.begin_frame()
+        for phase, duration in zip((EVENTS, UPDATE, RENDER, PRESENT, WAIT), durations):
+            self.timer.now += duration * 1000
+            profiler.mark(phase)
+        profiler.end_frame(steps)
+
+    def test_percentiles(self):
+        """测试各阶段的百分位数和最大值"""
+        profiler = FrameProfiler(window=100)
+        for i in range(100):
+            self.run_frame(profiler, (10, 100 + i, 1000, 50, 15000))
+        stats = profiler.stats()
+        self.assertEqual(stats['events'], (0.01, 0.01, 0.01, 0.01))
+        self.assertEqual(stats['update'], (0.15, 0.195, 0.199, 0.199))
+        self.assertAlmostEqual(stats['frame'][3], 16.259)
+        self.assertEqual(len(profiler.summary_lines()), len(PHASES) + 2)
+
+    def test_window_is_rolling(self):
+        """测试只统计最近 window 帧"""
+        profiler = FrameProfiler(window=10)
+        self.run_frame(profiler, (0, 0, 90000, 0, 0))
+        for _ in range(10):
+            self.run_frame(profiler, (0, 0, 1000, 0, 0))
+        self.assertEqual(profiler.stats()['render'][3], 1.0)
+        self.assertEqual(profiler.frame_count, 11)
+
+    def test_csv_export(self):
+        """测试逐帧写入 CSV（微秒）"""
+        path = os.path.join(self.directory, 'frames.csv')
+        profiler = FrameProfiler(csv_path=path)
+        self.run_frame(profiler, (1, 2, 3, 4, 5), steps=2)
+        self.run_frame(profiler, (6, 7, 8, 9, 10), steps=0)
+        profiler.close()
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([rows[1][f'{p}_us'] for p in PHASES], ['6', '7', '8', '9', '10'])
+        self.assertEqual((rows[0]['frame_us'], rows[0]['steps']), ('15', '2'))
+
+    def test_percentile_empty(self):
+        """测试没有数据时百分位数为 0"""
+        self.assertEqual(percentile([], 0.99), 0)
+        self.assertEqual(FrameProfiler().stats()['frame'], (0.0, 0.0, 0.0, 0.0))
+
+
+class TestProfilerOverlay(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        pygame.init()
+        self.now = 0.0
+        self.profiler = FrameProfiler()
+        self.overlay = ProfilerOverlay(self.profiler, pygame.font.Font(None, 18),
+                                       clock=lambda: self.now)
+        self.screen = pygame.Surface((800, 600))
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.quit()
+
+    def test_refresh_interval(self):
+        """测试浮层文字按间隔刷新，宽度只增不减，位于右上角"""
+        rect, resized = self.overlay.draw(self.screen)
+        self.assertTrue(resized)
+        self.assertEqual(rect.right, 790)
+        first = self.overlay.surface
+        self.now += 0.1
+        self.assertFalse(self.overlay.draw(self.screen)[1])
+        self.assertIs(self.overlay.surface, first)
+        self.now += 0.5
+        self.overlay.draw(self.screen)
+        self.assertIsNot(self.overlay.surface, first)
+        self.assertGreaterEqual(self.overlay.surface.get_width(), first.get_width())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import unittest
+from src.free_cells import FreeCellIndex
+
+
+class TestFreeCellIndex(unittest.TestCase):
+    def assertConsistent(self, index, occupied):
+        """检查索引与期望的占用集合一致"""
+        self.assertEqual(len(index), len(index.cells) - len(occupied))
+        self.assertEqual(set(index.cells[:index.count]),
+                         set(range(len(index.cells))) - occupied)
+        for slot, cell in enumerate(index.cells):
+            self.assertEqual(index.slots[cell], slot)
+
+    def test_initial_state(self):
+        """测试初始化时按顺序占用格子"""
+        index = FreeCellIndex(12, [5, 6, 7])
+        self.assertConsistent(index, {5, 6, 7})
+        self.assertFalse(index.is_free(6))
+        self.assertTrue(index.is_free(0))
+
+    def test_random_operations(self):
+        """测试随机的占用、释放和交换后索引保持一致"""
+        rng = random.Random(7)
+        index = FreeCellIndex(50)
+        occupied = set()
+        for _ in range(2000):
+            cell = rng.randrange(50)
+            op = rng.randrange(3)
+            if op == 0:
+                index.take(cell)
+                occupied.add(cell)
+            elif op == 1:
+                index.release(cell)
+                occupied.discard(cell)
+            elif occupied and cell not in occupied:
+                released = rng.choice(sorted(occupied))
+                index.swap(cell, released)
+                occupied.add(cell)
+                occupied.discard(released)
+        self.assertConsistent(index, occupied)
+
+    def test_sample(self):
+        """测试只从空闲格子中抽取，全部占用时返回 -1"""
+        index = FreeCellIndex(4, [0, 1, 2])
+        self.assertEqual(index.sample(random.Random(1).randrange), 3)
+        index.take(3)
+        self.assertEqual(index.sample(random.Random(1).randrange), -1)
+
+    def test_reset(self):
+        """测试重置后与新建的索引相同"""
+        index = FreeCellIndex(20, [3, 4, 5])
+        index.swap(10, 3)
+        index.reset([1, 2])
+        fresh = FreeCellIndex(20, [1, 2])
+        self.assertEqual(index.cells, fresh.cells)
+        self.assertEqual(index.slots, fresh.slots)
+        self.assertEqual(index.count, fresh.count)
+
+    def test_compact_matches_list(self):
+        """测试紧凑存储（array）与列表存储的行为完全一致"""
+        rng = random.Random(3)
+        plain = FreeCellIndex(60, [1, 2], compact=False)
+        compact = FreeCellIndex(60, [1, 2], compact=True)
+        for _ in range(500):
+            cell = rng.randrange(60)
+            if rng.random() < 0.5:
+                plain.take(cell)
+                compact.take(cell)
+            else:
+                plain.release(cell)
+                compact.release(cell)
+        self.assertEqual(list(compact.cells), plain.cells)
+        self.assertEqual(list(compact.slots), plain.slots)
+        self.assertEqual(compact.sample(random.Random(5).randrange),
+                         plain.sample(random.Random(5).randrange))
+        compact.reset([7])
+        plain.reset([7])
+        self.assertEqual(list(compact.cells), plain.cells)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import shutil
+import tempfile
+import unittest
+from src.leaderboard import HighScorePager, Leaderboard, LeaderboardRecorder
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.leaderboard = Leaderboard()
+        rng = random.Random(0)
+        self.rows = [(f'p{rng.randrange(5)}', rng.randrange(20), 3, 10, 2.5, 1000.0 + i)
+                     for i in range(200)]
+        self.leaderboard.add_many(self.rows)
+        # 期望顺序：得分从高到低，同分先记录的在前（id 从 1 开始递增）
+        self.expected = sorted(range(1, len(self.rows) + 1),
+                               key=lambda i: (-self.rows[i - 1][1], i))
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        self.leaderboard.close()
+
+    def test_top(self):
+        """测试前 k 名的排序"""
+        top = self.leaderboard.top(10)
+        self.assertEqual([r.id for r in top], self.expected[:10])
+        self.assertEqual(top[0].score, max(row[1] for row in self.rows))
+
+    def test_paging_covers_all_rows(self):
+        """测试用游标逐页读取得到完整且不重复的排序"""
+        seen = []
+        cursor = None
+        while True:
+            page = self.leaderboard.page_after(cursor, 7)
+            if not page:
+                break
+            seen.extend(r.id for r in page)
+            cursor = page[-1]
+        self.assertEqual(seen, self.expected)
+
+    def test_rank_and_count(self):
+        """测试名次查询和总数"""
+        scores = [row[1] for row in self.rows]
+        self.assertEqual(self.leaderboard.count(), len(self.rows))
+        for score in (0, 7, 19, 100):
+            self.assertEqual(self.leaderboard.rank_of_score(score),
+                             1 + sum(s > score for s in scores))
+        self.leaderboard.add('new', 100, 5, 50, 12.5)
+        self.assertEqual(self.leaderboard.rank_of_score(100), 1)
+        self.assertEqual(self.leaderboard.top(1)[0].player, 'new')
+        self.assertEqual(self.leaderboard.best_of('new'), 100)
+        self.assertIsNone(self.leaderboard.best_of('nobody'))
+
+    def test_pager(self):
+        """测试界面分页浏览"""
+        pager = HighScorePager(self.leaderboard, page_size=8)
+        self.assertFalse(pager.has_prev())
+        self.assertEqual([r.id for r in pager.rows()], self.expected[:8])
+        self.assertTrue(pager.next_page())
+        self.assertTrue(pager.next_page())
+        self.assertEqual(pager.page_index, 2)
+        self.assertEqual([r.id for r in pager.rows()], self.expected[16:24])
+        self.assertTrue(pager.prev_page())
+        self.assertEqual([r.id for r in pager.rows()], self.expected[8:16])
+        while pager.next_page():
+            pass
+        self.assertEqual(pager.rows()[-1].id, self.expected[-1])
+        pager.reset()
+        self.assertEqual(pager.page_index, 0)
+
+
+class TestLeaderboardRecorder(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'leaderboard.db')
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        shutil.rmtree(self.directory)
+
+    def test_background_writes(self):
+        """测试后台写入，写完后其他连接可以读到"""
+        recorder = LeaderboardRecorder(self.path)
+        reader = Leaderboard(self.path)
+        for score in (3, 9, 5):
+            recorder.submit('玩家', score, score + 3, 40, 10.0)
+        self.assertTrue(recorder.flush(timeout=5))
+        self.assertEqual([r.score for r in reader.top(10)], [9, 5, 3])
+        recorder.submit('玩家', 1, 4, 10, 2.5)
+        recorder.close()
+        self.assertEqual(reader.count(), 4)
+        reader.close()
+        with self.assertRaises(RuntimeError):
+            recorder.submit('玩家', 1, 4, 10, 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
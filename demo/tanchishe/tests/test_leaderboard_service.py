@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import socket
+import tempfile
+import time
+import unittest
+from src.leaderboard import HighScorePager, Leaderboard
+from src.leaderboard_client import LeaderboardClient
+from src.leaderboard_server import MAX_TOP, ServerThread
+
+
+def free_port():
+    """找一个当前空闲的本地端口"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestLeaderboardService(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.directory = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.directory, 'server.db')
+        self.server = None
+        self.clients = []
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        for client in self.clients:
+            client.close(timeout=1)
+        if self.server is not None:
+            self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def make_client(self, port, **kwargs):
+        client = LeaderboardClient('127.0.0.1', port, **kwargs)
+        self.clients.append(client)
+        return client
+
+    def test_submit_and_query(self):
+        """测试批量上报后服务端可以查询到"""
+        self.server = ServerThread(self.db_path)
+        client = self.make_client(self.server.port, batch_size=50)
+        for i in range(300):
+            client.submit(f'bot{i % 7}', i % 40, i % 40 + 3, i, i / 4)
+        self.assertTrue(client.flush(timeout=10))
+        self.assertEqual(client.sent, 300)
+        self.assertTrue(self.server.server.recorder.flush(timeout=10))
+        self.assertEqual(client.request({'op': 'count'})['count'], 300)
+        top = client.request({'op': 'top', 'limit': 3})['results']
+        self.assertEqual([row[2] for row in top], [39, 39, 39])
+        self.assertEqual(client.request({'op': 'rank', 'score': 39})['rank'], 1)
+
+    def test_paging_through_server(self):
+        """测试通过服务端翻页与直接读数据库的结果一致，服务不可用时抛出 ConnectionError"""
+        self.server = ServerThread(self.db_path)
+        client = self.make_client(self.server.port)
+        for i in range(20):
+            client.submit(f'bot{i}', i % 6, 3, 10, 1.0)
+        self.assertTrue(client.flush(timeout=10))
+        self.assertTrue(self.server.server.recorder.flush(timeout=10))
+        leaderboard = Leaderboard(self.db_path)
+        local, remote = HighScorePager(leaderboard, 8), HighScorePager(client, 8)
+        try:
+            while True:
+                self.assertEqual(remote.rows(), local.rows())
+                self.assertEqual(remote.has_next(), local.has_next())
+                if not local.next_page():
+                    break
+                self.assertTrue(remote.next_page())
+        finally:
+            leaderboard.close()
+        self.assertEqual(local.page_index, 2)
+
+        offline = self.make_client(free_port(), query_timeout=0.5)
+        with self.assertRaises(ConnectionError):
+            offline.page_after(None, 8)
+
+    def test_query_limit_clamped(self):
+        """测试查询条数被限制在 1..MAX_TOP，负数不会读出整张表"""
+        self.server = ServerThread(self.db_path)
+        client = self.make_client(self.server.port)
+        for i in range(MAX_TOP + 20):
+            client.submit('bot', i, 3, 10, 1.0)
+        self.assertTrue(client.flush(timeout=10))
+        self.assertTrue(self.server.server.recorder.flush(timeout=10))
+        for op in ('top', 'page'):
+            for limit, expected in ((-1, 1), (0, 1), (5, 5), (MAX_TOP + 20, MAX_TOP)):
+                reply = client.request({'op': op, 'limit': limit})
+                self.assertEqual(len(reply['results']), expected, (op, limit))
+
+    def test_submit_never_blocks(self):
+        """测试服务不可用时 submit 立即返回，队列有上限"""
+        client = self.make_client(free_port(), max_pending=100, backoff=0.05)
+        start = time.perf_counter()
+        for i in range(1000):
+            client.submit('bot', i, 3, 10, 1.0)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertLessEqual(client.pending(), 100)
+        self.assertGreaterEqual(client.dropped, 900)
+
+    def test_retry_until_server_available(self):
+        """测试服务稍后启动时客户端重连并补发"""
+        port = free_port()
+        client = self.make_client(port, backoff=0.02, max_backoff=0.1)
+        for i in range(20):
+            client.submit('bot', i, 3, 10, 1.0)
+        time.sleep(0.2)
+        self.assertGreater(client.retries, 0)
+        self.server = ServerThread(self.db_path, port=port)
+        self.assertTrue(client.flush(timeout=10))
+        self.assertEqual(client.sent, 20)
+
+    def test_invalid_results_rejected(self):
+        """测试服务端拒绝格式错误的结果，客户端不重试"""
+        self.server = ServerThread(self.db_path)
+        client = self.make_client(self.server.port)
+        client.submit('bot', -1, 3, 10, 1.0)
+        self.assertTrue(client.flush(timeout=10))
+        self.assertEqual((client.sent, client.rejected), (0, 1))
+        self.assertEqual(client.request({'op': 'bogus'})['ok'], False)
+
+    def test_server_persists_results(self):
+        """测试服务停止前已接受的结果写入数据库"""
+        self.server = ServerThread(self.db_path)
+        client = self.make_client(self.server.port)
+        for i in range(10):
+            client.submit('bot', i, 3, 10, 1.0)
+        self.assertTrue(client.flush(timeout=10))
+        self.server.stop()
+        self.server = None
+        leaderboard = Leaderboard(self.db_path)
+        self.assertEqual(leaderboard.count(), 10)
+        leaderboard.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import logging
+import tempfile
+import unittest
+from unittest import mock
+from src import log_config
+from src.log_config import EventRingBuffer, parse_level, setup_logging, shutdown_logging
+
+
+class TestLogConfig(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.root_level = logging.getLogger().level
+        self.logger = logging.getLogger('TestLogConfig')
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        shutdown_logging()
+        logging.getLogger().setLevel(self.root_level)
+
+    def test_parse_level(self):
+        """测试日志级别解析"""
+        self.assertEqual(parse_level('debug'), logging.DEBUG)
+        self.assertEqual(parse_level(' Warning '), logging.WARNING)
+        self.assertEqual(parse_level('15'), 15)
+        self.assertEqual(parse_level(logging.ERROR), logging.ERROR)
+        with self.assertRaises(ValueError):
+            parse_level('loud')
+
+    def test_level_from_environment(self):
+        """测试未指定级别时读取环境变量，默认 WARNING"""
+        with mock.patch.dict(os.environ, {log_config.LEVEL_ENV: 'info'}):
+            setup_logging(stream=io.StringIO())
+        self.assertTrue(self.logger.isEnabledFor(logging.INFO))
+        self.assertFalse(self.logger.isEnabledFor(logging.DEBUG))
+
+        with mock.patch.dict(os.environ, clear=True):
+            setup_logging(stream=io.StringIO())
+        self.assertFalse(self.logger.isEnabledFor(logging.INFO))
+
+    def test_records_written_by_listener(self):
+        """测试日志经队列由监听线程写出，重复配置不会重复输出"""
+        stream = io.StringIO()
+        setup_logging('DEBUG', event_log_size=0, stream=io.StringIO())
+        setup_logging('DEBUG', event_log_size=0, stream=stream)
+        self.logger.debug('分数更新: %d -> %d', 1, 2)
+        shutdown_logging()
+        self.assertEqual(stream.getvalue().count('分数更新: 1 -> 2'), 1)
+
+    def test_ring_buffer_keeps_latest(self):
+        """测试环形缓冲区只保留最近的记录，并能写入文件"""
+        buffer = setup_logging('INFO', event_log_size=3, stream=io.StringIO())
+        for i in range(5):
+            self.logger.info('事件 %d', i)
+        shutdown_logging()
+        lines = buffer.lines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].endswith('事件 2'))
+        self.assertTrue(lines[-1].endswith('事件 4'))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'logs', 'events.log')
+            self.assertEqual(buffer.dump(path), 3)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), lines)
+
+    def test_ring_buffer_sees_debug(self):
+        """测试启用环形缓冲区时 DEBUG 只进入缓冲区，控制台仍按配置的级别输出"""
+        stream = io.StringIO()
+        buffer = setup_logging('INFO', event_log_size=10, stream=stream)
+        self.logger.debug('调试 %d', 1)
+        self.logger.info('信息 %d', 2)
+        shutdown_logging()
+        self.assertNotIn('调试 1', stream.getvalue())
+        self.assertIn('信息 2', stream.getvalue())
+        lines = buffer.lines()
+        self.assertTrue(lines[0].endswith('调试 1'))
+        self.assertTrue(lines[1].endswith('信息 2'))
+
+    def test_queue_handler_does_not_format(self):
+        """测试入队时不格式化，记录原样交给监听线程"""
+        setup_logging('INFO', event_log_size=0, stream=io.StringIO())
+        handler = log_config._handlers[0]
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, '%s', (object(),), None)
+        self.assertIs(handler.prepare(record), record)
+        self.assertEqual(record.msg, '%s')
+        self.assertIsNotNone(record.args)
+
+    def test_ring_buffer_does_not_format_on_emit(self):
+        """测试环形缓冲区写入时不格式化"""
+        buffer = EventRingBuffer(2)
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, '%s', (object(),), None)
+        with mock.patch.object(buffer, 'format') as fmt:
+            buffer.handle(record)
+        fmt.assert_not_called()
+        self.assertEqual(len(buffer.records), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,393 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pygame
+import argparse
+from main import Game, parse_server_address, parse_speed
+from engine import UP, RIGHT, DOWN, LEFT
+from replay import Replay, verify
+
+
+class FakeClock:
+    """记录 tick 调用的时钟替身"""
+    def __init__(self):
+        self.ticks = []
+
+    def tick(self, framerate=0):
+        self.ticks.append(framerate)
+        return 0
+
+
+class FakeTimer:
+    """手动推进的模拟时钟"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.game = Game()
+        self.timer = FakeTimer()
+        self.game.sim_clock = self.timer
+        self.game.move_delay = 1 / 256
+        self.game._start_new_game()
+        self.game.engine.reset(seed=7)
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.quit()
+
+    def run_frames(self, frames, frame_time):
+        steps = []
+        for _ in range(frames):
+            self.timer.now += frame_time
+            steps.append(self.game._update_game())
+        return steps
+
+    def test_speed_above_frame_rate(self):
+        """测试移动速度高于帧率时一帧推进多步，总步数只取决于经过的时间"""
+        self.assertEqual(self.run_frames(4, 1 / 64), [4, 4, 4, 4])
+        self.assertEqual(self.game.engine.steps, 16)
+
+    def test_uneven_frames_keep_remainder(self):
+        """测试帧间隔不均匀时剩余时间留到下一帧"""
+        self.assertEqual(self.run_frames(3, 1.5 / 256), [1, 2, 1])
+        self.assertEqual(self.game.engine.steps, 4)
+
+    def test_time_scale(self):
+        """测试时间倍率加速模拟"""
+        self.game.time_scale = 2.0
+        self.run_frames(2, 1 / 64)
+        self.assertEqual(self.game.engine.steps, 16)
+
+    def test_catch_up_is_bounded(self):
+        """测试长时间卡顿后一帧最多追赶 max_steps_per_frame 步，并丢弃剩余时间"""
+        self.game.settings.max_steps_per_frame = 8
+        self.assertEqual(self.run_frames(1, 1.0), [8])
+        self.assertEqual(self.game.sim_accumulator, 0.0)
+
+    def test_queued_turns_apply_one_per_step(self):
+        """测试同一帧内连按的两次转向在相邻两步依次生效"""
+        self.game._queue_turn(UP)
+        self.game._queue_turn(LEFT)
+        self.run_frames(1, 2 / 256)
+        self.assertEqual(self.game.engine.direction, LEFT)
+        self.assertEqual(self.game.engine.steps, 2)
+
+
+class TestReplayRecording(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.game = Game()
+        self.game.game_state.save_high_scores = lambda: None
+        self.directory = tempfile.mkdtemp()
+        self.game.game_state.leaderboard_path = os.path.join(self.directory, 'leaderboard.db')
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.quit()
+        shutil.rmtree(self.directory)
+
+    def play(self, turns):
+        """开一局，在指定步数按方向键，直到游戏结束"""
+        self.game._start_new_game()
+        while self.game.game_state.is_playing():
+            turn = turns.get(self.game.engine.steps)
+            if turn is not None:
+                self.game._queue_turn(turn)
+            self.game._step_game()
+
+    def test_recorded_game_replays_headless(self):
+        """测试游戏中录制的录像可以无界面复现"""
+        self.play({2: UP, 5: LEFT, 9: DOWN})
+        replay = self.game.last_replay
+        self.assertEqual([tick for tick, _ in replay.inputs], [2, 5, 9])
+        self.assertEqual(replay.ticks, self.game.engine.steps)
+        self.assertTrue(verify(Replay.from_bytes(replay.to_bytes())))
+
+    def test_result_recorded_to_leaderboard(self):
+        """测试每局结束后结果写入排行榜"""
+        self.play({2: UP})
+        game_state = self.game.game_state
+        self.assertTrue(game_state.flush_results(timeout=5))
+        result = game_state.leaderboard.top(1)[0]
+        self.assertEqual(result.player, self.game.settings.player_name)
+        self.assertEqual(result.ticks, self.game.engine.steps)
+        self.assertEqual(result.length, self.game.engine.length)
+
+    def test_playback_in_game(self):
+        """测试在游戏窗口中回放录像得到相同结果，且不计入最高分"""
+        self.play({2: UP, 5: LEFT, 9: DOWN})
+        replay = self.game.last_replay
+
+        game = Game(replay=replay)
+        game.game_state.save_high_scores = self.fail
+        high_scores = list(game.game_state.high_scores)
+        game._start_new_game()
+        while game.game_state.is_playing():
+            game._queue_turn(RIGHT)  # 回放时忽略键盘
+            game._step_game()
+        self.assertEqual(game.engine.steps, replay.ticks)
+        self.assertEqual(list(game.engine.body), list(self.game.engine.body))
+        self.assertEqual(game.game_state.high_scores, high_scores)
+
+    def test_playback_uses_replay_init_length(self):
+        """测试回放时按录像的初始长度创建引擎"""
+        replay = Replay(self.game.engine.width, self.game.engine.height, 5, seed=7)
+        game = Game(replay=replay)
+        self.assertEqual(game.engine.init_length, 5)
+        game._start_new_game()
+        self.assertEqual(game.engine.length, 5)
+
+
+class TestFramePacing(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.game = Game()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.quit()
+
+    def test_idle_screen_sleeps_without_redrawing(self):
+        """测试菜单界面没有输入时休眠且逐步拉长间隔，不刷新屏幕"""
+        settings = self.game.settings
+        self.game._update_screen()
+        with mock.patch('pygame.event.get', return_value=[]), \
+                mock.patch('pygame.time.wait') as wait, \
+                mock.patch('pygame.display.flip') as flip, \
+                mock.patch('pygame.display.update') as update:
+            for _ in range(6):
+                self.game._run_frame(self.clock)
+        delays = [call.args[0] for call in wait.call_args_list]
+        self.assertEqual(delays[0], settings.idle_delay_min)
+        self.assertEqual(delays, sorted(delays))
+        self.assertEqual(delays[-1], settings.idle_delay_max)
+        self.assertEqual(self.clock.ticks, [])
+        flip.assert_not_called()
+        update.assert_not_called()
+
+    def test_input_resets_idle_delay(self):
+        """测试空闲界面收到输入后恢复最短轮询间隔"""
+        self.game.idle_delay = self.game.settings.idle_delay_max
+        motion = pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0), rel=(1, 1), buttons=(0, 0, 0))
+        with mock.patch('pygame.event.get', return_value=[motion]), \
+                mock.patch('pygame.time.wait') as wait:
+            self.game._run_frame(self.clock)
+        wait.assert_not_called()
+        self.assertEqual(self.game.idle_delay, self.game.settings.idle_delay_min)
+
+    def test_playing_runs_at_fixed_rate(self):
+        """测试游戏进行中按固定帧率运行，不进入空闲休眠"""
+        self.game._start_new_game()
+        with mock.patch('pygame.time.wait') as wait:
+            for _ in range(3):
+                self.game._run_frame(self.clock)
+        wait.assert_not_called()
+        self.assertEqual(self.clock.ticks, [self.game.settings.fps] * 3)
+
+    def test_state_change_redraws_idle_screen(self):
+        """测试空闲界面收到导致状态切换的事件后整屏重绘"""
+        self.game._start_new_game()
+        self.game._update_screen()
+        self.game.game_state.pause()
+        self.game._update_screen()
+        key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p)
+        with mock.patch('pygame.event.get', return_value=[key]), \
+                mock.patch('pygame.display.flip') as flip:
+            self.game._run_frame(self.clock)
+        self.assertTrue(self.game.game_state.is_playing())
+        flip.assert_called_once()
+
+
+class TestFrameProfiling(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.game = Game()
+        self.clock = FakeClock()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        if self.game.profiler is not None:
+            self.game.profiler.close()
+        pygame.quit()
+        shutil.rmtree(self.directory)
+
+    def test_disabled_by_default(self):
+        """测试默认不计时"""
+        self.game._start_new_game()
+        self.game._run_frame(self.clock)
+        self.assertIsNone(self.game.profiler)
+
+    def test_profiled_frames(self):
+        """测试打开计时后每一帧都记录各阶段耗时并写入 CSV"""
+        path = os.path.join(self.directory, 'frames.csv')
+        profiler = self.game.enable_profiler(path)
+        self.game._start_new_game()
+        for _ in range(5):
+            self.game._run_frame(self.clock)
+        self.assertEqual(profiler.frame_count, 5)
+        self.assertEqual(self.clock.ticks, [self.game.settings.fps] * 5)
+        self.assertGreater(profiler.stats()['render'][3], 0)
+        profiler.close()
+        with open(path) as f:
+            rows = f.read().splitlines()
+        self.assertEqual(len(rows), 6)
+        self.assertTrue(rows[0].startswith('frame,start_us,events_us'))
+
+    def test_overlay_toggle(self):
+        """测试 F3 切换性能浮层，浮层区域被提交到屏幕"""
+        self.game._start_new_game()
+        self.game._update_screen()
+        key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3)
+        self.game._handle_event(key)
+        self.assertTrue(self.game.show_profiler)
+        # 浮层第一次出现时整屏重绘，之后只提交变化的区域
+        for _ in range(2):
+            self.game._run_frame(self.clock)
+        overlay = self.game.profiler_overlay.surface
+        self.assertIsNotNone(overlay)
+        with mock.patch('pygame.display.update') as update:
+            self.game._run_frame(self.clock)
+        rects = update.call_args.args[0]
+        self.assertIn(overlay.get_size(), [rect.size for rect in rects])
+        self.game._handle_event(key)
+        self.assertFalse(self.game.show_profiler)
+
+
+class TestArguments(unittest.TestCase):
+    def test_parse_server_address(self):
+        """测试解析排行榜服务地址"""
+        self.assertEqual(parse_server_address('example.com:8765'), ('example.com', 8765))
+        self.assertEqual(parse_server_address(':8765'), ('127.0.0.1', 8765))
+        self.assertEqual(parse_server_address('[::1]:8765'), ('::1', 8765))
+        for text in ('example.com', 'example.com:port', 'example.com:70000'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_server_address(text)
+
+
+    def test_parse_speed(self):
+        """测试时间倍率必须是有限的正数"""
+        self.assertEqual(parse_speed('8'), 8.0)
+        self.assertEqual(parse_speed('0.25'), 0.25)
+        for text in ('0', '-1', 'fast', 'inf', 'nan'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_speed(text)
+
+
+class TestHighScoreScreen(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.game = Game()
+        self.directory = tempfile.mkdtemp()
+        self.game.game_state.leaderboard_path = os.path.join(self.directory, 'leaderboard.db')
+        self.game.game_state.show_high_scores()
+        self.ui = self.game.ui_manager
+        self.buttons = self.ui.buttons['high_scores']
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.quit()
+        shutil.rmtree(self.directory)
+
+    def click(self, name):
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.buttons[name].rect.center,
+                                   button=1)
+        return self.ui.handle_input(event, self.game.game_state)
+
+    def test_hidden_page_buttons_ignored(self):
+        """测试没有画出来的翻页按钮不响应悬停和点击"""
+        self.game.game_state.high_scores = list(range(12, 0, -1))
+        self.ui.draw(self.game.screen, self.game.game_state)
+        self.assertIsNone(self.click('prev_page'))
+        self.assertIsNone(self.click('next_page'))
+        self.ui.update_button_states(self.buttons['next_page'].rect.center)
+        self.assertFalse(self.buttons['next_page'].is_hovered)
+        self.assertEqual(self.click('back'), 'quit_to_menu')
+
+    def test_visible_page_buttons(self):
+        """测试排行榜有下一页时可以点击下一页，翻页后可以点击上一页"""
+        self.game.game_state.leaderboard.add_many(
+            [('玩家', score, 3, 10, 1.0, 0.0) for score in range(20)])
+        self.ui.draw(self.game.screen, self.game.game_state)
+        self.assertIsNone(self.click('prev_page'))
+        self.ui.update_button_states(self.buttons['next_page'].rect.center)
+        self.assertTrue(self.buttons['next_page'].is_hovered)
+        self.assertEqual(self.click('next_page'), 'next_page')
+        self.assertTrue(self.ui.next_score_page())
+        self.ui.draw(self.game.screen, self.game.game_state)
+        self.assertEqual(self.click('prev_page'), 'prev_page')
+
+    def test_client_mode_pages_from_server(self):
+        """测试结果上报到排行榜服务时，排行榜界面按页读取服务端而不是本地数据库"""
+        from leaderboard import Leaderboard
+        server = Leaderboard()   # 接口与 LeaderboardClient.page_after 相同
+        server.add_many([('玩家', score, 3, 10, 1.0, 0.0) for score in range(20)])
+        self.game.leaderboard_client = server
+        self.ui.draw(self.game.screen, self.game.game_state)
+        self.assertEqual(self.ui.score_pager.rows()[0].score, 19)
+        self.assertEqual(self.click('next_page'), 'next_page')
+        self.assertEqual(self.game.game_state.leaderboard.count(), 0)
+        server.close()
+
+
+class TestProfileCapture(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.game = Game()
+        self.game.game_state.save_high_scores = lambda: None
+        self.directory = tempfile.mkdtemp()
+        self.game.game_state.leaderboard_path = os.path.join(self.directory, 'leaderboard.db')
+        self.game.profile_dir = self.directory
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        self.game.stop_cpu_capture()
+        if self.game.alloc_tracker is not None:
+            self.game.toggle_alloc_tracking()
+        pygame.quit()
+        shutil.rmtree(self.directory)
+
+    def test_cpu_capture_hotkey(self):
+        """测试 F4 开始采集，采满帧数后自动写出 .pstats"""
+        self.game.cpu_capture_frames = 3
+        self.game._start_new_game()
+        self.game._handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F4))
+        capture = self.game.cpu_capture
+        self.assertIsNotNone(capture)
+        for _ in range(4):
+            self.game._run_frame(self.clock)
+        self.assertIsNone(self.game.cpu_capture)
+        self.assertTrue(os.path.exists(capture.path))
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(capture.path)])
+
+    def test_alloc_report_per_game(self):
+        """测试打开分配比较后每局结束都写出一份报告"""
+        self.game._handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F5))
+        tracker = self.game.alloc_tracker
+        self.assertIsNotNone(tracker)
+        self.game._start_new_game()
+        while self.game.game_state.is_playing():
+            self.game._step_game()
+        self.assertTrue(os.path.exists(tracker.path))
+        self.game._handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F5))
+        self.assertIsNone(self.game.alloc_tracker)
+
+
+if __name__ == '__main__':
+    unittest.main()
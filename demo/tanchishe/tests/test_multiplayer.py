@@ -0,0 +1,222 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import random
+import socket
+import unittest
+from unittest import mock
+from src.engine import UP, RIGHT, DOWN, LEFT
+from src.multiplayer import Arena, RoomMirror
+from src import game_server
+from src.game_server import GameServer
+from src.game_client import GameClient, bot_policy
+
+
+class TestArena(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.arena = Arena(20, 10, food_count=1, seed=3)
+
+    def place(self, player_id, body, direction=RIGHT):
+        """把一条蛇摆到指定位置（格子坐标列表，蛇头在前）"""
+        snake = self.arena.snakes[player_id]
+        self.arena._clear_body(snake)
+        for x, y in body:
+            cell = y * self.arena.width + x
+            snake.body.append(cell)
+            self.arena.occupied[cell] = 1
+            self.arena.free_cells.take(cell)
+        snake.direction = snake.next_direction = direction
+        snake.alive = True
+
+    def move_food(self, cell):
+        """把唯一的食物移到指定格子"""
+        arena = self.arena
+        arena.free_cells.release(arena.food[0])
+        arena.free_cells.take(cell)
+        arena.food[0] = cell
+
+    def test_spawn_does_not_overlap(self):
+        """测试新蛇不会生成在其它蛇或食物上"""
+        ids = [self.arena.add_player(f'p{i}') for i in range(6)]
+        self.assertNotIn(None, ids)
+        cells = [cell for snake in self.arena.snakes.values() for cell in snake.body]
+        self.assertEqual(len(cells), len(set(cells)))
+        self.assertTrue(set(cells).isdisjoint(self.arena.food))
+        self.assertEqual(len(self.arena.free_cells), 200 - len(cells) - 1)
+
+    def test_head_on_collision_kills_both(self):
+        """测试两条蛇的蛇头进入同一格时都死亡"""
+        a = self.arena.add_player('a')
+        b = self.arena.add_player('b')
+        self.place(a, [(4, 5), (3, 5), (2, 5)], RIGHT)
+        self.place(b, [(6, 5), (7, 5), (8, 5)], LEFT)
+        self.move_food(0)
+        delta = self.arena.step()
+        self.assertEqual(sorted(delta['d']), [a, b])
+        self.assertNotIn('m', delta)
+        self.assertFalse(any(self.arena.occupied))
+
+    def test_enter_vacated_tail(self):
+        """测试蛇头可以进入另一条蛇刚空出来的尾部格子，撞到身体则死亡"""
+        a = self.arena.add_player('a')
+        b = self.arena.add_player('b')
+        c = self.arena.add_player('c')
+        self.place(a, [(5, 4), (5, 3), (5, 2)], DOWN)
+        # b 的尾部在 (5, 5)，这一步会空出来
+        self.place(b, [(7, 5), (6, 5), (5, 5)], RIGHT)
+        # c 撞向 b 的身体
+        self.place(c, [(6, 6), (6, 7), (6, 8)], UP)
+        self.move_food(0)
+        delta = self.arena.step()
+        self.assertEqual(delta['d'], [c])
+        self.assertEqual([m[0] for m in delta['m']], [a, b])
+
+    def test_growth_on_next_move(self):
+        """测试吃到食物后下一步才生长，并生成新的食物"""
+        a = self.arena.add_player('a')
+        self.place(a, [(4, 5), (3, 5), (2, 5)], RIGHT)
+        self.move_food(5 * 20 + 5)
+        delta = self.arena.step()
+        self.assertEqual(delta['m'], [[a, 105, 0]])
+        self.assertEqual(delta['f'][0][0], 105)
+        self.assertNotIn(delta['f'][0][1], self.arena.snakes[a].body)
+        self.assertEqual(self.arena.snakes[a].score, 1)
+        delta = self.arena.step()
+        self.assertEqual(delta['m'], [[a, 106, 1]])
+        self.assertEqual(len(self.arena.snakes[a].body), 4)
+
+    def test_mirror_follows_deltas(self):
+        """测试客户端按增量维护的状态与服务端一致（含加入、离开、死亡和重生）"""
+        arena = Arena(16, 12, food_count=3, seed=7)
+        rng = random.Random(1)
+        ids = [arena.add_player(f'p{i}') for i in range(3)]
+        mirror = RoomMirror(arena.snapshot())
+        late_mirror = None
+        for tick in range(400):
+            for player_id in list(arena.snakes):
+                if rng.random() < 0.3:
+                    arena.turn(player_id, rng.randrange(4))
+                if not arena.snakes[player_id].alive:
+                    arena.respawn(player_id)
+            if tick == 50:
+                ids.append(arena.add_player('late'))
+                late_mirror = RoomMirror(arena.snapshot())
+            if tick == 120:
+                arena.remove_player(ids[0])
+            delta = arena.step()
+            for m in (mirror, late_mirror):
+                if m is not None:
+                    m.apply(delta)
+                    self.assertEqual(m.snakes, {s.id: s.body for s in arena.snakes.values()
+                                                if s.alive})
+                    self.assertEqual(sorted(m.food), sorted(arena.food))
+
+
+class TestGameServer(unittest.TestCase):
+    def test_bots_track_server_state(self):
+        """测试通过本机连接的机器人看到的状态与服务端一致"""
+        async def scenario():
+            server = GameServer(port=0, tick_rate=0, width=20, height=15, max_players=3,
+                                seed=5)
+            await server.start()
+            clients = []
+            try:
+                for i in range(3):
+                    client = GameClient()
+                    await client.connect('127.0.0.1', server.port, 'r1', f'bot{i}')
+                    clients.append(client)
+                full = GameClient()
+                with self.assertRaises(ConnectionError):
+                    await full.connect('127.0.0.1', server.port, 'r1', 'late')
+                self.assertEqual(len({c.player_id for c in clients}), 3)
+
+                arena = server.rooms['r1'].arena
+                for _ in range(60):
+                    for client in clients:
+                        if client.alive:
+                            direction = bot_policy(client.mirror, client.player_id)
+                            if direction is not None:
+                                client.turn(direction)
+                        else:
+                            client.respawn()
+                        await client.writer.drain()
+                    # 让服务端处理完收到的操作
+                    await asyncio.sleep(0.01)
+                    server.tick()
+                    for client in clients:
+                        message = await asyncio.wait_for(client.receive(), 5)
+                        self.assertEqual(message['op'], 'tick')
+                        self.assertEqual(client.mirror.snakes,
+                                         {s.id: s.body for s in arena.snakes.values()
+                                          if s.alive})
+                self.assertGreater(server.bytes_sent, 0)
+                self.assertEqual(server.stats()['players'], 3)
+
+                clients.pop().close()
+                await asyncio.sleep(0.05)
+                self.assertEqual(len(server.rooms['r1'].members), 2)
+            finally:
+                for client in clients:
+                    client.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_stalled_reader_dropped(self):
+        """测试不读数据的客户端被断开并移出房间，其它客户端照常收到广播"""
+        async def scenario():
+            server = GameServer(port=0, tick_rate=0, width=20, height=15, seed=5)
+            await server.start()
+            active = GameClient()
+            received = []
+
+            async def consume():
+                while await active.receive() is not None:
+                    received.append(1)
+
+            # 不读数据的客户端用普通套接字，缩小接收缓冲区让积压尽快出现在服务端
+            stalled = socket.socket()
+            stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            try:
+                await active.connect('127.0.0.1', server.port, 'r1', 'active')
+                consumer = asyncio.get_running_loop().create_task(consume())
+                stalled.connect(('127.0.0.1', server.port))
+                stalled.sendall(b'{"op": "join", "room": "r1", "name": "stalled"}\n')
+                room = server.rooms['r1']
+                while len(room.members) < 2:
+                    await asyncio.sleep(0.01)
+                stalled_id = max(room.members)
+                room.members[stalled_id].get_extra_info('socket').setsockopt(
+                    socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+
+                with mock.patch.object(game_server, 'MAX_BUFFER', 8192):
+                    for _ in range(20000):
+                        server.tick()
+                        await asyncio.sleep(0)
+                        if server.dropped_clients:
+                            break
+                    self.assertEqual(server.dropped_clients, 1)
+                    self.assertNotIn(stalled_id, room.members)
+                    self.assertNotIn(stalled_id, room.arena.snakes)
+                    self.assertIn(active.player_id, room.members)
+                    # 已断开的连接不会再次计数，广播也不会出错
+                    for _ in range(20):
+                        server.tick()
+                    await asyncio.sleep(0.05)
+                    self.assertEqual(server.dropped_clients, 1)
+                self.assertEqual(server.stats()['players'], 1)
+                self.assertGreater(len(received), 20)
+                consumer.cancel()
+            finally:
+                stalled.close()
+                active.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
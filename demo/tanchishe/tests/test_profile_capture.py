@@ -0,0 +1,89 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+from src.profile_capture import (CpuCapture, AllocationTracker, parse_profile_spec,
+                                 output_path, DEFAULT_CPU_FRAMES)
+
+
+def busy_function():
+    """让 cProfile 有东西可记"""
+    return sum(i * i for i in range(1000))
+
+
+class TestProfileCapture(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        shutil.rmtree(self.directory)
+
+    def test_parse_profile_spec(self):
+        """测试 SNAKE_PROFILE 的解析"""
+        self.assertEqual(parse_profile_spec(''), (None, False))
+        self.assertEqual(parse_profile_spec('cpu'), (DEFAULT_CPU_FRAMES, False))
+        self.assertEqual(parse_profile_spec('CPU:300, alloc'), (300, True))
+        self.assertEqual(parse_profile_spec('alloc'), (None, True))
+        for text in ('cpu:abc', 'cpu:0', 'gpu'):
+            with self.assertRaises(ValueError):
+                parse_profile_spec(text)
+
+    def test_output_path_is_unique(self):
+        """测试同一秒内多次采集不会覆盖之前的文件"""
+        first = output_path(self.directory, 'cpu', '.pstats')
+        open(first, 'w').close()
+        second = output_path(self.directory, 'cpu', '.pstats')
+        self.assertNotEqual(first, second)
+        self.assertTrue(second.endswith('.pstats'))
+
+    def test_cpu_capture(self):
+        """测试采满指定帧数后写出可以读取的 .pstats"""
+        capture = CpuCapture(frames=3, directory=self.directory)
+        finished = []
+        for _ in range(4):
+            busy_function()
+            finished.append(capture.frame())
+        self.assertEqual(finished, [False, False, False, True])
+        path = capture.stop()
+        self.assertEqual(capture.stop(), path)
+        stats = pstats.Stats(path)
+        names = {func[2] for func in stats.stats}
+        self.assertIn('busy_function', names)
+
+    def test_allocation_diff(self):
+        """测试报告中列出了本局新增的分配位置"""
+        tracker = AllocationTracker(directory=self.directory, top=5)
+        try:
+            self.assertIsNone(tracker.end())
+            tracker.begin()
+            leaked = [(i, i + 1) for i in range(20000)]  # 模拟热循环里积累的元组
+            path = tracker.end()
+        finally:
+            tracker.close()
+        self.assertFalse(tracker._started)
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertLessEqual(len(lines), 6)
+        self.assertIn('test_profile_capture.py', lines[1])
+        self.assertEqual(len(leaked), 20000)
+
+    def test_keeps_external_tracemalloc(self):
+        """测试不会关闭别人打开的 tracemalloc"""
+        tracemalloc.start()
+        try:
+            tracker = AllocationTracker(directory=self.directory)
+            tracker.close()
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import pygame
+from src.engine import SnakeEngine, UP, RIGHT, DOWN, LEFT
+from src.game_state import GameState
+from src.renderer import BoardRenderer
+from src.settings import Settings
+
+
+class FakeUIManager:
+    """不加载字体的 UI 管理器替身，分数用宽度随分数变化的色块表示"""
+    def __init__(self, settings):
+        self.settings = settings
+
+    def draw_score(self, screen, score):
+        return screen.fill(self.settings.grid_color, (10, 10, 30 + 10 * score, 20))
+
+    def draw(self, screen, game_state):
+        pass
+
+
+class TestBoardRenderer(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        pygame.init()
+        self.settings = Settings()
+        size = (self.settings.screen_width, self.settings.screen_height)
+        self.screen = pygame.Surface(size)
+        self.reference = pygame.Surface(size)
+        self.engine = SnakeEngine(seed=3)
+        self.game_state = GameState.__new__(GameState)
+        self.game_state.state = GameState.PLAYING
+        self.game_state.score = 0
+        self.ui_manager = FakeUIManager(self.settings)
+        self.renderer = BoardRenderer(self.settings, self.engine, self.ui_manager)
+
+    def assertSameAsFullRedraw(self):
+        """增量绘制的结果应与整屏重绘完全相同"""
+        reference = BoardRenderer(self.settings, self.engine, self.ui_manager)
+        reference.render(self.reference, self.game_state)
+        self.assertEqual(pygame.image.tostring(self.screen, 'RGB'),
+                         pygame.image.tostring(self.reference, 'RGB'))
+
+    def test_first_frame_is_full_redraw(self):
+        """测试第一帧整屏重绘"""
+        self.assertIsNone(self.renderer.render(self.screen, self.game_state))
+        self.assertEqual(self.renderer.render(self.screen, self.game_state), [])
+
+    def test_incremental_matches_full_redraw(self):
+        """测试移动、吃食物、一帧多步之后增量绘制与整屏重绘一致"""
+        self.renderer.render(self.screen, self.game_state)
+        # 路径经过左上角的分数区域
+        path = [UP] * 14 + [LEFT] * 15 + [DOWN] * 20 + [RIGHT] * 30
+        for i, action in enumerate(path):
+            # 每隔几步把食物放到蛇头前方，让蛇吃到食物、分数变化
+            if i % 6 == 0:
+                self.engine.food = self.engine._neighbours[action][self.engine.head]
+            events, done = self.engine.step(action)
+            self.assertFalse(done)
+            self.game_state.score = self.engine.score
+            if i % 3 == 2:
+                rects = self.renderer.render(self.screen, self.game_state)
+                self.assertIsNotNone(rects)
+                self.assertSameAsFullRedraw()
+
+    def test_dirty_rects_are_small(self):
+        """测试普通移动只提交少量格子"""
+        self.engine.food = 0
+        self.renderer.render(self.screen, self.game_state)
+        self.engine.step()
+        rects = self.renderer.render(self.screen, self.game_state)
+        # 新蛇头和空出来的尾部
+        self.assertEqual(len(rects), 2)
+        self.assertSameAsFullRedraw()
+
+    def test_state_change_forces_full_redraw(self):
+        """测试状态切换和 invalidate() 触发整屏重绘"""
+        self.renderer.render(self.screen, self.game_state)
+        self.game_state.state = GameState.PAUSED
+        self.assertIsNone(self.renderer.render(self.screen, self.game_state))
+        self.assertEqual(self.renderer.render(self.screen, self.game_state), [])
+        self.renderer.invalidate()
+        self.assertIsNone(self.renderer.render(self.screen, self.game_state))
+
+    def test_grid_and_border_restored(self):
+        """测试打开网格线和边框时，擦除的格子和分数区域恢复为背景"""
+        self.settings.show_grid = True
+        self.settings.border_width = 2
+        self.renderer.render(self.screen, self.game_state)
+        grid_size = self.settings.grid_size
+        self.assertEqual(self.screen.get_at((grid_size, 300))[:3], self.settings.grid_line_color)
+        self.assertEqual(self.screen.get_at((0, 300))[:3], self.settings.border_color)
+        path = [UP] * 14 + [LEFT] * 15 + [DOWN] * 20
+        for i, action in enumerate(path):
+            if i % 6 == 0:
+                self.engine.food = self.engine._neighbours[action][self.engine.head]
+            self.engine.step(action)
+            self.game_state.score = self.engine.score
+            self.renderer.render(self.screen, self.game_state)
+        self.assertSameAsFullRedraw()
+
+    def test_settings_change_rebuilds_layers(self):
+        """测试修改网格线、边框或颜色后 invalidate()，按新设置重新生成背景"""
+        self.renderer.render(self.screen, self.game_state)
+        layers = self.renderer._layers
+        self.renderer.invalidate()
+        self.renderer.render(self.screen, self.game_state)
+        self.assertIs(self.renderer._layers, layers)
+
+        grid_size = self.settings.grid_size
+        self.settings.show_grid = True
+        self.settings.border_width = 2
+        self.renderer.invalidate()
+        self.renderer.render(self.screen, self.game_state)
+        self.assertEqual(self.screen.get_at((grid_size, 300))[:3], self.settings.grid_line_color)
+        self.assertEqual(self.screen.get_at((0, 300))[:3], self.settings.border_color)
+        self.assertSameAsFullRedraw()
+
+        self.settings.bg_color = (0, 0, 64)
+        self.renderer.invalidate()
+        self.renderer.render(self.screen, self.game_state)
+        self.assertSameAsFullRedraw()
+
+    def test_snake_and_food_draw_match_renderer(self):
+        """测试 Snake.draw / Food.draw 用图块绘制的结果与渲染器一致"""
+        from src.snake import Snake
+        from src.food import Food
+        snake = Snake()
+        food = Food()
+        food.position = (5 * self.settings.grid_size, 0)
+        self.engine.food = 5
+        snake.draw(self.screen)
+        food.draw(self.screen)
+        self.ui_manager.draw_score(self.screen, 0)
+        self.renderer.render(self.reference, self.game_state)
+        self.assertEqual(pygame.image.tostring(self.screen, 'RGB'),
+                         pygame.image.tostring(self.reference, 'RGB'))
+
+    def test_camera_view_matches_full_board(self):
+        """测试大棋盘镜头模式画出的视野与整块棋盘对应区域一致"""
+        self.settings.show_grid = True
+        self.settings.border_width = 0
+        self.engine = SnakeEngine(width=100, height=80, seed=4)
+        for action in [UP] * 5 + [LEFT] * 20 + [DOWN] * 3:
+            self.engine.food = self.engine._neighbours[action][self.engine.head]
+            self.engine.step(action)
+        self.ui_manager.draw_score = lambda screen, score: pygame.Rect(0, 0, 0, 0)
+        renderer = BoardRenderer(self.settings, self.engine, self.ui_manager)
+        self.assertIsNone(renderer.render(self.screen, self.game_state))
+        camera = renderer.camera
+        self.assertIsNotNone(camera)
+        head_x, head_y = self.engine.cell_to_xy(self.engine.head)
+        self.assertEqual((camera.x, camera.y), (head_x - 20, head_y - 15))
+
+        grid_size = self.settings.grid_size
+        board = pygame.Surface((100 * grid_size, 80 * grid_size))
+        BoardRenderer(self.settings, self.engine, self.ui_manager).render(board, self.game_state)
+        view = board.subsurface((camera.x * grid_size, camera.y * grid_size,
+                                 self.settings.screen_width, self.settings.screen_height))
+        self.assertEqual(pygame.image.tostring(self.screen, 'RGB'),
+                         pygame.image.tostring(view, 'RGB'))
+
+        # 走到棋盘左边缘附近，镜头停在边缘
+        for _ in range(head_x - 2):
+            self.engine.step(LEFT)
+        self.assertEqual(renderer.render(self.screen, self.game_state),
+                         [self.screen.get_rect()])
+        self.assertEqual(camera.x, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import tempfile
+import unittest
+from src.engine import SnakeEngine, UP, RIGHT, DOWN, LEFT
+from src.replay import (Replay, ReplayError, ReplayPlayer, read_varint, record,
+                        simulate, verify, write_varint)
+
+
+def random_policy(seed):
+    """偶尔随机转向的策略"""
+    rng = random.Random(seed)
+
+    def policy(engine):
+        return rng.choice((None, None, None, None, UP, RIGHT, DOWN, LEFT))
+    return policy
+
+
+class TestReplay(unittest.TestCase):
+    def test_varint_round_trip(self):
+        """测试 varint 编解码"""
+        out = bytearray()
+        values = [0, 1, 127, 128, 300, 2 ** 32, 2 ** 64 - 1]
+        for value in values:
+            write_varint(out, value)
+        pos = 0
+        for value in values:
+            decoded, pos = read_varint(out, pos)
+            self.assertEqual(decoded, value)
+        self.assertEqual(pos, len(out))
+        with self.assertRaises(ValueError):
+            write_varint(bytearray(), -1)
+
+    def test_encode_decode(self):
+        """测试录像序列化往返一致，且每次转向只占一两个字节"""
+        replay = Replay(40, 30, 3, 2 ** 63 + 5, [(0, UP), (3, LEFT), (3 + 40, DOWN)],
+                        ticks=99, score=4)
+        data = replay.to_bytes()
+        self.assertEqual(Replay.from_bytes(data), replay)
+        header_size = len(Replay(40, 30, 3, 2 ** 63 + 5, ticks=99, score=4).to_bytes())
+        self.assertLessEqual(len(data) - header_size, 4)
+
+    def test_corrupted_data(self):
+        """测试损坏的录像会报错"""
+        data = bytearray(Replay(40, 30, 3, 1, [(2, UP)], ticks=5).to_bytes())
+        with self.assertRaises(ReplayError):
+            Replay.from_bytes(b'NOPE' + bytes(data[4:]))
+        data[6] ^= 1
+        with self.assertRaises(ReplayError):
+            Replay.from_bytes(data)
+        with self.assertRaises(ReplayError):
+            Replay.from_bytes(data[:5])
+
+    def test_simulate_reproduces_game(self):
+        """测试无界面重放与原对局逐步一致"""
+        for seed in range(5):
+            replay = record(random_policy(seed), seed=seed)
+            self.assertTrue(verify(replay))
+
+            # 按相同输入直接运行引擎，逐步比较蛇头和食物
+            engine = SnakeEngine(seed=seed)
+            actions = dict(replay.inputs)
+            expected = []
+            while not engine.done and engine.steps < replay.ticks:
+                engine.step(actions.get(engine.steps))
+                expected.append((engine.head, engine.food, engine.score))
+            seen = []
+            simulate(replay, lambda e, events: seen.append((e.head, e.food, e.score)))
+            self.assertEqual(seen, expected)
+
+    def test_save_and_load(self):
+        """测试写入和读取文件"""
+        replay = record(random_policy(9), seed=9)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.snkr')
+            replay.save(path)
+            self.assertEqual(Replay.load(path), replay)
+
+    def test_player_actions(self):
+        """测试回放器按步数给出转向"""
+        player = ReplayPlayer(Replay(40, 30, 3, 1, [(1, UP), (4, LEFT)], ticks=6))
+        actions = [player.action_for(tick) for tick in range(6)]
+        self.assertEqual(actions, [None, UP, None, None, LEFT, None])
+        self.assertTrue(player.finished(6))
+        player.rewind()
+        self.assertIsNone(player.action_for(0))
+        self.assertEqual(player.action_for(1), UP)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from src import score_store
+from src.score_store import HighScoreWriter, atomic_write_json, load_scores
+
+
+class TestScoreStore(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'high_scores.json')
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        shutil.rmtree(self.directory)
+
+    def test_atomic_write(self):
+        """测试原子写入，写入失败时旧文件保持不变且不留临时文件"""
+        atomic_write_json(self.path, [3, 2, 1])
+        self.assertEqual(load_scores(self.path), [3, 2, 1])
+
+        with mock.patch('json.dump', side_effect=OSError('磁盘已满')):
+            with self.assertRaises(OSError):
+                atomic_write_json(self.path, [9])
+        self.assertEqual(load_scores(self.path), [3, 2, 1])
+        self.assertEqual(os.listdir(self.directory), ['high_scores.json'])
+
+    @unittest.skipIf(os.name != 'posix', '只在 POSIX 系统上检查权限位')
+    def test_atomic_write_preserves_mode(self):
+        """测试替换后的文件保留原文件的权限，新文件按 umask 创建"""
+        umask = os.umask(0o022)
+        try:
+            atomic_write_json(self.path, [1])
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+            os.chmod(self.path, 0o640)
+            atomic_write_json(self.path, [2])
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        finally:
+            os.umask(umask)
+        self.assertEqual(load_scores(self.path), [2])
+
+    def test_load_missing_file(self):
+        """测试文件不存在时返回空列表"""
+        self.assertEqual(load_scores(self.path), [])
+
+    def test_load_corrupted_file(self):
+        """测试损坏的文件被改名保留，并返回空列表"""
+        for content in ('[38, 18, 1', '{"a": 1}', '[1, -2]', '[1.5]', '[true]'):
+            with open(self.path, 'w') as f:
+                f.write(content)
+            with self.assertLogs('ScoreStore', 'ERROR'):
+                self.assertEqual(load_scores(self.path), [])
+            self.assertFalse(os.path.exists(self.path))
+            with open(self.path + '.corrupt') as f:
+                self.assertEqual(f.read(), content)
+
+    def test_submit_does_not_wait_for_disk(self):
+        """测试提交不等待写盘，慢磁盘上连续提交会被合并"""
+        release = threading.Event()
+        real_write = score_store.atomic_write_json
+
+        def slow_write(path, data):
+            release.wait(5)
+            real_write(path, data)
+
+        writer = HighScoreWriter(self.path)
+        with mock.patch.object(score_store, 'atomic_write_json', slow_write):
+            start = time.perf_counter()
+            for i in range(1, 6):
+                writer.submit([i])
+            self.assertLess(time.perf_counter() - start, 0.5)
+            self.assertFalse(writer.flush(timeout=0.05))
+            release.set()
+            self.assertTrue(writer.flush(timeout=5))
+        writer.close()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), [5])
+        self.assertLessEqual(writer.writes, 2)
+
+    def test_close_flushes_pending(self):
+        """测试关闭时写完最后一次提交"""
+        writer = HighScoreWriter(self.path)
+        writer.submit([7, 3])
+        writer.close()
+        self.assertEqual(load_scores(self.path), [7, 3])
+        with self.assertRaises(RuntimeError):
+            writer.submit([1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -103,5 +103,48 @@ class TestSnake(unittest.TestCase):
         self.snake.change_direction('LEFT')
         self.assertEqual(self.snake.direction, 'RIGHT')  # 方向不应该改变
 
+    def test_occupancy_index(self):
+        """测试占用索引随移动和生长同步更新"""
+        for direction in ['DOWN', 'DOWN', 'LEFT', 'LEFT']:
+            self.snake.grow()
+            self.snake.change_direction(direction)
+            self.snake.move()
+        # 占用索引与蛇身一致
+        self.assertEqual(sum(self.snake.occupancy), len(self.snake.body))
+        for segment in self.snake.body:
+            self.assertTrue(self.snake.is_occupied(segment))
+        tail = self.snake.body[-1]
+        self.snake.move()
+        self.assertFalse(self.snake.is_occupied(tail))
+        self.assertFalse(self.snake.is_occupied((-self.settings.grid_size, 0)))
+
+    def test_move_into_vacated_tail(self):
+        """测试蛇头进入刚空出来的尾部格子不算碰撞"""
+        self.snake.grow()
+        self.snake.move()
+        # 长度为4时绕一个2x2的小圈，蛇头正好进入尾部刚离开的格子
+        for direction in ['DOWN', 'LEFT', 'UP']:
+            self.snake.change_direction(direction)
+            self.snake.move()
+        self.assertEqual(len(self.snake.body), 4)
+        self.assertFalse(self.snake.check_collision())
+
+    def test_body_view(self):
+        """测试蛇身视图不能增删节数，且与占用索引保持同步"""
+        body = self.snake.body
+        self.assertFalse(hasattr(body, 'append'))
+        self.assertFalse(hasattr(body, 'insert'))
+        self.assertEqual(body[0], self.snake.get_head_position())
+        self.assertEqual(body[1:], list(body)[1:])
+        self.assertIn(body[-1], body)
+        self.assertNotIn((0, 0), body)
+
+        # 替换蛇头会同步更新占用索引
+        old_head = body[0]
+        body[0] = (0, 0)
+        self.assertIn((0, 0), body)
+        self.assertFalse(self.snake.is_occupied(old_head))
+        self.assertEqual(sum(self.snake.occupancy), len(body))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
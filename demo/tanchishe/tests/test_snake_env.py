@@ -0,0 +1,137 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import tracemalloc
+import unittest
+import numpy as np
+from src.snake_env import (SnakeEnv, OBSERVATIONS, RgbObservation, default_reward,
+                           food_distance_shaping)
+from src.engine import SnakeEngine, UP, RIGHT, DOWN, LEFT
+from src.settings import Settings
+
+
+def fresh_observation(env):
+    """按引擎当前状态从头生成一份观测，用来核对增量更新的结果"""
+    if env.observation_type == 'rgb':
+        observer = RgbObservation(env.engine, Settings(), cell_size=3)
+    else:
+        observer = OBSERVATIONS[env.observation_type](env.engine, Settings())
+    observer.reset(env.engine)
+    return observer.buffer
+
+
+class TestSnakeEnv(unittest.TestCase):
+    def play(self, env, seed, steps=2000):
+        """随机玩若干步，每步核对观测"""
+        rng = random.Random(seed)
+        env.reset(seed)
+        for _ in range(steps):
+            obs, reward, terminated, truncated, info = env.step(rng.randrange(4))
+            self.assertIs(obs, env.observation)
+            np.testing.assert_array_equal(obs, fresh_observation(env))
+            if terminated or truncated:
+                env.reset(rng.randrange(1000))
+
+    def test_incremental_observations(self):
+        """测试每种观测的增量更新与从头生成的结果一致"""
+        for observation in OBSERVATIONS:
+            with self.subTest(observation=observation):
+                env = SnakeEnv(8, 6, observation=observation, cell_size=3)
+                self.play(env, seed=1)
+
+    def test_observation_layout(self):
+        """测试观测的形状、类型和初始内容"""
+        env = SnakeEnv(10, 8, observation='grid')
+        obs, info = env.reset(seed=3)
+        self.assertEqual(obs.shape, (3, 8, 10))
+        self.assertEqual(obs.dtype, np.uint8)
+        self.assertEqual(obs[0].sum(), 3)
+        self.assertEqual(obs[1, 4, 5], 1)
+        self.assertEqual(obs[2].sum(), 1)
+        self.assertEqual(info['length'], 3)
+
+        env = SnakeEnv(10, 8, observation='rgb', cell_size=2)
+        self.assertEqual(env.observation_shape, (16, 20, 3))
+        env = SnakeEnv(10, 8, observation='features')
+        obs, _ = env.reset(seed=3)
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertEqual(obs[4 + RIGHT], 1.0)
+        self.assertEqual(obs[3], 1.0)  # 向左是自己的身体
+
+    def test_matches_engine(self):
+        """测试同一种子下与 SnakeEngine 逐步一致"""
+        env = SnakeEnv(12, 10)
+        engine = SnakeEngine(12, 10, seed=42)
+        env.reset(seed=42)
+        rng = random.Random(0)
+        for _ in range(500):
+            action = rng.randrange(4)
+            events, done = engine.step(action)
+            _, _, terminated, _, info = env.step(action)
+            self.assertEqual((info['events'], terminated), (events, done))
+            self.assertEqual(list(env.engine.body), list(engine.body))
+            if done:
+                break
+
+    def test_rewards_and_shaping(self):
+        """测试默认奖励和奖励塑形函数"""
+        env = SnakeEnv(10, 8, shaping=[food_distance_shaping(0.5)])
+        env.reset(seed=0)
+        env.engine.food = env.engine.xy_to_cell(9, 4)  # 放在蛇头正右方
+        _, reward, _, _, _ = env.step(RIGHT)
+        self.assertAlmostEqual(reward, 0.5)
+        _, reward, _, _, _ = env.step(UP)
+        self.assertAlmostEqual(reward, -0.5)
+        _, reward, terminated, _, _ = env.step(UP)
+        for _ in range(10):
+            if terminated:
+                break
+            _, reward, terminated, _, _ = env.step(UP)
+        self.assertTrue(terminated)
+        self.assertEqual(reward, -1.0)
+        with self.assertRaises(RuntimeError):
+            env.step(DOWN)
+
+        calls = []
+        env = SnakeEnv(10, 8, reward_fn=lambda env, events: calls.append(events) or 2.0)
+        env.reset(seed=0)
+        self.assertEqual(env.step(RIGHT)[1], 2.0)
+        self.assertEqual(calls, [0])
+        self.assertEqual(default_reward(env, 1), 1.0)
+
+    def test_truncation(self):
+        """测试超过 max_steps 后截断"""
+        env = SnakeEnv(40, 30, max_steps=5)
+        env.reset(seed=0)
+        results = [env.step(None)[2:4] for _ in range(5)]
+        self.assertEqual(results[-1], (False, True))
+        self.assertEqual(results[0], (False, False))
+
+    def test_no_allocation_per_step(self):
+        """测试 step() 不分配新的观测数组"""
+        pattern = [RIGHT] * 5 + [DOWN] * 5 + [LEFT] * 5 + [UP] * 5  # 绕圈，不会撞死
+        for observation in OBSERVATIONS:
+            with self.subTest(observation=observation):
+                env = SnakeEnv(40, 30, observation=observation)
+                env.reset(seed=1)
+                env.step(RIGHT)
+                tracemalloc.start()
+                try:
+                    base = tracemalloc.get_traced_memory()[0]
+                    for i in range(1000):
+                        env.step(pattern[i % 20])
+                    peak = tracemalloc.get_traced_memory()[1] - base
+                finally:
+                    tracemalloc.stop()
+                self.assertLess(peak, 4096)
+
+    def test_unknown_observation(self):
+        """测试未知的观测类型"""
+        with self.assertRaises(ValueError):
+            SnakeEnv(observation='pixels')
+
+
+if __name__ == '__main__':
+    unittest.main()
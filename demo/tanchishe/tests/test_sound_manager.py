@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import threading
 import pytest
 import pygame
 from src.sound_manager import SoundManager
@@ -80,4 +81,73 @@ def test_background_music(sound_manager):
     
     # 停止音乐
     sound_manager.stop_background_music()
-    assert sound_manager.music_playing == False 
\ No newline at end of file
+    assert sound_manager.music_playing == False
+
+
+def test_background_loading():
+    """测试后台加载：加载前请求的背景音乐在加载完成后开始播放"""
+    pygame.init()
+    manager = SoundManager(background=True)
+    assert manager.sounds == {}
+    manager.play_move_sound()  # 加载前播放音效是空操作
+    manager.play_background_music()
+    assert manager.music_playing == True
+    manager.load_async()
+    assert manager.wait_ready(timeout=5)
+    manager._loader.join(timeout=5)
+    assert set(manager.sounds) == {'move', 'eat', 'crash', 'menu_select'}
+    assert manager.music_playing == True
+    manager.stop_background_music()
+    assert manager.music_playing == False
+
+
+def test_voice_limiting(sound_manager):
+    """测试音效经由按类别预留的声道播放，连续的移动音效被限速"""
+    assert sound_manager.voices is not None
+    assert pygame.mixer.get_num_channels() >= 6
+    sound_manager.play_move_sound()
+    sound_manager.play_move_sound()
+    sound_manager.play_eat_sound(12)
+    stats = sound_manager.voices.stats()
+    assert stats['played'] == 2
+    assert stats['throttled'] == 1
+
+
+def test_music_started_once_when_ready():
+    """测试加载完成的同时请求播放背景音乐，音乐只开始一次"""
+    pygame.init()
+    manager = SoundManager(background=True)
+    starts = []
+
+    def start_music():
+        starts.append(1)
+        manager.music_playing = True
+
+    manager._start_music = start_music
+    original_set = manager.ready.set
+    requests = []
+
+    def set_and_request():
+        # 在标记就绪的瞬间从另一个线程请求播放
+        original_set()
+        request = threading.Thread(target=manager.play_background_music)
+        request.start()
+        request.join(timeout=0.2)
+        requests.append(request)
+
+    manager.ready.set = set_and_request
+    manager.load()
+    requests[0].join(timeout=5)
+    assert starts == [1]
+    assert manager.music_playing == True
+
+
+def test_audio_buffer_from_environment(monkeypatch):
+    """测试 SNAKE_AUDIO_BUFFER 无效时使用默认值，超出范围时截断为 2 的幂"""
+    from src.settings import Settings, parse_audio_buffer
+    for value, expected in (('abc', 256), ('512', 512), ('300', 256), ('1', 32), ('99999', 8192)):
+        monkeypatch.setenv('SNAKE_AUDIO_BUFFER', value)
+        assert Settings().audio_buffer == expected
+    monkeypatch.delenv('SNAKE_AUDIO_BUFFER')
+    assert Settings().audio_buffer == 256
+    parse_audio_buffer.cache_clear()
@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import io
+import subprocess
+import unittest
+import pygame
+from startup_timer import StartupTimer
+from ui_manager import LazyFont
+from text_cache import TextCache
+from main import Game
+
+
+class FakeClock:
+    """手动推进的计时器"""
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_report(self):
+        """测试各阶段耗时和累计耗时"""
+        clock = FakeClock()
+        timer = StartupTimer(clock)
+        clock.now += 0.25
+        timer.mark('导入模块')
+        clock.now += 0.05
+        timer.mark('第一帧')
+        self.assertAlmostEqual(timer.elapsed(), 0.3)
+        lines = timer.report_lines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('50.0 ms', lines[1])
+        self.assertIn('300.0 ms', lines[1])
+        stream = io.StringIO()
+        timer.report(stream)
+        self.assertIn('导入模块', stream.getvalue())
+
+
+class TestLazyStartup(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        pygame.quit()
+        self.game = Game()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.quit()
+
+    def test_audio_deferred(self):
+        """测试创建 Game 时不初始化混音器，也不解码音效"""
+        self.assertIsNone(pygame.mixer.get_init())
+        self.assertEqual(self.game.sound_manager.sounds, {})
+        self.assertFalse(self.game.sound_manager.ready.is_set())
+
+    def test_fonts_loaded_on_first_use(self):
+        """测试第一帧只加载大号字体，小号字体等到显示分数时才加载"""
+        ui_manager = self.game.ui_manager
+        self.assertFalse(ui_manager.font.loaded)
+        self.game._update_screen()
+        self.assertTrue(ui_manager.font.loaded)
+        self.assertFalse(ui_manager.small_font.loaded)
+        self.game._start_new_game()
+        self.game._update_screen()
+        self.assertTrue(ui_manager.small_font.loaded)
+
+    def test_lazy_font_is_stable_cache_key(self):
+        """测试字体加载前后作为缓存键不变"""
+        loads = []
+
+        def loader(size):
+            loads.append(size)
+            return pygame.font.Font(None, size)
+        font = LazyFont(20, loader)
+        cache = TextCache()
+        first = cache.render(font, '贪吃蛇', True, (255, 255, 255))
+        second = cache.render(font, '贪吃蛇', True, (255, 255, 255))
+        self.assertIs(first, second)
+        self.assertEqual(loads, [20])
+        self.assertGreater(font.get_height(), 0)
+
+
+class TestImportGraph(unittest.TestCase):
+    def test_main_imports_stay_light(self):
+        """测试导入 main 不会加载音效生成器（scipy）、排行榜客户端（asyncio）和 cProfile"""
+        src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+        script = ('import sys; sys.path.insert(0, %r); import main; '
+                  'print(sorted(m for m in ("scipy", "sound_generator", "leaderboard_client", '
+                  '"asyncio", "cProfile") if m in sys.modules))' % src)
+        env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+        output = subprocess.run([sys.executable, '-c', script], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import shutil
+import tempfile
+import unittest
+import wave
+import numpy as np
+import pygame
+from src.synth import EFFECTS, SoundCache, cache_key, render, semitones, to_samples
+from src.sound_generator import save_sound, generate_eat_sound
+from src.sound_manager import SoundManager, EAT_VARIANTS, EAT_LEVEL_SCORE
+
+
+class TestSynth(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        shutil.rmtree(self.directory)
+
+    def test_batch_matches_single_renders(self):
+        """测试一批变体与逐个合成的结果相同"""
+        pitches = semitones(4)
+        batch = render(EFFECTS['eat'], 22050, pitches)
+        self.assertEqual(batch.shape, (4, int(22050 * EFFECTS['eat']['duration'])))
+        for i, pitch in enumerate(pitches):
+            np.testing.assert_allclose(batch[i], render(EFFECTS['eat'], 22050, (pitch,))[0])
+        self.assertAlmostEqual(np.abs(batch).max(), 1.0)
+
+    def test_pitch_shift(self):
+        """测试升高 12 个半音后频率翻倍（过零点数翻倍）"""
+        spec = {'freqs': (440,), 'duration': 0.5, 'normalize': False}
+        low, high = render(spec, 44100, (1.0, semitones(13)[12]))
+        crossings = [np.count_nonzero(np.diff(np.signbit(w))) for w in (low, high)]
+        self.assertAlmostEqual(crossings[1] / crossings[0], 2.0, places=1)
+
+    def test_samples_layout(self):
+        """测试 int16 采样的形状和声道"""
+        wave_ = render(EFFECTS['move'], 8000, (1.0, 1.5))
+        stereo = to_samples(wave_, 2)
+        self.assertEqual(stereo.dtype, np.int16)
+        self.assertEqual(stereo.shape, (2, 800, 2))
+        self.assertTrue(stereo.flags['C_CONTIGUOUS'])
+        np.testing.assert_array_equal(stereo[..., 0], stereo[..., 1])
+        self.assertEqual(to_samples(wave_, 1).shape, (2, 800))
+
+    def test_cache_key_follows_parameters(self):
+        """测试参数、采样率或变体变化时缓存键随之变化"""
+        spec = EFFECTS['eat']
+        key = cache_key(spec, 44100, 2, (1.0,))
+        self.assertEqual(key, cache_key(dict(spec), 44100, 2, (1.0,)))
+        self.assertNotEqual(key, cache_key(dict(spec, decay=16), 44100, 2, (1.0,)))
+        self.assertNotEqual(key, cache_key(spec, 22050, 2, (1.0,)))
+        self.assertNotEqual(key, cache_key(spec, 44100, 2, (1.0, 2.0)))
+
+    def test_disk_cache(self):
+        """测试磁盘缓存：第二个进程（新的缓存对象）直接读取，不重新合成"""
+        first = SoundCache(self.directory)
+        samples = first.samples(EFFECTS['crash'], 22050, 2)
+        self.assertIs(first.samples(EFFECTS['crash'], 22050, 2), samples)
+        self.assertEqual((first.renders, first.hits), (1, 1))
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+        second = SoundCache(self.directory)
+        np.testing.assert_array_equal(second.samples(EFFECTS['crash'], 22050, 2), samples)
+        self.assertEqual((second.renders, second.disk_hits), (0, 1))
+
+    def test_corrupt_cache_file_is_replaced(self):
+        """测试损坏的缓存文件会被重新合成覆盖"""
+        cache = SoundCache(self.directory)
+        key = cache_key(EFFECTS['move'], 22050, 1, (1.0,))
+        with open(os.path.join(self.directory, key + '.npy'), 'wb') as f:
+            f.write(b'broken')
+        samples = cache.samples(EFFECTS['move'], 22050, 1)
+        self.assertEqual(cache.renders, 1)
+        np.testing.assert_array_equal(SoundCache(self.directory).samples(EFFECTS['move'], 22050, 1),
+                                      samples)
+
+    def test_wav_export(self):
+        """测试导出的 WAV 文件可以用标准库读回"""
+        path = os.path.join(self.directory, 'eat.wav')
+        rate, samples = generate_eat_sound()
+        save_sound(rate, samples, path)
+        with wave.open(path, 'rb') as f:
+            self.assertEqual((f.getframerate(), f.getnchannels(), f.getsampwidth()), (rate, 2, 2))
+            data = np.frombuffer(f.readframes(f.getnframes()), dtype='<i2').reshape(-1, 2)
+        np.testing.assert_array_equal(data, samples)
+
+
+class TestSynthesizedSounds(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        pygame.mixer.init()
+
+    def tearDown(self):
+        """每个测试用例后运行"""
+        pygame.mixer.quit()
+
+    def test_sound_manager_synthesizes(self):
+        """测试 SoundManager 直接合成音效和背景音乐，不读取 WAV 文件"""
+        manager = SoundManager()
+        self.assertIsNone(manager.background_music)
+        self.assertEqual(len(manager.eat_variants), EAT_VARIANTS)
+        rate = pygame.mixer.get_init()[0]
+        eat_length = manager.eat_variants[0].get_length()
+        self.assertAlmostEqual(eat_length, int(rate * EFFECTS['eat']['duration']) / rate, places=3)
+        manager.play_background_music()
+        self.assertTrue(manager.music_playing)
+        manager.play_eat_sound(EAT_LEVEL_SCORE * 100)  # 分数再高也不会越界
+        manager.stop_background_music()
+        self.assertFalse(manager.music_playing)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from src.text_cache import TextCache
+
+
+class CountingFont:
+    """记录 render 调用次数的字体替身"""
+    def __init__(self):
+        self.calls = 0
+
+    def render(self, text, antialias, color):
+        self.calls += 1
+        return (text, antialias, color, self.calls)
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        """每个测试用例前运行"""
+        self.font = CountingFont()
+        self.cache = TextCache(max_entries=2)
+
+    def test_hit_and_miss(self):
+        """测试相同参数只渲染一次"""
+        first = self.cache.render(self.font, '开始游戏', True, (255, 255, 255))
+        second = self.cache.render(self.font, '开始游戏', True, [255, 255, 255])
+        self.assertIs(first, second)
+        self.assertEqual(self.font.calls, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.stats()['hit_rate'], 0.5)
+
+    def test_key_includes_color_and_font(self):
+        """测试颜色、抗锯齿或字体不同时分别缓存"""
+        other_font = CountingFont()
+        self.cache.render(self.font, '退出', True, (255, 255, 255))
+        self.cache.render(self.font, '退出', True, (200, 200, 200))
+        self.cache.render(other_font, '退出', True, (255, 255, 255))
+        self.assertEqual(self.font.calls + other_font.calls, 3)
+
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        self.cache.render(self.font, 'a', True, (0, 0, 0))
+        self.cache.render(self.font, 'b', True, (0, 0, 0))
+        self.cache.render(self.font, 'a', True, (0, 0, 0))
+        self.cache.render(self.font, 'c', True, (0, 0, 0))
+        self.assertEqual(len(self.cache), 2)
+        self.cache.render(self.font, 'a', True, (0, 0, 0))
+        self.assertEqual(self.font.calls, 3)
+        self.cache.render(self.font, 'b', True, (0, 0, 0))
+        self.assertEqual(self.font.calls, 4)
+
+    def test_disabled(self):
+        """测试容量为 0 时不缓存"""
+        cache = TextCache(max_entries=0)
+        cache.render(self.font, 'a', True, (0, 0, 0))
+        cache.render(self.font, 'a', True, (0, 0, 0))
+        self.assertEqual(self.font.calls, 2)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
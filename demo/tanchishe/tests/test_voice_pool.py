@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from src.voice_pool import VoicePool, channel_count, VOICE_CATEGORIES
+
+
+class FakeChannel:
+    """只记录调用的声道，busy 由测试控制"""
+    def __init__(self, index):
+        self.index = index
+        self.busy = False
+        self.sound = None
+        self.stops = 0
+
+    def play(self, sound):
+        self.sound = sound
+        self.busy = True
+
+    def stop(self):
+        self.busy = False
+        self.stops += 1
+
+    def get_busy(self):
+        return self.busy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestVoicePool(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pool = VoicePool(FakeChannel, clock=self.clock)
+
+    def test_channel_layout(self):
+        """测试声道编号：0 号留给背景音乐，各类别的声道互不重叠"""
+        indexes = [v[0].index for voices in self.pool.voices.values() for v in voices]
+        self.assertEqual(sorted(indexes), list(range(1, channel_count())))
+        self.assertEqual(channel_count(), 1 + sum(VOICE_CATEGORIES.values()))
+
+    def test_rate_limit(self):
+        """测试最短重复间隔内的同一音效被丢弃"""
+        self.assertIsNotNone(self.pool.play('move', 'm'))
+        self.clock.now = 0.01
+        self.assertIsNone(self.pool.play('move', 'm'))
+        self.clock.now = 0.1
+        self.assertIsNotNone(self.pool.play('move', 'm'))
+        self.assertEqual(self.pool.stats()['throttled'], 1)
+        self.assertEqual(self.pool.stats()['played'], 2)
+
+    def test_categories_isolated(self):
+        """测试移动音效占满自己的声道后不影响吃食物音效"""
+        for i in range(10):
+            self.clock.now = i
+            self.pool.play('move', 'm')
+        channel = self.pool.play('eat', 'e')
+        self.assertIsNotNone(channel)
+        self.assertEqual(channel.sound, 'e')
+        self.assertEqual(self.pool.stolen, 8)
+
+    def test_priority_stealing(self):
+        """测试声道用完时抢占优先级最低的，优先级更低的新音效被丢弃"""
+        eat = self.pool.play('eat', 'e1')
+        self.clock.now = 1
+        self.pool.play('crash', 'c1')
+        self.clock.now = 2
+        # 碰撞抢占吃食物的声道
+        self.assertIs(self.pool.play('crash', 'c2'), eat)
+        self.assertEqual(eat.stops, 1)
+        # 两个声道都在放碰撞音效，吃食物音效被丢弃
+        self.clock.now = 3
+        self.assertIsNone(self.pool.play('eat', 'e2'))
+        self.assertEqual(self.pool.stats(), {'played': 3, 'throttled': 0, 'stolen': 1, 'dropped': 1})
+
+    def test_free_channel_preferred(self):
+        """测试有空闲声道时不抢占"""
+        first = self.pool.play('eat', 'e1')
+        first.busy = False
+        self.clock.now = 1
+        self.assertIs(self.pool.play('eat', 'e2'), first)
+        self.assertEqual(self.pool.stolen, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()